@@ -1,6 +1,214 @@
 # conftest.py - common fixtures for all tests
 # Web fixtures are in tests/web/conftest.py
 # Mobile fixtures are in tests/mobile/conftest.py
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
 import pytest
 
-# Common fixtures can be added here if needed
+from utils.artifact_store import ArtifactStore
+from utils.artifact_writer import WriterStats, shutdown_writer, summary_lines, used_stores
+from utils.command_trace import TRACER, trace_path
+from utils import scheduler, step_timing
+from utils.step_timing import STEP_TIMER, StepHistory
+from utils.waits import WAIT_STATS
+
+# Default artifacts folder used by web and mobile fixtures
+ARTIFACTS_DIR = Path("artifacts")
+
+# Stats of the background artifact writer (filled at session end)
+_artifact_stats: WriterStats | None = None
+_artifact_usage: list[str] = []
+# Step latencies of this run vs history (filled at session end)
+_step_stats: list[step_timing.StepStats] = []
+# Predicted vs actual busy time of workers
+_schedule = scheduler.ScheduleReport()
+_session_started = time.perf_counter()
+# Manifest entries newer than this were added by the current run
+_run_started_at = time.time()
+
+
+def pytest_configure(config) -> None:
+    # Run id is created before xdist workers start, so they inherit it
+    step_timing.run_id()
+    # Worker shares of the duration-aware plan are xdist groups
+    if scheduler.schedule_enabled():
+        if getattr(config.option, "dist", "no") == "load":
+            config.option.dist = "loadgroup"
+        if os.getenv("PYTEST_XDIST_WORKER"):
+            # Workers parse the original command line: enable group suffixes explicitly
+            config.option.loadgroup = True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items) -> None:
+    """
+    DURATION_SCHEDULE=1: distribute tests over xdist workers longest-first.
+
+    Every worker collects the same items and computes the same plan; the
+    group marks must be added before xdist turns them into node id suffixes.
+    """
+    if not scheduler.schedule_enabled():
+        return
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    tests = []
+    for item in items:
+        marker = item.get_closest_marker("shared_setup")
+        tests.append((item.nodeid, marker.args[0] if marker else None))
+    plan = scheduler.make_plan(tests, scheduler.DurationStore(), workers)
+    if workers < 2:
+        _schedule.predicted = {"main": plan.makespan}
+        return
+    groups = plan.group_of()
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(groups[item.nodeid]))
+    position = {nodeid: i for i, nodeid in enumerate(n for share in plan.bins for n in share)}
+    items.sort(key=lambda item: position[item.nodeid])
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids) -> None:
+    """Controller: predicted busy time of every worker share (same ids on all workers)."""
+    if scheduler.schedule_enabled() and not _schedule.predicted:
+        _schedule.predicted = scheduler.predicted_loads(ids, scheduler.DurationStore())
+
+
+def pytest_runtest_logreport(report) -> None:
+    """Collect test durations (controller / single process); xdist reports carry their worker."""
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        return
+    node = getattr(report, "node", None)
+    worker = getattr(getattr(node, "gateway", None), "id", "main")
+    _schedule.add(report.nodeid, worker, report.duration, ran=report.when == "call")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item) -> None:
+    TRACER.begin(item.nodeid, "setup")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item) -> None:
+    TRACER.begin(item.nodeid, "call")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item) -> None:
+    TRACER.begin(item.nodeid, "teardown")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Pytest hook: enforces `@pytest.mark.max_commands(n)` budgets.
+
+    Only commands sent while the test body runs (call phase) are counted;
+    driver creation and cleanup in fixtures are not part of the budget.
+    """
+    outcome = yield
+    rep = outcome.get_result()
+
+    marker = item.get_closest_marker("max_commands")
+    if marker is None or rep.when != "call" or not rep.passed:
+        return
+    budget = marker.args[0]
+    records = TRACER.for_test(item.nodeid, "call")
+    if len(records) > budget:
+        steps = Counter(r.step or "-" for r in records).most_common(5)
+        rep.outcome = "failed"
+        rep.longrepr = (
+            f"WebDriver command budget exceeded: {len(records)} commands > max_commands({budget})\n"
+            + "\n".join(f"  {n:4d}  {step}" for step, n in steps)
+        )
+
+
+def pytest_sessionfinish(session) -> None:
+    """Flush all queued artifacts and apply retention limits of the store."""
+    global _artifact_stats
+    _artifact_stats = shutdown_writer()
+    path = trace_path()
+    if path is not None and TRACER.records:
+        TRACER.write_trace(path)
+    # Learned wait delays (WAIT_STATS_PATH) are used to plan polls in the next run
+    WAIT_STATS.save()
+    _finish_step_history()
+    if not os.getenv("PYTEST_XDIST_WORKER") and _schedule.ran:
+        store = scheduler.DurationStore()
+        store.update(_schedule.measured())
+        store.save()
+    # With pytest-xdist retention runs once, in the controller process
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        return
+    roots = {store.root for store in used_stores()} | {ARTIFACTS_DIR}
+    for root in sorted(roots):
+        store = ArtifactStore(root)
+        if not store.manifest_path.exists():
+            continue
+        written = sum(1 for e in store.entries() if e.ts >= _run_started_at and e.written)
+        removed = store.enforce_retention()
+        # Runs that did not touch the store (e.g. --collect-only) report nothing
+        if written or removed:
+            _artifact_usage.append(
+                f"store {store.root}: {store.disk_usage() / 1024 / 1024:.2f} MB, "
+                f"{written} blobs written, {removed} old blobs removed"
+            )
+
+
+def _finish_step_history() -> None:
+    """Append step timings of this process; the controller also compares them with history."""
+    global _step_stats
+    path = step_timing.history_path()
+    if path is None:
+        return
+    history = StepHistory(path)
+    history.append(step_timing.run_id(), STEP_TIMER.take())
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        return
+    run_id = step_timing.run_id()
+    threshold = step_timing.regression_threshold()
+    _step_stats = step_timing.analyze(history.rows(), run_id, threshold)
+    if _step_stats:
+        step_timing.write_report(step_timing.report_path(), run_id, _step_stats, threshold)
+    history.compact(step_timing.keep_runs())
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Report WebDriver command counts and artifact writer stats."""
+    command_lines = TRACER.summary_lines()
+    if command_lines:
+        terminalreporter.section("webdriver commands")
+        for line in command_lines:
+            terminalreporter.write_line(line)
+        path = trace_path()
+        if path is not None:
+            terminalreporter.write_line(f"trace: {path}")
+
+    wait_lines = WAIT_STATS.summary_lines()
+    if wait_lines:
+        terminalreporter.section("waits")
+        for line in wait_lines:
+            terminalreporter.write_line(line)
+
+    step_lines = step_timing.summary_lines(_step_stats)
+    if step_lines:
+        terminalreporter.section("step timings")
+        for line in step_lines:
+            terminalreporter.write_line(line)
+        regressed = sum(s.regressed for s in _step_stats)
+        terminalreporter.write_line(f"regressed steps: {regressed}, report: {step_timing.report_path()}")
+
+    schedule_lines = _schedule.summary_lines(wall=time.perf_counter() - _session_started)
+    if scheduler.schedule_enabled() and schedule_lines:
+        terminalreporter.section("schedule")
+        for line in schedule_lines:
+            terminalreporter.write_line(line)
+
+    lines = summary_lines(_artifact_stats) if _artifact_stats else []
+    lines += _artifact_usage
+    if not lines:
+        return
+    terminalreporter.section("artifacts")
+    for line in lines:
+        terminalreporter.write_line(line)
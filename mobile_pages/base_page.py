@@ -1,18 +1,91 @@
 """Base Page Object class for mobile tests."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, Callable, Iterable, TypeVar
 
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
 
-from appium.webdriver.common.appiumby import AppiumBy
+from mobile_utils.ui_snapshot import UiNode, UiSnapshot
+from utils.step_timing import timed_steps
+from utils.waits import AdaptiveWait
 
 if TYPE_CHECKING:
     from appium.webdriver.webdriver import WebDriver
     from selenium.webdriver.remote.webelement import WebElement
 
+# Locator strategy of UiSelector lookups (AppiumBy.ANDROID_UIAUTOMATOR). A plain
+# string keeps the Appium client out of page object imports, as in tools/locator_optimizer.py
+ANDROID_UIAUTOMATOR = "-android uiautomator"
 
+
+def _ui_string(value: str) -> str:
+    """Escape value for a string literal inside UiSelector expression."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _java_regex_literal(text: str) -> str:
+    """
+    Turn plain text into a Java regex that matches it literally.
+
+    Special characters are wrapped into a character class (`.` -> `[.]`),
+    which keeps the expression free of backslashes in most cases.
+    """
+    parts = []
+    for ch in text:
+        if ch.isalnum() or ch in " _-&,:'":
+            parts.append(ch)
+        elif ch in "\\^[]":
+            parts.append("\\" + ch)
+        else:
+            parts.append(f"[{ch}]")
+    return "".join(parts)
+
+
+def unique_anchors(anchors: Iterable[str]) -> tuple[str, ...]:
+    """Remove duplicate anchors keeping declaration order (= priority)."""
+    return tuple(dict.fromkeys(anchors))
+
+
+def match_anchor(text: str, anchors: Iterable[str]) -> str | None:
+    """Return the first anchor contained in `text` (textContains semantics)."""
+    for anchor in anchors:
+        if anchor in text:
+            return anchor
+    return None
+
+
+_P = TypeVar("_P", bound="BasePage")
+_F = TypeVar("_F", bound=Callable)
+
+
+def navigates_to(target: str, cost: float = 2.0) -> Callable[[_F], _F]:
+    """
+    Mark page object method as a navigation edge to another screen.
+
+    The navigation layer (mobile_pages.navigation) collects marked methods
+    to build the screen graph.
+
+    Args:
+        target: Class name of the page object opened by the method
+                (a name, not a class, to avoid circular imports)
+        cost: Initial estimate of the transition time in seconds;
+              replaced by measured timings during runs
+    """
+
+    def decorator(method: _F) -> _F:
+        method._nav_target = target
+        method._nav_cost = cost
+        return method
+
+    return decorator
+
+
+# All page objects that declare anchors (filled automatically on class creation).
+# Used by the screen classifier to answer "which screen is open now?".
+PAGE_REGISTRY: list[type["BasePage"]] = []
+
+
+@timed_steps
 class BasePage:
     """
     Base class for all Page Objects in mobile tests.
@@ -21,20 +94,105 @@ class BasePage:
     - driver and explicit wait initialization;
     - element search by text;
     - text-based clicks with auto-scroll;
-    - waiting for text to appear on screen.
+    - waiting for text to appear on screen;
+    - waiting for the screen itself via declared anchors;
+    - opt-in snapshot mode: lookups answered from one parsed page_source.
+
+    Public methods of the class and of every subclass are timed per call
+    (utils/step_timing.py).
     """
 
-    def __init__(self, driver: "WebDriver", timeout: int = 20) -> None:
+    # Anchors: any of these texts confirms that the screen has opened.
+    # Subclasses only declare them; duplicates are removed once per class,
+    # and all anchors are evaluated together under one shared deadline.
+    ANCHORS: tuple[str, ...] = ()
+    # Message for TimeoutException when none of the anchors appeared
+    LOAD_TIMEOUT_MSG: str | None = None
+    # Optional extra signals for the screen classifier:
+    # - TITLE: text / content-desc of the toolbar on this screen;
+    # - RESOURCE_IDS: ids that are characteristic for this screen.
+    TITLE: str | None = None
+    RESOURCE_IDS: tuple[str, ...] = ()
+    # Intent action that opens this screen directly from anywhere
+    # (`am start -a <action>`), used by the navigation layer as a shortcut.
+    DEEP_LINK: str | None = None
+
+    # How multi-anchor waits probe the screen (one round trip per poll):
+    # - "regex": single UiSelector().textMatches(...) query for all anchors;
+    # - "source": single page_source fetch, anchors are matched locally.
+    ANCHOR_PROBE = "regex"
+
+    def __init__(
+        self,
+        driver: "WebDriver",
+        timeout: int = 20,
+        use_snapshot: bool = False,
+    ) -> None:
         """
         Initialize base Page Object.
 
         Args:
             driver: Active Appium WebDriver instance
             timeout: Timeout for explicit waits (seconds)
+            use_snapshot: If True, lookups are answered from a cached UI
+                          snapshot (one page_source fetch) and clicks are taps
+                          by element bounds. The snapshot is dropped after every
+                          click or scroll made through this page object.
         """
         self.driver = driver
-        # Reuse WebDriverWait for all wait operations
-        self.wait = WebDriverWait(driver, timeout)
+        # Reuse one wait for all wait operations: fast first polls, then backoff,
+        # first poll planned by the learned delay of each condition (utils/waits.py)
+        self.wait = AdaptiveWait(driver, timeout)
+        # Anchor that confirmed the screen in the last wait_loaded() call
+        self.loaded_anchor: str | None = None
+        self.use_snapshot = use_snapshot
+        self._snapshot: UiSnapshot | None = None
+
+    def __init_subclass__(cls, register: bool = True, **kwargs) -> None:
+        """
+        Normalize declared anchors and register the page object.
+
+        Args:
+            register: Set False (`class X(BasePage, register=False)`) for helper
+                      classes that must not take part in screen classification.
+        """
+        super().__init_subclass__(**kwargs)
+        timed_steps(cls)
+        cls.ANCHORS = unique_anchors(cls.ANCHORS)
+        if register and cls.ANCHORS:
+            PAGE_REGISTRY.append(cls)
+
+    # ====== Snapshot mode ======
+
+    def snapshot(self) -> UiSnapshot:
+        """Cached UI snapshot, fetched from device only if there is none yet."""
+        if self._snapshot is None:
+            self._snapshot = UiSnapshot.from_driver(self.driver)
+        return self._snapshot
+
+    def refresh_snapshot(self) -> UiSnapshot:
+        """Drop cached snapshot and fetch a new one."""
+        self._snapshot = None
+        return self.snapshot()
+
+    def invalidate_snapshot(self) -> None:
+        """Screen has (probably) changed: next lookup must fetch page_source again."""
+        self._snapshot = None
+
+    def tap(self, node: UiNode) -> bool:
+        """
+        Tap element by the center of its bounds.
+
+        Returns:
+            False if element has no usable bounds (caller should fall back
+            to a regular element click).
+        """
+        point = node.center
+        if point is None or not node.displayed:
+            return False
+        self.driver.execute_script("mobile: clickGesture", {"x": point[0], "y": point[1]})
+        self.invalidate_snapshot()
+        return True
 
     # ====== Element Search ======
 
@@ -46,7 +204,7 @@ class BasePage:
         often lack convenient resource-ids, so we use text instead.
         """
         return self.driver.find_element(
-            AppiumBy.ANDROID_UIAUTOMATOR,
+            ANDROID_UIAUTOMATOR,
             f'new UiSelector().textContains("{text}")',
         )
 
@@ -60,7 +218,9 @@ class BasePage:
             'new UiScrollable(new UiSelector().scrollable(true))'
             f'.scrollIntoView(new UiSelector().textContains("{text}"))'
         )
-        return self.driver.find_element(AppiumBy.ANDROID_UIAUTOMATOR, ui)
+        # Scrolling changes the screen, cached snapshot is outdated
+        self.invalidate_snapshot()
+        return self.driver.find_element(ANDROID_UIAUTOMATOR, ui)
 
     def find_by_id_and_text(self, res_id: str, text: str) -> "WebElement":
         """
@@ -70,23 +230,76 @@ class BasePage:
         Useful for lists where all elements share the same id but have different labels.
         """
         return self.driver.find_element(
-            AppiumBy.ANDROID_UIAUTOMATOR,
+            ANDROID_UIAUTOMATOR,
             'new UiSelector()'
             f'.resourceId("{res_id}")'
             f'.text("{text}")',
         )
 
+    def find_any_text_contains(self, texts: Iterable[str]) -> "WebElement | None":
+        """
+        Find element containing any of the texts with a single query.
+
+        All texts are combined into one `textMatches` regex, so the device is
+        asked once instead of once per text. Returns None if nothing matched
+        (no exception is raised on a miss).
+        """
+        alternatives = "|".join(_java_regex_literal(t) for t in texts)
+        regex = f"(?s).*({alternatives}).*"
+        elements = self.driver.find_elements(
+            ANDROID_UIAUTOMATOR,
+            f'new UiSelector().textMatches("{_ui_string(regex)}")',
+        )
+        return elements[0] if elements else None
+
+    def probe_anchors(
+        self, texts: Iterable[str]
+    ) -> "tuple[str, WebElement | None] | None":
+        """
+        Check all anchors in one round trip.
+
+        Mode is selected by `ANCHOR_PROBE` (see class attribute).
+
+        Returns:
+            (anchor, element) for the anchor found on screen, or None.
+            Element is None in "source" mode (nothing was queried on device).
+        """
+        texts = list(texts)
+        if self.use_snapshot or self.ANCHOR_PROBE == "source":
+            # Fresh snapshot is kept, so lookups right after the wait are free
+            screen_texts = self.refresh_snapshot().texts()
+            # Whole screen is known locally, so anchors are checked by priority
+            for anchor in texts:
+                if any(anchor in t for t in screen_texts):
+                    return anchor, None
+            return None
+
+        el = self.find_any_text_contains(texts)
+        if el is None:
+            return None
+        # Element may contain several anchors - take the first one by priority
+        return match_anchor(el.text or "", texts) or texts[0], el
+
     # ====== Actions ======
 
-    def click_text_contains(self, text: str, do_scroll: bool = True) -> "WebElement":
+    def click_text_contains(
+        self, text: str, do_scroll: bool = True
+    ) -> "WebElement | UiNode":
         """
         Click element with specified text.
 
+        In snapshot mode the element is looked up locally and tapped by
+        coordinates; device queries are used only if that is not possible.
+
         Args:
             text: Text to search for element
             do_scroll: If True, try to find without scrolling first,
                        if not found, scroll screen to element.
         """
+        if self.use_snapshot:
+            node = self.snapshot().find(text_contains=text)
+            if node is not None and self.tap(node):
+                return node
         try:
             el = self.find_text_contains(text)
         except Exception:
@@ -95,17 +308,23 @@ class BasePage:
                 raise
             el = self.scroll_to_text_contains(text)
         el.click()
+        self.invalidate_snapshot()
         return el
 
-    def click_by_id_and_text(self, res_id: str, text: str) -> "WebElement":
+    def click_by_id_and_text(self, res_id: str, text: str) -> "WebElement | UiNode":
         """
         Click settings list item by `resource-id` and exact `text`.
 
         Example: All list items have id `android:id/title`,
         but differ only by text ("Internet", "Wi-Fi", etc.).
         """
+        if self.use_snapshot:
+            node = self.snapshot().find(resource_id=res_id, text=text)
+            if node is not None and self.tap(node):
+                return node
         el = self.find_by_id_and_text(res_id, text)
         el.click()
+        self.invalidate_snapshot()
         return el
 
     # ====== Waits ======
@@ -126,6 +345,37 @@ class BasePage:
             msg = timeout_msg or f"Timeout waiting for textContains: {text!r}"
             raise TimeoutException(msg) from e
 
+    def wait_loaded(self: _P, anchors: Iterable[str] | None = None) -> _P:
+        """
+        Wait for the screen to open: any of `ANCHORS` must appear.
+
+        All anchors are probed together on every poll, so the worst case is
+        bounded by one timeout instead of one timeout per anchor.
+
+        Args:
+            anchors: Wait for these anchors instead of `ANCHORS` (the navigation
+                     layer passes only anchors that no other screen shows)
+        """
+        self.loaded_anchor = self.wait_any_anchor(
+            self.ANCHORS if anchors is None else anchors,
+            timeout_msg=self.LOAD_TIMEOUT_MSG,
+        )
+        return self
+
+    def wait_any_anchor(
+        self,
+        texts: Iterable[str],
+        timeout_msg: str | None = None,
+    ) -> str:
+        """
+        Wait for at least one text from list to appear and return which one.
+
+        Every poll costs one round trip regardless of the number of anchors,
+        so callers can branch on the returned anchor.
+        """
+        anchor, _ = self._wait_anchor_hit(texts, timeout_msg)
+        return anchor
+
     def wait_any_text_contains(
         self,
         texts: Iterable[str],
@@ -137,19 +387,28 @@ class BasePage:
         Useful for different Android versions where screen title may vary slightly
         (e.g., "Network & internet" / "Internet" / "Wi-Fi").
         """
+        anchor, el = self._wait_anchor_hit(texts, timeout_msg)
+        return el if el is not None else self.find_text_contains(anchor)
+
+    def _wait_anchor_hit(
+        self,
+        texts: Iterable[str],
+        timeout_msg: str | None,
+    ) -> "tuple[str, WebElement | None]":
+        texts = list(texts)
         last_error: Exception | None = None
 
         def _probe(_driver):
             nonlocal last_error
-            for t in texts:
-                try:
-                    return self.find_text_contains(t)
-                except Exception as e:
-                    last_error = e
-            return False
+            try:
+                return self.probe_anchors(texts) or False
+            except Exception as e:
+                last_error = e
+                return False
 
         try:
-            return self.wait.until(_probe)
+            # Delay is learned per page and anchor set
+            return self.wait.until(_probe, key=f"{type(self).__name__}: {' | '.join(texts)}")
         except TimeoutException as e:
-            msg = timeout_msg or f"Timeout waiting any of: {list(texts)!r}"
+            msg = timeout_msg or f"Timeout waiting any of: {texts!r}"
             raise TimeoutException(msg) from (last_error or e)
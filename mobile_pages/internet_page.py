@@ -1,31 +1,38 @@
 """Page Object для экрана Internet (после Network & internet)."""
 from __future__ import annotations
 
+from typing import Iterable
+
+from selenium.common.exceptions import TimeoutException
+
 from mobile_pages.base_page import BasePage
 
 
 class InternetPage(BasePage):
     """
     Экран 'Internet' может отличаться, поэтому проверяем несколько якорей.
+    Все якоря проверяются одновременно, с одним общим таймаутом.
     """
 
-    POSSIBLE_ANCHORS = [
+    ANCHORS = (
         "Internet",
-        "Wi-Fi",        # иногда с необычным дефисом
+        "Wi‑Fi",   # Android пишет Wi‑Fi с неразрывным дефисом (U+2011)
         "Wi-Fi",
         "Mobile data",
         "SIMs",
-    ]
-
-    def wait_loaded(self) -> "InternetPage":
-        last_error = None
-        for anchor in self.POSSIBLE_ANCHORS:
-            try:
-                self.wait_text_contains(anchor)
-                return self
-            except Exception as e:
-                last_error = e
+        "Network preferences",
+    )
+    # Старое имя атрибута оставлено для совместимости
+    POSSIBLE_ANCHORS = ANCHORS
+    # Заголовок тулбара (content-desc у collapsing toolbar)
+    TITLE = "Internet"
+    # На Android 12+ этот intent открывает именно экран Internet
+    DEEP_LINK = "android.settings.WIFI_SETTINGS"
 
-        raise AssertionError(
-            "Internet page did not load. None of anchors were found."
-        ) from last_error
\ No newline at end of file
+    def wait_loaded(self, anchors: Iterable[str] | None = None) -> "InternetPage":
+        try:
+            return super().wait_loaded(anchors)
+        except TimeoutException as e:
+            raise AssertionError(
+                "Internet page did not load. None of anchors were found."
+            ) from e
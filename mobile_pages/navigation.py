@@ -0,0 +1,222 @@
+"""Navigation layer: shortest path between screens.
+
+Page objects declare how screens are connected:
+- methods marked with `@navigates_to("TargetPage")` are UI click edges;
+- `DEEP_LINK` is an intent action that opens the screen from anywhere
+  (`am start -a android.settings.*`).
+
+Every edge carries a cost in seconds. `Navigator.navigate_to(InternetPage)`
+recognizes the current screen, takes the cheapest path (Dijkstra) and, after
+each hop, updates the edge cost from the observed timing, so the graph keeps
+preferring whatever is actually faster on the device under test. Arrival is
+confirmed by anchors that no other screen declares: a shared text (the
+"Network & internet" item on the main screen) would match before the
+transition and teach a near-zero cost.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, TypeVar
+
+from mobile_pages.base_page import PAGE_REGISTRY, BasePage
+from mobile_pages.screen_classifier import where_am_i
+
+if TYPE_CHECKING:
+    from appium.webdriver.webdriver import WebDriver
+
+_P = TypeVar("_P", bound=BasePage)
+
+# Initial estimate for deep links: intent start + screen render
+DEEP_LINK_COST = 1.5
+# Weight of the newest observation in the moving average of edge cost
+COST_SMOOTHING = 0.3
+
+
+def start_intent(driver: "WebDriver", action: str) -> None:
+    """Open screen by intent action via shell (analog of `adb shell am start -a`)."""
+    driver.execute_script(
+        "mobile: shell",
+        {"command": "am", "args": ["start", "-a", action]},
+    )
+
+
+@dataclass(frozen=True)
+class Edge:
+    """Transition between two screens."""
+
+    # None means "from any screen" (deep links work from everywhere)
+    source: type[BasePage] | None
+    target: type[BasePage]
+    # Page object method name for click edges, intent action for deep links
+    action: str
+    deep_link: bool = False
+
+    @property
+    def key(self) -> str:
+        """Stable id used in the cost table."""
+        src = self.source.__name__ if self.source else "*"
+        return f"{src}->{self.target.__name__}:{self.action}"
+
+    def run(self, driver: "WebDriver") -> None:
+        if self.deep_link:
+            start_intent(driver, self.action)
+        else:
+            getattr(self.source(driver), self.action)()
+
+
+class EdgeCosts:
+    """
+    Edge cost table (seconds) with exponential moving average updates.
+
+    If `path` is given (or NAV_COSTS_PATH env var is set), costs are loaded
+    from and saved to a JSON file, so measurements survive between runs.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        path = path or os.getenv("NAV_COSTS_PATH")
+        self.path = Path(path) if path else None
+        self.costs: dict[str, float] = {}
+        if self.path and self.path.exists():
+            self.costs = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, edge: Edge, default: float) -> float:
+        return self.costs.get(edge.key, default)
+
+    def observe(self, edge: Edge, seconds: float) -> float:
+        """Blend new observation into edge cost and return the new value."""
+        old = self.costs.get(edge.key)
+        new = seconds if old is None else (1 - COST_SMOOTHING) * old + COST_SMOOTHING * seconds
+        self.costs[edge.key] = new
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.costs, indent=2, sort_keys=True), encoding="utf-8")
+        return new
+
+
+def collect_edges(pages: Iterable[type[BasePage]]) -> list[tuple[Edge, float]]:
+    """Build graph edges (with initial costs) from page object declarations."""
+    pages = list(pages)
+    by_name = {p.__name__: p for p in pages}
+    edges: list[tuple[Edge, float]] = []
+    for page in pages:
+        if page.DEEP_LINK:
+            edges.append((Edge(None, page, page.DEEP_LINK, deep_link=True), DEEP_LINK_COST))
+        for name in dir(page):
+            method = getattr(page, name, None)
+            target = getattr(method, "_nav_target", None)
+            if target in by_name:
+                edges.append((Edge(page, by_name[target], name), method._nav_cost))
+    return edges
+
+
+def _same_label(a: str, b: str) -> bool:
+    """Whether one anchor would match the other (textContains, any hyphen)."""
+    a, b = a.replace("\u2011", "-"), b.replace("\u2011", "-")
+    return a in b or b in a
+
+
+def arrival_anchors(page: type[BasePage], pages: Iterable[type[BasePage]]) -> tuple[str, ...]:
+    """
+    Anchors of `page` that no other page declares (as anchor or title).
+
+    Falls back to all anchors of the page if none of them is unique.
+    """
+    others = [
+        label
+        for other in pages
+        if other is not page
+        for label in (*other.ANCHORS, *([other.TITLE] if other.TITLE else []))
+    ]
+    unique = tuple(a for a in page.ANCHORS if not any(_same_label(a, o) for o in others))
+    return unique or page.ANCHORS
+
+
+class Navigator:
+    """Moves the app to the requested screen by the cheapest known path."""
+
+    def __init__(
+        self,
+        driver: "WebDriver",
+        pages: Iterable[type[BasePage]] | None = None,
+        costs: EdgeCosts | None = None,
+    ) -> None:
+        self.driver = driver
+        self.pages = list(PAGE_REGISTRY if pages is None else pages)
+        self.costs = costs or DEFAULT_COSTS
+        declared = collect_edges(self.pages)
+        self.edges = [edge for edge, _ in declared]
+        # Declared costs are used until the edge has been measured
+        self._initial = {edge.key: cost for edge, cost in declared}
+        self.arrival = {page: arrival_anchors(page, self.pages) for page in self.pages}
+
+    def cost(self, edge: Edge) -> float:
+        """Current cost of the edge: measured if known, declared otherwise."""
+        return self.costs.get(edge, self._initial[edge.key])
+
+    def shortest_path(
+        self,
+        source: type[BasePage] | None,
+        target: type[BasePage],
+    ) -> list[Edge]:
+        """
+        Cheapest list of edges from `source` to `target` (Dijkstra).
+
+        `source=None` means the current screen is unknown: only deep links
+        can be used for the first hop then.
+
+        Raises:
+            LookupError: If target is unreachable
+        """
+        if source is target:
+            return []
+        # Queue items: (cost, tie-breaker, screen, path)
+        queue: list[tuple[float, int, type[BasePage] | None, list[Edge]]] = [(0.0, 0, source, [])]
+        best: dict[type[BasePage] | None, float] = {source: 0.0}
+        counter = 1
+        while queue:
+            total, _, screen, path = heapq.heappop(queue)
+            if screen is target:
+                return path
+            if total > best.get(screen, float("inf")):
+                continue
+            for edge in self.edges:
+                if edge.source is not None and edge.source is not screen:
+                    continue
+                new_total = total + self.cost(edge)
+                if new_total < best.get(edge.target, float("inf")):
+                    best[edge.target] = new_total
+                    heapq.heappush(queue, (new_total, counter, edge.target, path + [edge]))
+                    counter += 1
+        src = source.__name__ if source else "unknown screen"
+        raise LookupError(f"No path from {src} to {target.__name__}")
+
+    def navigate_to(self, target: type[_P]) -> _P:
+        """
+        Open `target` screen from wherever the app is now.
+
+        Returns:
+            Loaded page object of the target screen
+        """
+        current = where_am_i(self.driver, self.pages)
+        page = None
+        for edge in self.shortest_path(current, target):
+            started = time.perf_counter()
+            edge.run(self.driver)
+            page = edge.target(self.driver).wait_loaded(self.arrival[edge.target])
+            self.costs.observe(edge, time.perf_counter() - started)
+        # Already there: just confirm the screen
+        return page or target(self.driver).wait_loaded()
+
+
+# Costs shared by all navigators of the run
+DEFAULT_COSTS = EdgeCosts()
+
+
+def navigate_to(driver: "WebDriver", target: type[_P]) -> _P:
+    """Shortcut: open `target` screen by the cheapest path."""
+    return Navigator(driver).navigate_to(target)
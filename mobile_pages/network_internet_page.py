@@ -1,33 +1,32 @@
 """Page Object for Network & internet settings screen."""
 from __future__ import annotations
 
-from mobile_pages.base_page import BasePage
+from mobile_pages.base_page import BasePage, navigates_to
 
 
 class NetworkInternetPage(BasePage):
     """Page Object for Network & internet settings screen."""
 
-    # Possible anchors to confirm the screen has actually opened
-    ANCHORS = [
+    # Possible anchors to confirm the screen has actually opened.
+    # On different Android versions, screen title text may vary,
+    # so any of them is accepted (see BasePage.wait_loaded).
+    ANCHORS = (
         "Network & internet",
         "Internet",
         "Wi-Fi",
         "Mobile network",
-    ]
-
-    def wait_loaded(self) -> "NetworkInternetPage":
-        """
-        Wait for Network & internet screen to open.
-
-        On different Android versions, screen title text may vary, so we check
-        multiple options from the ANCHORS list.
-        """
-        self.wait_any_text_contains(
-            self.ANCHORS,
-            timeout_msg="Network & internet page did not load",
-        )
-        return self
-
+        # Items of this screen only: the title and "Internet" are also shown
+        # on the neighbouring screens (see navigation.arrival_anchors)
+        "Airplane mode",
+        "Hotspot & tethering",
+        "SIMs",
+    )
+    LOAD_TIMEOUT_MSG = "Network & internet page did not load"
+    # Toolbar title (exposed as content-desc of collapsing toolbar)
+    TITLE = "Network & internet"
+    DEEP_LINK = "android.settings.WIRELESS_SETTINGS"
+
+    @navigates_to("InternetPage")
     def open_internet(self) -> "NetworkInternetPage":
         """
         Open "Internet" menu item within Network & internet section.
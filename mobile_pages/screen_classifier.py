@@ -0,0 +1,129 @@
+"""Screen classifier: "which screen is open now?" in one round trip.
+
+Instead of waiting for one page object and falling back to another after a
+timeout, tests take a single UI hierarchy snapshot and score every
+registered page object against it:
+- declared ANCHORS found in text / content-desc;
+- declared RESOURCE_IDS present on screen;
+- toolbar TITLE (strongest signal, it is unique per screen).
+
+New page objects are picked up automatically: every BasePage subclass with
+anchors is added to PAGE_REGISTRY when its module is imported.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+from selenium.common.exceptions import TimeoutException
+
+from mobile_pages.base_page import PAGE_REGISTRY, BasePage
+from mobile_utils.ui_snapshot import UiSnapshot
+from utils.waits import AdaptiveWait
+
+# Import known page objects so they are present in the registry
+from mobile_pages import internet_page, network_internet_page, settings_main_page  # noqa: F401
+
+if TYPE_CHECKING:
+    from appium.webdriver.webdriver import WebDriver
+
+# Resource-ids of toolbars that carry the screen title
+TITLE_IDS = frozenset({
+    "com.android.settings:id/collapsing_toolbar",
+    "com.android.settings:id/action_bar",
+})
+
+# Weights of the signals in the final score
+ANCHORS_WEIGHT = 1.0
+IDS_WEIGHT = 1.0
+TITLE_WEIGHT = 2.0
+
+# Below this score the screen is considered unknown
+MIN_SCORE = 0.5
+
+
+@dataclass(frozen=True)
+class ScreenMatch:
+    """Result of scoring one page object against a snapshot."""
+
+    page: type[BasePage]
+    score: float
+    anchors: tuple[str, ...]
+    resource_ids: tuple[str, ...]
+    title: bool
+
+
+def _has_title(snapshot: UiSnapshot, title: str) -> bool:
+    for node in snapshot:
+        if node.resource_id in TITLE_IDS and title in (node.text, node.content_desc):
+            return True
+    return False
+
+
+def score_page(page: type[BasePage], snapshot: UiSnapshot) -> ScreenMatch:
+    """Score how well `snapshot` matches `page` (0.0 - 1.0)."""
+    anchors = tuple(a for a in page.ANCHORS if snapshot.has_label(a))
+    ids = tuple(i for i in page.RESOURCE_IDS if snapshot.has_resource_id(i))
+    title = bool(page.TITLE) and _has_title(snapshot, page.TITLE)
+
+    total = ANCHORS_WEIGHT * len(anchors) / max(len(page.ANCHORS), 1)
+    weights = ANCHORS_WEIGHT
+    if page.RESOURCE_IDS:
+        total += IDS_WEIGHT * len(ids) / len(page.RESOURCE_IDS)
+        weights += IDS_WEIGHT
+    if page.TITLE:
+        total += TITLE_WEIGHT * title
+        weights += TITLE_WEIGHT
+    return ScreenMatch(page, total / weights, anchors, ids, title)
+
+
+def classify(
+    snapshot: UiSnapshot,
+    pages: Iterable[type[BasePage]] | None = None,
+) -> list[ScreenMatch]:
+    """Score all pages (registry by default), best match first."""
+    pages = PAGE_REGISTRY if pages is None else pages
+    return sorted((score_page(p, snapshot) for p in pages), key=lambda m: -m.score)
+
+
+def where_am_i(
+    driver: "WebDriver",
+    pages: Iterable[type[BasePage]] | None = None,
+    min_score: float = MIN_SCORE,
+) -> type[BasePage] | None:
+    """
+    Identify the current screen with a single page_source fetch.
+
+    Returns:
+        Page object class of the best match, or None if no page scored
+        at least `min_score` (unknown screen, e.g. launcher).
+    """
+    matches = classify(UiSnapshot.from_driver(driver), pages)
+    if matches and matches[0].score >= min_score:
+        return matches[0].page
+    return None
+
+
+def wait_for_screen(
+    driver: "WebDriver",
+    pages: Iterable[type[BasePage]] | None = None,
+    timeout: float = 20,
+    min_score: float = MIN_SCORE,
+) -> type[BasePage]:
+    """
+    Wait until the current screen is recognized and return its page object.
+
+    Each poll is one page_source fetch, whatever the number of pages.
+
+    Raises:
+        TimeoutException: If no known screen appeared within `timeout`
+    """
+    pages = list(PAGE_REGISTRY if pages is None else pages)
+    try:
+        return AdaptiveWait(driver, timeout).until(
+            lambda d: where_am_i(d, pages, min_score) or False,
+            key=f"wait_for_screen({', '.join(p.__name__ for p in pages)})",
+        )
+    except TimeoutException as e:
+        names = [p.__name__ for p in pages]
+        raise TimeoutException(f"None of the screens was recognized: {names!r}") from e
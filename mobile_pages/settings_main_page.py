@@ -7,14 +7,15 @@ This screen typically displays main system settings sections:
 """
 from __future__ import annotations
 
-from mobile_pages.base_page import BasePage
+from mobile_pages.base_page import BasePage, navigates_to
 
 
 class SettingsMainPage(BasePage):
     """Page Object for Android Settings main screen."""
 
-    # Anchors: any of these texts indicates we're on the Settings main screen
-    ANCHORS = [
+    # Anchors: any of these texts indicates we're on the Settings main screen.
+    # Multiple options cover different Android versions (see BasePage.wait_loaded).
+    ANCHORS = (
         "Network & internet",
         "Connected devices",
         "Apps",
@@ -22,20 +23,16 @@ class SettingsMainPage(BasePage):
         "Battery",
         "Storage",
         "Search Settings",  # Often present on Pixel / Android 13
-    ]
-
-    def wait_loaded(self) -> "SettingsMainPage":
-        """
-        Wait for Settings main screen to open.
-
-        Uses multiple possible anchor texts to cover different Android versions.
-        """
-        self.wait_any_text_contains(
-            self.ANCHORS,
-            timeout_msg="Settings main page did not load",
-        )
-        return self
-
+    )
+    LOAD_TIMEOUT_MSG = "Settings main page did not load"
+    # Home page of Settings has its own container and search bar
+    RESOURCE_IDS = (
+        "com.android.settings:id/homepage_container",
+        "com.android.settings:id/search_action_bar",
+    )
+    DEEP_LINK = "android.settings.SETTINGS"
+
+    @navigates_to("NetworkInternetPage")
     def open_network_and_internet(self) -> None:
         """
         Open "Network & internet" section from Settings main screen.
@@ -0,0 +1,342 @@
+"""Record/replay HTTP proxy between the Appium client and Appium server.
+
+Device speed hides the cost of our own framework (page objects, waits,
+fixtures). The proxy separates the two:
+- record mode forwards every W3C command to the real Appium server and
+  writes command + response to a cassette (JSON lines);
+- replay mode answers the same commands from the cassette without any
+  server or device, with configurable per-command latency, so the same
+  suite can be run at 0 ms, 50 ms or 300 ms round trip.
+
+Command counts and time are collected per test and per command
+(e.g. "POST element", "GET source") and printed in the terminal summary.
+
+Configuration (environment variables, used by tests/mobile/conftest.py):
+- APPIUM_PROXY=record|replay — enable the proxy;
+- APPIUM_CASSETTE — cassette file (default artifacts/appium_cassette.jsonl;
+  with pytest-xdist the worker id is added to the name);
+- APPIUM_REPLAY_LATENCY_MS — fixed latency per command in replay
+  (default: latency recorded for that command);
+- APPIUM_REPLAY_COMMAND_LATENCY="GET source=300;POST element=80" — per-command override.
+
+Standalone run (e.g. to replay for a tool or a REPL session):
+    python -m mobile_utils.appium_proxy replay --cassette artifacts/appium_cassette.jsonl --port 4799
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_CASSETTE = Path("artifacts") / "appium_cassette.jsonl"
+
+_SESSION_RE = re.compile(r"^/session/[^/]+")
+_ELEMENT_RE = re.compile(r"/(element|shadow)/[^/]+")
+
+
+def command_name(method: str, path: str) -> str:
+    """
+    Readable W3C command name without session and element ids.
+
+    Examples: "POST element", "GET source", "POST element/:id/click",
+    "POST session" (new session), "DELETE session".
+    """
+    path = path.split("?", 1)[0].rstrip("/")
+    rest = _SESSION_RE.sub("", path, count=1)
+    if rest == path:
+        # /session itself (new session) or a server-level command (/status)
+        return f"{method} {path.lstrip('/') or '/'}"
+    rest = _ELEMENT_RE.sub(r"/\1/:id", rest).lstrip("/")
+    return f"{method} {rest or 'session'}"
+
+
+def _normalize_body(command: str, body: bytes) -> str:
+    # Capabilities of a new session differ between runs (ports, udid) - not part of the key
+    if command == "POST session" or not body:
+        return ""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        return body.decode("utf-8", "replace")
+
+
+def parse_command_latency(value: str) -> dict[str, float]:
+    """Parse "GET source=300;POST element=80" into {command: ms}."""
+    result = {}
+    for part in value.split(";"):
+        if "=" in part:
+            command, ms = part.rsplit("=", 1)
+            result[command.strip()] = float(ms)
+    return result
+
+
+@dataclass
+class Exchange:
+    """One recorded command and its response."""
+
+    method: str
+    path: str
+    command: str
+    request: str
+    status: int
+    response: str
+    elapsed_ms: float
+
+
+@dataclass
+class CommandStats:
+    """Count and total time of commands (per test or per command name)."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    by_command: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class AppiumProxy:
+    """HTTP proxy in a background thread; `start()` returns its URL."""
+
+    def __init__(
+        self,
+        mode: str,
+        cassette: str | Path = DEFAULT_CASSETTE,
+        upstream: str | None = None,
+        latency_ms: float | None = None,
+        command_latency: dict[str, float] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', got {mode!r}")
+        self.mode = mode
+        self.cassette = Path(cassette)
+        self.upstream = upstream
+        self.latency_ms = latency_ms
+        self.command_latency = command_latency or {}
+        self.host = host
+        self.port = port
+        self.current_test = ""
+        self.tests: dict[str, CommandStats] = defaultdict(CommandStats)
+        self.commands: dict[str, CommandStats] = defaultdict(CommandStats)
+        self.unmatched = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        # Replay: recorded responses per key, served in recorded order
+        self._recorded: dict[tuple[str, str, str], deque[Exchange]] = {}
+
+    @classmethod
+    def from_env(cls) -> "AppiumProxy | None":
+        """Proxy configured by APPIUM_PROXY* env vars, or None if disabled."""
+        mode = os.getenv("APPIUM_PROXY", "").strip().lower()
+        if not mode:
+            return None
+        cassette = Path(os.getenv("APPIUM_CASSETTE", str(DEFAULT_CASSETTE)))
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if worker:
+            # Each xdist worker has its own session and its own cassette
+            cassette = cassette.with_name(f"{cassette.stem}_{worker}{cassette.suffix}")
+        latency = os.getenv("APPIUM_REPLAY_LATENCY_MS")
+        return cls(
+            mode,
+            cassette,
+            latency_ms=float(latency) if latency else None,
+            command_latency=parse_command_latency(os.getenv("APPIUM_REPLAY_COMMAND_LATENCY", "")),
+        )
+
+    # ====== Lifecycle ======
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("proxy is not started")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, upstream: str | None = None) -> str:
+        """Start serving (once) and return proxy URL to pass to webdriver.Remote."""
+        if self._server is not None:
+            return self.url
+        self.upstream = upstream or self.upstream
+        if self.mode == "record":
+            if not self.upstream:
+                raise ValueError("record mode needs upstream Appium server URL")
+            self.cassette.parent.mkdir(parents=True, exist_ok=True)
+            self.cassette.write_text("", encoding="utf-8")
+        else:
+            self._load_cassette()
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="appium-proxy", daemon=True
+        )
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def begin_test(self, test_id: str) -> None:
+        """Attribute following commands to `test_id`."""
+        with self._lock:
+            self.current_test = test_id
+
+    # ====== Record / replay ======
+
+    def _load_cassette(self) -> None:
+        recorded: dict[tuple[str, str, str], deque[Exchange]] = defaultdict(deque)
+        with open(self.cassette, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    ex = Exchange(**json.loads(line))
+                    key = (ex.method, _SESSION_RE.sub("/session/:sid", ex.path), ex.request)
+                    recorded[key].append(ex)
+        self._recorded = dict(recorded)
+
+    def _record(self, method: str, path: str, body: bytes, headers: dict[str, str]) -> tuple[int, bytes]:
+        started = time.perf_counter()
+        req = urllib.request.Request(
+            self.upstream.rstrip("/") + path, data=body or None, method=method, headers=headers
+        )
+        try:
+            with urllib.request.urlopen(req) as resp:
+                status, payload = resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            # W3C errors come as 4xx/5xx with JSON body - record them as well
+            status, payload = e.code, e.read()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        command = command_name(method, path)
+        ex = Exchange(
+            method, path, command, _normalize_body(command, body),
+            status, payload.decode("utf-8", "replace"), round(elapsed_ms, 2),
+        )
+        with self._lock, open(self.cassette, "a", encoding="utf-8") as f:
+            f.write(json.dumps(ex.__dict__, ensure_ascii=False) + "\n")
+        return status, payload
+
+    def _replay(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        command = command_name(method, path)
+        key = (method, _SESSION_RE.sub("/session/:sid", path), _normalize_body(command, body))
+        with self._lock:
+            queue = self._recorded.get(key)
+            if not queue:
+                self.unmatched += 1
+                ex = None
+            elif len(queue) > 1:
+                ex = queue.popleft()
+            else:
+                # Last recorded answer is repeated (e.g. extra polls of a wait)
+                ex = queue[0]
+        if ex is None:
+            error = {
+                "value": {
+                    "error": "unknown command",
+                    "message": f"replay: no recorded response for {method} {path}",
+                    "stacktrace": "",
+                }
+            }
+            return 404, json.dumps(error).encode("utf-8")
+        delay = self.command_latency.get(
+            command, self.latency_ms if self.latency_ms is not None else ex.elapsed_ms
+        )
+        time.sleep(delay / 1000)
+        return ex.status, ex.response.encode("utf-8")
+
+    def _observe(self, method: str, path: str, elapsed_ms: float) -> None:
+        command = command_name(method, path)
+        with self._lock:
+            for stats in (self.tests[self.current_test or "<no test>"], self.commands[command]):
+                stats.count += 1
+                stats.total_ms += elapsed_ms
+                stats.by_command[command] += 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                started = time.perf_counter()
+                if proxy.mode == "record":
+                    headers = {"Content-Type": self.headers.get("Content-Type", "application/json")}
+                    status, payload = proxy._record(self.command, self.path, body, headers)
+                else:
+                    status, payload = proxy._replay(self.command, self.path, body)
+                proxy._observe(self.command, self.path, (time.perf_counter() - started) * 1000)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_DELETE = _handle
+
+            def log_message(self, format, *args) -> None:
+                pass  # Keep pytest output clean
+
+        return Handler
+
+    # ====== Report ======
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        """Lines for the pytest terminal summary."""
+        total = sum(s.count for s in self.commands.values())
+        total_ms = sum(s.total_ms for s in self.commands.values())
+        lines = [
+            f"mode: {self.mode}, cassette: {self.cassette}, "
+            f"commands: {total}, round trips: {total_ms / 1000:.2f}s"
+            + (f", unmatched in replay: {self.unmatched}" if self.unmatched else "")
+        ]
+        lines.append("by command:")
+        for command, s in sorted(self.commands.items(), key=lambda kv: -kv[1].total_ms)[:top]:
+            lines.append(f"  {command:32} {s.count:5d}  {s.total_ms:9.1f} ms")
+        lines.append("by test:")
+        for test, s in sorted(self.tests.items(), key=lambda kv: -kv[1].count)[:top]:
+            lines.append(f"  {s.count:5d} cmds  {s.total_ms:9.1f} ms  {test}")
+        return lines
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Record/replay proxy for Appium")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", default=str(DEFAULT_CASSETTE))
+    parser.add_argument("--upstream", default="http://127.0.0.1:4723", help="Appium server (record)")
+    parser.add_argument("--port", type=int, default=4799)
+    parser.add_argument("--latency-ms", type=float, help="fixed latency per command (replay)")
+    parser.add_argument(
+        "--command-latency", default="", help='per-command latency, e.g. "GET source=300;POST element=80"'
+    )
+    args = parser.parse_args(argv)
+    proxy = AppiumProxy(
+        args.mode, args.cassette, args.upstream, args.latency_ms,
+        parse_command_latency(args.command_latency), port=args.port,
+    )
+    print(f"[PROXY] {args.mode} on {proxy.start()}, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+        for line in proxy.summary_lines():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,20 @@ Includes:
 - screenshots of failed/successful scenarios;
 - page source dumps;
 - list of all visible texts on screen.
+
+Files are written in the background (see utils.artifact_writer),
+so saving artifacts costs the test only the capture itself.
+
+Bulk extraction (texts, bounds, ids) works from a single page_source
+fetch parsed locally, instead of one HTTP call per element.
 """
 
-from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 import sys
 
-from appium.webdriver.common.appiumby import AppiumBy
+from mobile_utils.ui_snapshot import UiSnapshot
+from utils.artifact_writer import capture_artifacts
 
 if TYPE_CHECKING:
     from appium.webdriver.webdriver import WebDriver
@@ -20,38 +26,67 @@ if TYPE_CHECKING:
 ARTIFACTS_DIR = Path("artifacts")
 
 
-def save_artifacts(driver: "WebDriver", prefix: str = "mobile") -> None:
+def save_artifacts(driver: "WebDriver", prefix: str = "mobile") -> str:
     """
     Save screenshot and page source for current screen.
 
     Args:
         driver: Active Appium WebDriver session
         prefix: Prefix for file names (e.g., "FAILED" or "settings_ok")
+
+    Returns:
+        Saved page source, so callers can analyze it without fetching again
     """
-    ARTIFACTS_DIR.mkdir(exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Screenshot + full XML of current screen; files are written in background
+    return capture_artifacts(driver, ARTIFACTS_DIR, prefix, source_ext="xml")
 
-    png_path = ARTIFACTS_DIR / f"{prefix}_{ts}.png"
-    xml_path = ARTIFACTS_DIR / f"{prefix}_{ts}.xml"
 
-    # Screenshot of screen
-    driver.save_screenshot(str(png_path))
-    # Full XML of current screen
-    xml_path.write_text(driver.page_source, encoding="utf-8")
+def collect_nodes(
+    driver: "WebDriver | None" = None,
+    page_source: str | None = None,
+) -> list[dict]:
+    """
+    Return attributes of all UI nodes at once: text, ids, bounds, visibility.
 
-    print(f"[ARTIFACT] screenshot: {png_path}")
-    print(f"[ARTIFACT] page_source: {xml_path}")
+    Args:
+        driver: Appium session (used only if `page_source` is not given)
+        page_source: Already fetched XML - then no request is sent at all
+    """
+    source = page_source if page_source is not None else driver.page_source
+    return [
+        {
+            "class": node.cls,
+            "text": node.text,
+            "resource-id": node.resource_id,
+            "content-desc": node.content_desc,
+            "bounds": node.bounds,
+            "displayed": node.displayed,
+        }
+        for node in UiSnapshot.from_source(source)
+    ]
 
 
-def dump_visible_texts(driver: "WebDriver", limit: int = 60) -> None:
+def dump_visible_texts(
+    driver: "WebDriver | None" = None,
+    limit: int = 60,
+    page_source: str | None = None,
+) -> None:
     """
     Print all visible text elements on screen to console.
 
     This greatly helps with debugging: quickly see which texts
     are actually rendered on screen without manually tapping the app.
+
+    Texts are taken from one page_source fetch (or from `page_source`
+    passed by caller, e.g. the one just saved by `save_artifacts`).
     """
-    text_views = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
-    texts = [el.text.strip() for el in text_views if el.text and el.text.strip()]
+    source = page_source if page_source is not None else driver.page_source
+    snapshot = UiSnapshot.from_source(source)
+    texts = [
+        node.text.strip()
+        for node in snapshot.find_all(cls="android.widget.TextView")
+        if node.displayed and node.text.strip()
+    ]
 
     print("\n===== VISIBLE TEXTS =====")
     encoding = sys.stdout.encoding or "utf-8"
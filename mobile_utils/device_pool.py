@@ -0,0 +1,237 @@
+"""Device pool for running mobile tests on several devices in parallel.
+
+Each pytest-xdist worker (or thread) leases one device exclusively.
+A lease is an exclusive OS lock (`flock` / `msvcrt.locking`) held on a lock
+file in a shared directory for the whole lease, so workers in different
+processes see each other's leases. Every device gets its own ports
+(`systemPort`, `mjpegServerPort`, Appium port) derived from its index,
+so parallel UiAutomator2 sessions never fight over the same port.
+
+If a worker crashes, the operating system drops its lock together with the
+process, so the device is free again at once. Lock files are never deleted
+(they only keep the last owner for debugging): deleting a file another worker
+has just opened would let two workers lock two different files of one device.
+
+Configuration (environment variables):
+- ANDROID_UDIDS="emulator-5554,emulator-5556" — comma-separated list;
+- ANDROID_UDIDS_FILE=devices.txt — one UDID per line (# for comments);
+- DEVICE_POOL_LOCK_DIR — directory for lock files (default: system temp);
+- DEVICE_LEASE_TIMEOUT — how long to wait for a free device (seconds).
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Sequence, TypeVar
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+T = TypeVar("T")
+
+# Default base ports; device N gets base + N
+BASE_SYSTEM_PORT = 8200
+BASE_MJPEG_SERVER_PORT = 9200
+BASE_APPIUM_PORT = 4723
+
+
+@dataclass(frozen=True)
+class DeviceLease:
+    """Exclusive right of one worker to use one device."""
+
+    udid: str
+    index: int
+    system_port: int
+    mjpeg_server_port: int
+    appium_port: int
+    lock_path: Path
+
+    def server_url(self, host: str = "127.0.0.1") -> str:
+        """URL of the Appium server dedicated to this device."""
+        return f"http://{host}:{self.appium_port}"
+
+
+def _lock_fd(fd: int) -> bool:
+    """Take an exclusive lock on the open file without waiting; False if it is held."""
+    try:
+        if os.name == "nt":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock_fd(fd: int) -> None:
+    if os.name == "nt":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def read_udids_file(path: str | Path) -> list[str]:
+    """Read UDIDs from a text file: one per line, `#` starts a comment."""
+    udids = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            udids.append(line)
+    return udids
+
+
+class DevicePool:
+    """Allocator that hands out devices to workers exclusively."""
+
+    def __init__(
+        self,
+        udids: Sequence[str],
+        lock_dir: str | Path | None = None,
+        base_system_port: int = BASE_SYSTEM_PORT,
+        base_mjpeg_server_port: int = BASE_MJPEG_SERVER_PORT,
+        base_appium_port: int = BASE_APPIUM_PORT,
+        poll_interval: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            udids: Device UDIDs (duplicates are ignored)
+            lock_dir: Directory for lock files shared by all workers
+            base_system_port: UiAutomator2 `systemPort` of device #0
+            base_mjpeg_server_port: `mjpegServerPort` of device #0
+            base_appium_port: Appium server port of device #0
+            poll_interval: Pause between attempts while all devices are busy
+        """
+        self.udids = list(dict.fromkeys(udids))
+        if not self.udids:
+            raise ValueError("Device pool is empty: no UDIDs configured")
+        self.lock_dir = Path(lock_dir or Path(tempfile.gettempdir()) / "qa_device_pool")
+        self.base_system_port = base_system_port
+        self.base_mjpeg_server_port = base_mjpeg_server_port
+        self.base_appium_port = base_appium_port
+        self.poll_interval = poll_interval
+        self._local_lock = threading.Lock()
+        # Open lock files of the leases of this pool: closing the file drops the lock
+        self._held: dict[Path, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "DevicePool | None":
+        """Build pool from ANDROID_UDIDS / ANDROID_UDIDS_FILE, or None if not set."""
+        udids: list[str] = []
+        udids_file = os.getenv("ANDROID_UDIDS_FILE")
+        if udids_file:
+            udids.extend(read_udids_file(udids_file))
+        udids.extend(u.strip() for u in os.getenv("ANDROID_UDIDS", "").split(",") if u.strip())
+        if not udids:
+            return None
+        return cls(udids, lock_dir=os.getenv("DEVICE_POOL_LOCK_DIR"))
+
+    # ====== Leasing ======
+
+    def _lock_path(self, udid: str) -> Path:
+        safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in udid)
+        return self.lock_dir / f"{safe}.lock"
+
+    def _make_lease(self, index: int) -> DeviceLease:
+        udid = self.udids[index]
+        return DeviceLease(
+            udid=udid,
+            index=index,
+            system_port=self.base_system_port + index,
+            mjpeg_server_port=self.base_mjpeg_server_port + index,
+            appium_port=self.base_appium_port + index,
+            lock_path=self._lock_path(udid),
+        )
+
+    def _try_lock(self, path: Path, owner: str) -> bool:
+        """Lock the device's lock file; the lock is held until `release` or process exit."""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT)
+        if not _lock_fd(fd):
+            os.close(fd)
+            return False
+        # Owner info is only for people looking at the lock directory
+        info = json.dumps({"pid": os.getpid(), "owner": owner, "since": time.time()})
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, info.encode("utf-8"))
+        self._held[path] = fd
+        return True
+
+    def try_lease(self, owner: str = "") -> DeviceLease | None:
+        """Lease the first free device without waiting, or return None."""
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        with self._local_lock:
+            for index in range(len(self.udids)):
+                lease = self._make_lease(index)
+                if self._try_lock(lease.lock_path, owner):
+                    return lease
+        return None
+
+    def lease(self, owner: str = "", timeout: float = 600) -> DeviceLease:
+        """
+        Lease a free device, waiting while all devices are busy.
+
+        Raises:
+            TimeoutError: If no device became free within `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            lease = self.try_lease(owner)
+            if lease is not None:
+                return lease
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"No free device in pool {self.udids!r} after {timeout}s"
+                )
+            time.sleep(self.poll_interval)
+
+    def release(self, lease: DeviceLease) -> None:
+        """Return device to the pool."""
+        with self._local_lock:
+            fd = self._held.pop(lease.lock_path, None)
+        if fd is None:
+            return
+        try:
+            _unlock_fd(fd)
+        finally:
+            os.close(fd)
+
+    @contextmanager
+    def leased(self, owner: str = "", timeout: float = 600) -> Iterator[DeviceLease]:
+        """Context manager: lease a device and always release it afterwards."""
+        lease = self.lease(owner, timeout)
+        try:
+            yield lease
+        finally:
+            self.release(lease)
+
+    @contextmanager
+    def session(
+        self,
+        factory: Callable[[DeviceLease], T],
+        owner: str = "",
+        timeout: float = 600,
+    ) -> Iterator[T]:
+        """
+        Lease a device and open a driver on it via `factory(lease)`.
+
+        The driver is quit and the device released even if the test crashes.
+        Any factory works here, so allocation logic can be tested with fakes.
+        """
+        with self.leased(owner, timeout) as lease:
+            drv = factory(lease)
+            try:
+                yield drv
+            finally:
+                try:
+                    drv.quit()
+                except Exception:
+                    pass
@@ -0,0 +1,417 @@
+"""Offline replay driver backed by recorded UI dumps.
+
+`ReplayDriver` imitates the part of the Appium WebDriver API used by page
+objects, serving screens from recorded `page_source` XML files:
+- `page_source`, `current_package`, screenshots;
+- `find_element(s)` by `-android uiautomator` (UiSelector subset we use,
+  including `UiScrollable(...).scrollIntoView(...)`), `id` and `accessibility id`;
+- element `click()` and `execute_script("mobile: clickGesture")`;
+- `execute_script("mobile: shell")` with `am start -a <action>` and `am force-stop`;
+- `terminate_app`, `implicitly_wait`, `quit`.
+
+A scenario is a folder with XML dumps and `scenario.json`:
+
+    {
+      "start": "launcher",
+      "screens": {"launcher": "launcher.xml", "settings": "settings.xml"},
+      "intents": {"android.settings.SETTINGS": "settings"},
+      "transitions": {"settings": {"Network & internet": "network"}}
+    }
+
+`transitions` map a label (text or content-desc) of the tapped element to
+the next screen. Stopping the app returns to the `start` screen.
+
+Page object logic and waits run against it in milliseconds without an
+emulator or Appium server: set MOBILE_REPLAY_DIR to a scenario folder and
+the `driver` fixture creates a ReplayDriver instead of an Appium session.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+
+from mobile_utils.ui_snapshot import UiNode, UiSnapshot
+
+SCENARIO_FILE = "scenario.json"
+
+# Returned when the scenario has no screenshot for a screen (1x1 transparent PNG)
+PLACEHOLDER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+# `.method("string")` or `.method(true)` / `.method(3)` in a UiSelector chain
+_SELECTOR_CALL_RE = re.compile(r'\.(\w+)\((?:"((?:[^"\\]|\\.)*)"|(true|false|\d+))\)')
+_SCROLL_INTO_VIEW_RE = re.compile(r"\.scrollIntoView\((new UiSelector\(\).*)\)\s*$")
+
+
+@dataclass
+class ReplayScenario:
+    """Recorded screens and transitions between them."""
+
+    screens: dict[str, str]  # screen name -> page_source XML
+    start: str
+    intents: dict[str, str] = field(default_factory=dict)
+    transitions: dict[str, dict[str, str]] = field(default_factory=dict)
+    screenshots: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "ReplayScenario":
+        """Read `scenario.json` and the dumps it refers to."""
+        directory = Path(directory)
+        config = json.loads((directory / SCENARIO_FILE).read_text(encoding="utf-8"))
+        screens = {
+            name: (directory / file).read_text(encoding="utf-8")
+            for name, file in config["screens"].items()
+        }
+        screenshots = {
+            name: (directory / file).read_bytes()
+            for name, file in config.get("screenshots", {}).items()
+        }
+        scenario = cls(
+            screens=screens,
+            start=config["start"],
+            intents=config.get("intents", {}),
+            transitions=config.get("transitions", {}),
+            screenshots=screenshots,
+        )
+        unknown = (
+            {scenario.start}
+            | set(scenario.intents.values())
+            | {s for targets in scenario.transitions.values() for s in targets.values()}
+        ) - set(screens)
+        if unknown:
+            raise ValueError(f"{directory / SCENARIO_FILE}: unknown screens {sorted(unknown)}")
+        return scenario
+
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value)
+
+
+def parse_ui_selector(expression: str) -> list[tuple[str, str | bool | int]]:
+    """
+    Parse UiSelector expression into a list of (method, argument).
+
+    `new UiScrollable(...).scrollIntoView(<selector>)` is reduced to the
+    inner selector: recorded dumps have no hidden rows to scroll to.
+    """
+    expression = expression.strip()
+    scroll = _SCROLL_INTO_VIEW_RE.search(expression)
+    if expression.startswith("new UiScrollable") and scroll:
+        expression = scroll.group(1)
+    if not expression.startswith("new UiSelector()"):
+        raise InvalidSelectorException(f"replay: unsupported UiAutomator expression: {expression}")
+    body = expression[len("new UiSelector()"):]
+    calls = []
+    pos = 0
+    for m in _SELECTOR_CALL_RE.finditer(body):
+        if m.start() != pos:
+            break
+        if m.group(2) is not None:
+            arg: str | bool | int = _unescape(m.group(2))
+        elif m.group(3) in ("true", "false"):
+            arg = m.group(3) == "true"
+        else:
+            arg = int(m.group(3))
+        calls.append((m.group(1), arg))
+        pos = m.end()
+    if pos != len(body):
+        raise InvalidSelectorException(f"replay: cannot parse UiSelector: {expression}")
+    return calls
+
+
+# UiSelector method -> check of one node
+_SELECTOR_CHECKS = {
+    "text": lambda n, v: n.text == v,
+    "textContains": lambda n, v: v in n.text,
+    "textStartsWith": lambda n, v: n.text.startswith(v),
+    "textMatches": lambda n, v: re.fullmatch(v, n.text) is not None,
+    "resourceId": lambda n, v: n.resource_id == v,
+    "resourceIdMatches": lambda n, v: re.fullmatch(v, n.resource_id) is not None,
+    "description": lambda n, v: n.content_desc == v,
+    "descriptionContains": lambda n, v: v in n.content_desc,
+    "descriptionMatches": lambda n, v: re.fullmatch(v, n.content_desc) is not None,
+    "className": lambda n, v: n.cls == v,
+    "scrollable": lambda n, v: (n.attrib.get("scrollable") == "true") == v,
+    "clickable": lambda n, v: (n.attrib.get("clickable") == "true") == v,
+    "enabled": lambda n, v: (n.attrib.get("enabled", "true") == "true") == v,
+}
+
+
+def select_nodes(snapshot: UiSnapshot, expression: str) -> list[UiNode]:
+    """Nodes of the snapshot matched by UiSelector expression, in document order."""
+    checks = []
+    instance = None
+    for method, arg in parse_ui_selector(expression):
+        if method == "instance":
+            instance = arg
+            continue
+        check = _SELECTOR_CHECKS.get(method)
+        if check is None:
+            raise InvalidSelectorException(f"replay: UiSelector.{method}() is not supported")
+        checks.append((check, arg))
+    nodes = [n for n in snapshot if n.displayed and all(check(n, arg) for check, arg in checks)]
+    if instance is not None:
+        return nodes[instance:instance + 1]
+    return nodes
+
+
+class ReplayElement:
+    """Element of a replayed screen; stale after the screen changes."""
+
+    def __init__(self, driver: "ReplayDriver", element_id: str) -> None:
+        self.parent = driver
+        self.id = element_id
+
+    def _execute(self, command: str, params: dict | None = None):
+        return self.parent.execute(command, {"id": self.id, **(params or {})})["value"]
+
+    @property
+    def text(self) -> str:
+        return self._execute("getElementText")
+
+    @property
+    def tag_name(self) -> str:
+        return self._execute("getElementTagName")
+
+    @property
+    def rect(self) -> dict[str, int]:
+        return self._execute("getElementRect")
+
+    @property
+    def location(self) -> dict[str, int]:
+        rect = self.rect
+        return {"x": rect["x"], "y": rect["y"]}
+
+    @property
+    def size(self) -> dict[str, int]:
+        rect = self.rect
+        return {"width": rect["width"], "height": rect["height"]}
+
+    def get_attribute(self, name: str) -> str | None:
+        return self._execute("getElementAttribute", {"name": name})
+
+    def is_displayed(self) -> bool:
+        return self.get_attribute("displayed") != "false"
+
+    def is_enabled(self) -> bool:
+        return self._execute("isElementEnabled")
+
+    def click(self) -> None:
+        self._execute("clickElement")
+
+
+class ReplayDriver:
+    """
+    Fake Appium WebDriver that serves screens of a recorded scenario.
+
+    Like Selenium's RemoteWebDriver, every public method and element
+    property goes through `execute(command, params)`, so command
+    instrumentation (utils.command_trace) sees the same round trips.
+    """
+
+    # Attribute names accepted by Appium `get_attribute` -> dump attributes
+    _ATTRIBUTE_ALIASES = {
+        "resourceId": "resource-id",
+        "contentDescription": "content-desc",
+        "className": "class",
+    }
+
+    def __init__(self, scenario: ReplayScenario) -> None:
+        self.scenario = scenario
+        self.session_id = "replay"
+        self.screen = scenario.start
+        # Incremented on every screen change: elements found before become stale
+        self.screen_version = 0
+        self.history = [scenario.start]
+        self._snapshots: dict[str, UiSnapshot] = {}
+        # Elements found on the current screen, by element id
+        self._elements: dict[str, UiNode] = {}
+        self._next_element = 0
+
+    @classmethod
+    def from_dir(cls, directory: str | Path) -> "ReplayDriver":
+        return cls(ReplayScenario.load(directory))
+
+    # ====== Screen state ======
+
+    def _snapshot(self) -> UiSnapshot:
+        if self.screen not in self._snapshots:
+            self._snapshots[self.screen] = UiSnapshot.from_source(self.scenario.screens[self.screen])
+        return self._snapshots[self.screen]
+
+    def go_to(self, screen: str) -> None:
+        """Switch to another recorded screen."""
+        self.screen = screen
+        self.screen_version += 1
+        self.history.append(screen)
+        self._elements.clear()
+
+    def tap(self, x: int, y: int) -> None:
+        """
+        Tap at screen coordinates.
+
+        If any element under the point has a label listed in the transition
+        map of the current screen, the scenario moves to the next screen.
+        """
+        targets = self.scenario.transitions.get(self.screen, {})
+        for node in reversed(self._snapshot().nodes):  # innermost first
+            if not node.bounds:
+                continue
+            x1, y1, x2, y2 = node.bounds
+            if not (x1 <= x < x2 and y1 <= y < y2):
+                continue
+            for label in (node.text, node.content_desc):
+                if label in targets:
+                    self.go_to(targets[label])
+                    return
+
+    # ====== Command dispatch ======
+
+    def execute(self, driver_command: str, params: dict | None = None) -> dict:
+        """Run one command and return W3C-like response `{"value": ...}`."""
+        handler = getattr(self, f"_cmd_{driver_command}", None)
+        if handler is None:
+            raise WebDriverException(f"replay: command {driver_command!r} is not supported")
+        return {"value": handler(**(params or {}))}
+
+    def _node(self, id: str) -> UiNode:
+        node = self._elements.get(id)
+        if node is None:
+            raise StaleElementReferenceException("replay: screen has changed since lookup")
+        return node
+
+    def _cmd_getPageSource(self) -> str:
+        return self.scenario.screens[self.screen]
+
+    def _cmd_getCurrentPackage(self) -> str:
+        nodes = self._snapshot().nodes
+        return nodes[0].attrib.get("package", "") if nodes else ""
+
+    def _cmd_findElements(self, using: str, value: str) -> list[ReplayElement]:
+        snapshot = self._snapshot()
+        if using == "-android uiautomator":
+            nodes = select_nodes(snapshot, value)
+        elif using == "id":
+            nodes = snapshot.find_all(resource_id=value)
+        elif using == "accessibility id":
+            nodes = snapshot.find_all(content_desc=value)
+        else:
+            raise InvalidSelectorException(f"replay: locator strategy {using!r} is not supported")
+        elements = []
+        for node in nodes:
+            self._next_element += 1
+            element_id = f"replay-{self._next_element}"
+            self._elements[element_id] = node
+            elements.append(ReplayElement(self, element_id))
+        return elements
+
+    def _cmd_findElement(self, using: str, value: str) -> ReplayElement:
+        elements = self._cmd_findElements(using, value)
+        if not elements:
+            raise NoSuchElementException(f"replay: no element {using}={value!r} on screen {self.screen!r}")
+        return elements[0]
+
+    def _cmd_getElementText(self, id: str) -> str:
+        return self._node(id).text
+
+    def _cmd_getElementTagName(self, id: str) -> str:
+        return self._node(id).cls
+
+    def _cmd_getElementRect(self, id: str) -> dict[str, int]:
+        x1, y1, x2, y2 = self._node(id).bounds or (0, 0, 0, 0)
+        return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+
+    def _cmd_getElementAttribute(self, id: str, name: str) -> str | None:
+        return self._node(id).attrib.get(self._ATTRIBUTE_ALIASES.get(name, name))
+
+    def _cmd_isElementEnabled(self, id: str) -> bool:
+        return self._node(id).attrib.get("enabled", "true") == "true"
+
+    def _cmd_clickElement(self, id: str) -> None:
+        node = self._node(id)
+        if node.center is None:
+            raise WebDriverException("replay: element has no tappable area")
+        self.tap(*node.center)
+
+    def _cmd_w3cExecuteScript(self, script: str, args: list) -> str | None:
+        params = args[0] if args else {}
+        if script == "mobile: clickGesture":
+            self.tap(int(params["x"]), int(params["y"]))
+            return None
+        if script == "mobile: shell" and params.get("command") == "am":
+            return self._am(list(params.get("args", [])))
+        raise WebDriverException(f"replay: unsupported script {script!r} {params!r}")
+
+    def _am(self, args: list[str]) -> str:
+        if args[:2] == ["start", "-a"] and len(args) > 2:
+            screen = self.scenario.intents.get(args[2])
+            if screen is None:
+                raise WebDriverException(f"replay: no screen recorded for intent {args[2]!r}")
+            self.go_to(screen)
+            return ""
+        if args[:1] == ["force-stop"] and len(args) > 1:
+            self._cmd_terminateApp(args[1])
+            return ""
+        raise WebDriverException(f"replay: unsupported am command {args!r}")
+
+    def _cmd_terminateApp(self, appId: str, **options) -> bool:
+        # Returns to the start screen if the app is in foreground
+        if self._cmd_getCurrentPackage() != appId:
+            return False
+        self.go_to(self.scenario.start)
+        return True
+
+    def _cmd_screenshot(self) -> str:
+        png = self.scenario.screenshots.get(self.screen, PLACEHOLDER_PNG)
+        return base64.b64encode(png).decode("ascii")
+
+    def _cmd_setTimeouts(self, **timeouts) -> None:
+        pass
+
+    def _cmd_quit(self) -> None:
+        pass
+
+    # ====== WebDriver API ======
+
+    @property
+    def page_source(self) -> str:
+        return self.execute("getPageSource")["value"]
+
+    @property
+    def current_package(self) -> str:
+        return self.execute("getCurrentPackage")["value"]
+
+    def find_elements(self, by: str = "id", value: str | None = None) -> list[ReplayElement]:
+        return self.execute("findElements", {"using": by, "value": value or ""})["value"]
+
+    def find_element(self, by: str = "id", value: str | None = None) -> ReplayElement:
+        return self.execute("findElement", {"using": by, "value": value or ""})["value"]
+
+    def execute_script(self, script: str, *args):
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+    def terminate_app(self, app_id: str, **options) -> bool:
+        return self.execute("terminateApp", {"appId": app_id, **options})["value"]
+
+    def get_screenshot_as_base64(self) -> str:
+        return self.execute("screenshot")["value"]
+
+    def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(self.get_screenshot_as_base64())
+
+    def implicitly_wait(self, time_to_wait: float) -> None:
+        self.execute("setTimeouts", {"implicit": int(time_to_wait * 1000)})
+
+    def quit(self) -> None:
+        self.execute("quit")
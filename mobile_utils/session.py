@@ -0,0 +1,200 @@
+"""Reusable Appium session for mobile tests.
+
+Creating a UiAutomator2 session costs several seconds, so in reuse mode
+all tests of one pytest process (or one pytest-xdist worker) share a single
+session:
+- between tests the app is only stopped (cheap reset);
+- before each test a health check verifies that the session is alive;
+- a dead session is replaced with a new one only when needed.
+
+Setup/teardown timings are collected to compare both modes on long suites.
+
+`make_driver` creates sessions for the `driver` fixture and for tools that
+need a live device (tools/locator_optimizer.py --benchmark).
+"""
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+from utils.command_trace import TRACER
+
+if TYPE_CHECKING:
+    from appium.webdriver.webdriver import WebDriver
+
+    from mobile_utils.appium_proxy import AppiumProxy
+    from mobile_utils.device_pool import DeviceLease
+
+# Application under test: all current scenarios work with system Settings
+SETTINGS_PACKAGE = "com.android.settings"
+
+
+def stop_app(driver: "WebDriver", package: str = SETTINGS_PACKAGE) -> None:
+    """
+    Stop application so the next test always starts clean.
+
+    `terminate_app` is tried first; if it is not supported,
+    the app is force-stopped via shell (analog of `adb shell am force-stop`).
+    """
+    try:
+        driver.terminate_app(package)
+    except Exception:
+        # Fallback: force-stop via shell
+        try:
+            driver.execute_script(
+                "mobile: shell",
+                {"command": "am", "args": ["force-stop", package]},
+            )
+        except Exception:
+            pass
+
+
+def make_driver(
+    lease: DeviceLease | None = None,
+    proxy: AppiumProxy | None = None,
+    replay_dir: str | None = None,
+) -> WebDriver:
+    """
+    Create and configure Appium WebDriver for Android.
+
+    All parameters are taken from environment variables (if set),
+    or use reasonable default values.
+
+    Args:
+        lease: Device leased from the device pool. It defines udid and
+               unique ports, so parallel sessions do not conflict.
+        proxy: Record/replay proxy the commands should go through
+        replay_dir: Recorded scenario folder (default: MOBILE_REPLAY_DIR)
+
+    With a replay folder, returns ReplayDriver serving the recorded
+    scenario from that folder (no emulator or Appium server needed).
+    """
+    replay_dir = replay_dir or os.getenv("MOBILE_REPLAY_DIR")
+    if replay_dir:
+        from mobile_utils.replay_driver import ReplayDriver
+
+        return TRACER.instrument(ReplayDriver.from_dir(replay_dir))
+
+    # Appium client is loaded by the first caller that needs a real session
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.automation_name = "UiAutomator2"
+    options.device_name = os.getenv("ANDROID_DEVICE_NAME", "Android Emulator")
+    options.udid = os.getenv("ANDROID_UDID", "emulator-5554")
+    options.no_reset = True  # Don't reinstall app between tests
+    options.new_command_timeout = 300  # Session idle timeout in seconds
+
+    # Appium server URL can be overridden via APPIUM_SERVER_URL.
+    server_url = os.getenv("APPIUM_SERVER_URL", "http://127.0.0.1:4723")
+
+    if lease is not None:
+        options.udid = lease.udid
+        options.system_port = lease.system_port
+        options.mjpeg_server_port = lease.mjpeg_server_port
+        # Without explicit APPIUM_SERVER_URL each device has its own Appium server
+        server_url = os.getenv("APPIUM_SERVER_URL", lease.server_url())
+    if proxy is not None:
+        # Real server becomes upstream of the proxy (not used in replay mode)
+        server_url = proxy.start(upstream=server_url)
+    driver = webdriver.Remote(server_url, options=options)
+    # Every command is recorded (see utils/command_trace.py)
+    TRACER.instrument(driver)
+
+    # Important: implicit wait should not be used to avoid interfering with explicit waits.
+    driver.implicitly_wait(0)
+    return driver
+
+
+class DriverSession:
+    """
+    One Appium session shared between tests.
+
+    The driver is created lazily on first `acquire()` and recreated only
+    if the health check shows that the session is dead (e.g. Appium
+    server restarted or `newCommandTimeout` expired).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], "WebDriver"],
+        app_package: str = SETTINGS_PACKAGE,
+    ) -> None:
+        """
+        Args:
+            factory: Function that creates a new driver (e.g. `make_driver`)
+            app_package: Package that is stopped between tests
+        """
+        self._factory = factory
+        self.app_package = app_package
+        self.driver: "WebDriver | None" = None
+        # How many sessions were created in total (1 means perfect reuse)
+        self.created = 0
+
+    def is_alive(self) -> bool:
+        """Check session health with one cheap command."""
+        if self.driver is None:
+            return False
+        try:
+            # Any lightweight command works; a dead session raises here.
+            self.driver.current_package
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> "WebDriver":
+        """Return a healthy driver, creating or replacing it when needed."""
+        if not self.is_alive():
+            self._quit_quietly()
+            self.driver = self._factory()
+            self.created += 1
+        return self.driver
+
+    def reset(self) -> None:
+        """Cheap state reset between tests: stop the app, keep the session."""
+        if self.driver is not None:
+            stop_app(self.driver, self.app_package)
+
+    def close(self) -> None:
+        """Close the shared session at the end of the run."""
+        self._quit_quietly()
+
+    def _quit_quietly(self) -> None:
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception:
+            # The session may already be dead - nothing to close then
+            pass
+        self.driver = None
+
+
+@dataclass
+class FixtureTimings:
+    """Per-test setup/teardown durations of the `driver` fixture."""
+
+    setup: list[float] = field(default_factory=list)
+    teardown: list[float] = field(default_factory=list)
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def summary_lines(self, mode: str, sessions: int) -> list[str]:
+        """Build lines for the pytest terminal summary."""
+        tests = len(self.setup)
+        if not tests:
+            return []
+        setup_total = sum(self.setup)
+        teardown_total = sum(self.teardown)
+        return [
+            f"driver mode: {mode}, tests: {tests}, sessions created: {sessions}",
+            f"setup:    total {setup_total:.2f}s, avg {setup_total / tests:.3f}s",
+            f"teardown: total {teardown_total:.2f}s, "
+            f"avg {teardown_total / max(len(self.teardown), 1):.3f}s",
+        ]
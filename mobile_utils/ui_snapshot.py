@@ -0,0 +1,164 @@
+"""Local snapshot of the UI hierarchy.
+
+One `driver.page_source` fetch is parsed into a list of nodes, so many
+questions about the current screen ("which texts are visible?", "is there
+an element with this resource-id?") are answered locally instead of
+sending a separate UiAutomator query for each of them.
+
+Nodes are indexed by text, resource-id, class and content-desc, so exact
+lookups are dictionary hits and "contains" lookups only scan distinct values.
+"""
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from appium.webdriver.webdriver import WebDriver
+
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+
+def parse_bounds(value: str) -> tuple[int, int, int, int] | None:
+    """Parse Android bounds string "[x1,y1][x2,y2]" into a tuple."""
+    m = _BOUNDS_RE.fullmatch(value.strip()) if value else None
+    if not m:
+        return None
+    return tuple(int(v) for v in m.groups())  # type: ignore[return-value]
+
+
+@dataclass
+class UiNode:
+    """One element of the UI hierarchy (attributes only, no WebElement)."""
+
+    cls: str
+    text: str = ""
+    resource_id: str = ""
+    content_desc: str = ""
+    bounds: tuple[int, int, int, int] | None = None
+    displayed: bool = True
+    attrib: dict[str, str] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_element(cls, el: ET.Element) -> "UiNode":
+        a = el.attrib
+        return cls(
+            cls=a.get("class", el.tag),
+            text=a.get("text", ""),
+            resource_id=a.get("resource-id", ""),
+            content_desc=a.get("content-desc", ""),
+            bounds=parse_bounds(a.get("bounds", "")),
+            displayed=a.get("displayed", "true") == "true",
+            attrib=dict(a),
+        )
+
+    def label_contains(self, text: str) -> bool:
+        """True if visible text or content-desc contains `text`."""
+        return text in self.text or text in self.content_desc
+
+    @property
+    def center(self) -> tuple[int, int] | None:
+        """Tap point in the middle of the element, if bounds are known."""
+        if not self.bounds:
+            return None
+        x1, y1, x2, y2 = self.bounds
+        if x2 <= x1 or y2 <= y1:
+            # Zero-size element cannot be tapped
+            return None
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+
+class UiSnapshot:
+    """Parsed UI hierarchy of the current screen."""
+
+    def __init__(self, nodes: list[UiNode]) -> None:
+        self.nodes = nodes
+        self.by_text = self._index(lambda n: n.text)
+        self.by_resource_id = self._index(lambda n: n.resource_id)
+        self.by_class = self._index(lambda n: n.cls)
+        self.by_content_desc = self._index(lambda n: n.content_desc)
+
+    def _index(self, key) -> dict[str, list[UiNode]]:
+        index: dict[str, list[UiNode]] = defaultdict(list)
+        for node in self.nodes:
+            value = key(node)
+            if value:
+                index[value].append(node)
+        return dict(index)
+
+    @classmethod
+    def from_source(cls, page_source: str) -> "UiSnapshot":
+        """Parse XML returned by `driver.page_source`."""
+        root = ET.fromstring(page_source.encode("utf-8"))
+        # Root <hierarchy> is not a UI element
+        return cls([UiNode.from_element(el) for el in root.iter() if el is not root])
+
+    @classmethod
+    def from_driver(cls, driver: "WebDriver") -> "UiSnapshot":
+        """Take a snapshot with a single round trip to the device."""
+        return cls.from_source(driver.page_source)
+
+    def __iter__(self) -> Iterator[UiNode]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def has_label(self, text: str) -> bool:
+        """Any node whose text or content-desc contains `text`."""
+        return any(text in value for value in self.by_text) or any(
+            text in value for value in self.by_content_desc
+        )
+
+    def has_resource_id(self, res_id: str) -> bool:
+        return res_id in self.by_resource_id
+
+    # ====== Queries (same semantics as UiSelector) ======
+
+    def find_all(
+        self,
+        text: str | None = None,
+        text_contains: str | None = None,
+        resource_id: str | None = None,
+        cls: str | None = None,
+        content_desc: str | None = None,
+    ) -> list[UiNode]:
+        """
+        Find nodes matching all given criteria, in document order.
+
+        Exact criteria are answered from indexes; `text_contains`
+        scans distinct texts only.
+        """
+        candidates: list[list[UiNode]] = []
+        if text is not None:
+            candidates.append(self.by_text.get(text, []))
+        if resource_id is not None:
+            candidates.append(self.by_resource_id.get(resource_id, []))
+        if cls is not None:
+            candidates.append(self.by_class.get(cls, []))
+        if content_desc is not None:
+            candidates.append(self.by_content_desc.get(content_desc, []))
+        if text_contains is not None:
+            candidates.append(
+                [n for value, nodes in self.by_text.items() if text_contains in value for n in nodes]
+            )
+        if not candidates:
+            return list(self.nodes)
+        # Intersect starting from the smallest candidate list
+        candidates.sort(key=len)
+        selected = set(map(id, candidates[0]))
+        for other in candidates[1:]:
+            selected &= set(map(id, other))
+        return [n for n in self.nodes if id(n) in selected]
+
+    def find(self, **criteria) -> UiNode | None:
+        """First node matching criteria (see `find_all`), or None."""
+        nodes = self.find_all(**criteria)
+        return nodes[0] if nodes else None
+
+    def texts(self) -> list[str]:
+        """Non-empty texts in document order."""
+        return [node.text for node in self.nodes if node.text.strip()]
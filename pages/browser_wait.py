@@ -0,0 +1,140 @@
+"""Browser-side waits: resolved inside the page, one script call per wait.
+
+`WebDriverWait` (and AdaptiveWait) ask the browser again and again
+"is the element there yet?" — every poll is a full WebDriver round trip
+and the answer is noticed only at the next poll.
+
+`wait_in_browser` sends one `execute_async_script`: the page installs a
+MutationObserver (DOM changes) plus a requestAnimationFrame loop (CSS
+changes, e.g. a modal fading in) and answers as soon as the condition
+holds, returning the element and its text in the same response.
+The session script timeout is read before the call; it is raised only
+when the wait needs it (the default 30 s covers usual waits) and
+restored right after.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+# Extra seconds of script timeout over the wait itself, so the page answers first
+SCRIPT_TIMEOUT_MARGIN = 5
+
+WAIT_JS = """
+    const [using, value, visible, timeoutMs, done] = arguments;
+    const find = () => using === 'xpath'
+        ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+        : document.querySelector(value);
+    const isVisible = (el) => {
+        if (!el.getClientRects().length) return false;
+        for (let node = el; node && node.nodeType === 1; node = node.parentElement) {
+            const style = getComputedStyle(node);
+            if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') return false;
+        }
+        return true;
+    };
+    let finished = false;
+    let observer = null;
+    const finish = (result) => {
+        if (finished) return;
+        finished = true;
+        if (observer) observer.disconnect();
+        done(result);
+    };
+    const check = () => {
+        if (finished) return true;
+        const el = find();
+        if (el && (!visible || isVisible(el))) {
+            finish([el, el.innerText || el.textContent || '']);
+            return true;
+        }
+        return false;
+    };
+    if (check()) return;
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+    });
+    // CSS transitions do not mutate the DOM: re-check every frame
+    // (timers instead of frames in background tabs, where rAF is paused)
+    const tick = () => {
+        if (check()) return;
+        if (document.hidden) setTimeout(tick, 50); else requestAnimationFrame(tick);
+    };
+    tick();
+    setTimeout(() => finish(null), timeoutMs);
+"""
+
+
+@dataclass
+class BrowserWaitResult:
+    """Element found by the browser-side wait and its visible text."""
+
+    element: "WebElement"
+    text: str
+
+
+def to_browser_locator(locator: tuple[str, str]) -> tuple[str, str]:
+    """Convert Selenium locator to ("css" | "xpath", expression) understood by WAIT_JS."""
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    if by == By.TAG_NAME:
+        return "css", value
+    raise ValueError(f"Locator strategy is not supported by browser-side waits: {by!r}")
+
+
+def wait_in_browser(
+    driver: "WebDriver",
+    locator: tuple[str, str],
+    timeout: float = 10,
+    visible: bool = True,
+    message: str = "",
+) -> BrowserWaitResult:
+    """Wait inside the browser until the element is present (and visible).
+
+    Args:
+        driver: Selenium WebDriver
+        locator: (By, value); id, css, xpath, name, class name and tag name are supported
+        timeout: Maximum wait in seconds
+        visible: If False, presence in DOM is enough
+        message: Message of TimeoutException
+
+    Returns:
+        Element and its text, received in the same response
+
+    Raises:
+        TimeoutException: If the condition did not hold within `timeout`
+    """
+    using, value = to_browser_locator(locator)
+    # Async script timeout must outlive the wait; a raised timeout is restored
+    # afterwards, so other scripts of the session keep their own limit
+    script_timeout = timeout + SCRIPT_TIMEOUT_MARGIN
+    previous = driver.timeouts.script
+    raised = previous < script_timeout
+    if raised:
+        driver.set_script_timeout(script_timeout)
+    try:
+        result = driver.execute_async_script(WAIT_JS, using, value, visible, int(timeout * 1000))
+    finally:
+        if raised:
+            driver.set_script_timeout(previous)
+    if not result:
+        raise TimeoutException(message or f"Timeout waiting in browser for {locator!r}")
+    element, text = result
+    return BrowserWaitResult(element, text)
@@ -1,20 +1,32 @@
 """Page Object for DemoQA Practice Form page."""
 import os
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
 
 from selenium.webdriver import Keys
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+
+from pages.browser_wait import wait_in_browser
+from utils.step_timing import timed_steps
+from utils.waits import AdaptiveWait
+from web_utils.page_load import ADS_AND_TRACKERS, OpenTiming, ResourcePolicy, open_page
 
 if TYPE_CHECKING:
     from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
 
 
+@timed_steps
 class FormPage:
     """Page Object for DemoQA form page."""
 
-    URL = "https://demoqa.com/automation-practice-form"
+    # DEMOQA_BASE_URL points the page to another host, e.g. the local copy
+    # served by web_utils/local_site.py
+    BASE_URL = os.getenv("DEMOQA_BASE_URL", "https://demoqa.com").rstrip("/")
+    PATH = "/automation-practice-form"
+    URL = BASE_URL + PATH
+
+    # Requests the form does not need (blocked via CDP while the page is used)
+    RESOURCE_POLICY = ResourcePolicy(block=ADS_AND_TRACKERS)
 
     # Locators (id, css or xpath)
     FIRST_NAME = (By.ID, "firstName")
@@ -23,30 +35,224 @@ class FormPage:
     GENDER_LABEL = "//label[text()='{gender}']"
     MOBILE = (By.ID, "userNumber")
     SUBJECT_INPUT = (By.ID, "subjectsInput")
+    SUBJECTS_CONTAINER = (By.ID, "subjectsContainer")
+    # Label of a selected subject (react-select chip)
+    SUBJECT_CHIP = (By.CSS_SELECTOR, ".subjects-auto-complete__multi-value__label")
     HOBBY_LABEL = "//label[text()='{hobby}']"
     UPLOAD = (By.ID, "uploadPicture")
     ADDRESS = (By.ID, "currentAddress")
     STATE = (By.ID, "react-select-3-input")
+    STATE_CONTAINER = (By.ID, "state")
     CITY = (By.ID, "react-select-4-input")
+    CITY_CONTAINER = (By.ID, "city")
     SUBMIT_BUTTON = (By.CSS_SELECTOR, '[id="submit"]')
 
+    # The page is ready for the test as soon as this element is visible
+    READY_LOCATOR = FIRST_NAME
+
     MODAL_TITLE = (By.ID, "example-modal-sizes-title-lg")
     MODAL_TABLE = (By.CSS_SELECTOR, ".table-responsive")
 
-    def __init__(self, driver: "WebDriver", timeout: int = 10) -> None:
+    # Text inputs of fill_all() by key
+    TEXT_FIELDS = {
+        "first_name": FIRST_NAME,
+        "last_name": LAST_NAME,
+        "email": EMAIL,
+        "mobile": MOBILE,
+        "address": ADDRESS,
+    }
+
+    # Keys accepted by fill_all(); lists are allowed for subjects and hobbies
+    FILL_KEYS = (
+        "first_name", "last_name", "email", "gender", "mobile", "subjects",
+        "hobbies", "picture", "address", "state", "city",
+    )
+
+    # Fills everything in one round trip. Text values are set through the native
+    # value setter + input/change events, otherwise React keeps its old state.
+    # Radios/checkboxes are clicked via their labels; react-select values are
+    # typed into the helper input and confirmed with Enter. Element ids come
+    # from the locators above (see _script_ids). Returns keys that could not
+    # be set, they are filled by regular typing afterwards.
+    FILL_ALL_JS = """
+        const [data, ids] = arguments;
+        const failed = [];
+        const setNative = (el, value) => {
+            const proto = el instanceof HTMLTextAreaElement
+                ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        };
+        for (const [key, id] of Object.entries(ids.text)) {
+            if (!(key in data)) continue;
+            const el = document.getElementById(id);
+            if (el) setNative(el, data[key]);
+            if (!el || el.value !== data[key]) failed.push(key);
+        }
+        const labels = Array.from(document.querySelectorAll('label'));
+        const check = (key, texts) => {
+            for (const text of texts) {
+                const label = labels.find(l => l.textContent.trim() === text);
+                const input = label && document.getElementById(label.htmlFor);
+                if (input && !input.checked) label.click();
+                if (!input || !input.checked) { failed.push(key); return; }
+            }
+        };
+        // Only selected values count: the open menu and older chips contain option texts too
+        const chips = (container, value) => Array.from(
+            container.querySelectorAll(ids.chip)
+        ).filter(el => el.textContent.trim() === value).length;
+        const pick = (key, [inputId, containerId], values, multi) => {
+            for (const value of values) {
+                const input = document.getElementById(inputId);
+                const container = document.getElementById(containerId);
+                if (!input || input.disabled || !container) { failed.push(key); return; }
+                const before = multi ? chips(container, value) : 0;
+                input.focus();
+                setNative(input, value);
+                input.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', bubbles: true}));
+                // Enter must add a new chip (multi) or set the single value
+                const single = container.querySelector('[class*="singleValue"]');
+                const ok = multi
+                    ? chips(container, value) > before
+                    : Boolean(single) && single.textContent.trim() === value;
+                if (!ok) { failed.push(key); return; }
+            }
+        };
+        if ('gender' in data) check('gender', [data.gender]);
+        if ('hobbies' in data) check('hobbies', data.hobbies);
+        if ('subjects' in data) pick('subjects', ids.subjects, data.subjects, true);
+        // City list depends on the chosen state
+        if ('state' in data) pick('state', ids.state, [data.state], false);
+        if ('city' in data) pick('city', ids.city, [data.city], false);
+        if (document.activeElement) document.activeElement.blur();
+        return failed;
+    """
+
+    def __init__(self, driver: "WebDriver", timeout: int = 10, base_url: str | None = None) -> None:
         """Initialize Page Object.
 
         Args:
             driver: WebDriver instance
             timeout: Timeout for explicit waits in seconds
+            base_url: Site to open instead of BASE_URL (e.g. "http://127.0.0.1:8000")
         """
         self.driver = driver
-        self.wait = WebDriverWait(driver, timeout)
+        self.timeout = timeout
+        self.url = base_url.rstrip("/") + self.PATH if base_url else self.URL
+        # Timing of the last open() (see web_utils/page_load.py)
+        self.last_open: OpenTiming | None = None
+        # Drop-in for WebDriverWait: fast first polls, then backoff (utils/waits.py)
+        self.wait = AdaptiveWait(driver, timeout)
+
+    def open(self) -> OpenTiming:
+        """Open form page and wait until the form itself is visible.
+
+        Ads and trackers are blocked by RESOURCE_POLICY; with the eager page
+        load strategy `get` returns at DOMContentLoaded, so the wait for
+        READY_LOCATOR decides when the page is usable.
+
+        Returns:
+            Navigation / readiness timing of this open
+        """
+        self.last_open = open_page(
+            self.driver,
+            self.url,
+            self.RESOURCE_POLICY,
+            lambda: self._visible(self.READY_LOCATOR),
+            page=type(self).__name__,
+        )
+        return self.last_open
+
+    # expected_conditions load the Selenium WebDriver client: they are imported
+    # by the first wait, so importing the page object (and collecting tests) stays cheap
+    def _visible(self, locator: tuple[str, str]) -> "WebElement":
+        from selenium.webdriver.support import expected_conditions as EC
+
+        return self.wait.until(EC.visibility_of_element_located(locator))
+
+    def _clickable(self, locator: tuple[str, str]) -> "WebElement":
+        from selenium.webdriver.support import expected_conditions as EC
+
+        return self.wait.until(EC.element_to_be_clickable(locator))
 
-    def open(self) -> None:
-        """Open form page."""
-        self.driver.get(self.URL)
-        self.driver.execute_script("window.scrollTo(0, 200);")
+    def _present(self, locator: tuple[str, str]) -> "WebElement":
+        from selenium.webdriver.support import expected_conditions as EC
+
+        return self.wait.until(EC.presence_of_element_located(locator))
+
+    def fill_all(self, data: Mapping[str, Any], type_fields: Iterable[str] = ()) -> list[str]:
+        """Fill the whole form with one script call.
+
+        Only fields that need real keystrokes cost extra round trips: the
+        picture is always uploaded with `send_keys`, fields listed in
+        `type_fields` and fields the script could not set are typed
+        one by one with the regular methods.
+
+        Args:
+            data: Values by key (see FILL_KEYS), e.g.
+                  {"first_name": "Ivan", "gender": "Male", "hobbies": ["Sports"]}
+            type_fields: Keys to fill by typing instead of the script
+
+        Returns:
+            Keys that were filled by typing
+
+        Raises:
+            ValueError: If data contains unknown keys
+        """
+        unknown = set(data) - set(self.FILL_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown form fields: {sorted(unknown)}")
+        values = {k: [v] if k in ("subjects", "hobbies") and isinstance(v, str) else v for k, v in data.items()}
+        typed = [k for k in self.FILL_KEYS if k in values and (k in type_fields or k == "picture")]
+
+        self._visible(self.FIRST_NAME)
+        scripted = {k: v for k, v in values.items() if k not in typed}
+        failed = self.driver.execute_script(self.FILL_ALL_JS, scripted, self._script_ids()) if scripted else []
+
+        fallback = [k for k in self.FILL_KEYS if k in typed or k in failed]
+        for key in fallback:
+            self._type_field(key, values[key])
+        return fallback
+
+    def _script_ids(self) -> dict[str, Any]:
+        """Element ids (By.ID locators) and the chip selector for FILL_ALL_JS."""
+        return {
+            "text": {key: locator[1] for key, locator in self.TEXT_FIELDS.items()},
+            "chip": self.SUBJECT_CHIP[1],
+            "subjects": [self.SUBJECT_INPUT[1], self.SUBJECTS_CONTAINER[1]],
+            "state": [self.STATE[1], self.STATE_CONTAINER[1]],
+            "city": [self.CITY[1], self.CITY_CONTAINER[1]],
+        }
+
+    def _type_field(self, key: str, value: Any) -> None:
+        """Fill one field of fill_all() by typing (real keystrokes)."""
+        if key in self.TEXT_FIELDS:
+            field = self._visible(self.TEXT_FIELDS[key])
+            field.clear()
+            field.send_keys(value)
+        elif key == "gender":
+            self.choose_gender(value)
+        elif key == "hobbies":
+            for hobby in value:
+                checkbox = self.driver.find_elements(By.XPATH, f"{self.HOBBY_LABEL.format(hobby=hobby)}/../input")
+                if not (checkbox and checkbox[0].is_selected()):
+                    self.choose_hobby(hobby)
+        elif key == "subjects":
+            # The script may have added some chips before it failed: type only the rest
+            selected = [chip.text.strip() for chip in self.driver.find_elements(*self.SUBJECT_CHIP)]
+            for subject in value:
+                if subject in selected:
+                    selected.remove(subject)
+                else:
+                    self.fill_subject(subject)
+        elif key == "picture":
+            self.upload_picture(value)
+        elif key == "state":
+            self._choose_react_select(self.STATE, value)
+        elif key == "city":
+            self._choose_react_select(self.CITY, value)
 
     def fill_name(self, first: str, last: str) -> None:
         """Enter first and last name.
@@ -55,8 +261,8 @@ class FormPage:
             first: First name
             last: Last name
         """
-        self.wait.until(EC.visibility_of_element_located(self.FIRST_NAME)).send_keys(first)
-        self.wait.until(EC.visibility_of_element_located(self.LAST_NAME)).send_keys(last)
+        self._visible(self.FIRST_NAME).send_keys(first)
+        self._visible(self.LAST_NAME).send_keys(last)
 
     def fill_email(self, email: str) -> None:
         """Enter email address.
@@ -64,7 +270,7 @@ class FormPage:
         Args:
             email: Email address
         """
-        self.wait.until(EC.visibility_of_element_located(self.EMAIL)).send_keys(email)
+        self._visible(self.EMAIL).send_keys(email)
 
     def choose_gender(self, gender_text: str) -> None:
         """Select gender by text.
@@ -73,7 +279,7 @@ class FormPage:
             gender_text: Text to select (e.g., "Male", "Female", "Other")
         """
         xpath = (By.XPATH, self.GENDER_LABEL.format(gender=gender_text))
-        self.wait.until(EC.element_to_be_clickable(xpath)).click()
+        self._clickable(xpath).click()
 
     def fill_mobile(self, mobile: str) -> None:
         """Enter phone number.
@@ -81,7 +287,7 @@ class FormPage:
         Args:
             mobile: Phone number
         """
-        self.wait.until(EC.visibility_of_element_located(self.MOBILE)).send_keys(mobile)
+        self._visible(self.MOBILE).send_keys(mobile)
 
     def fill_subject(self, subject: str) -> None:
         """Enter subject.
@@ -89,7 +295,7 @@ class FormPage:
         Args:
             subject: Subject name
         """
-        subject_field = self.wait.until(EC.element_to_be_clickable(self.SUBJECT_INPUT))
+        subject_field = self._clickable(self.SUBJECT_INPUT)
         subject_field.click()
         subject_field.send_keys(subject)
         subject_field.send_keys(Keys.RETURN)
@@ -101,7 +307,7 @@ class FormPage:
             hobby_text: Text to select (e.g., "Sports", "Reading", "Music")
         """
         xpath = (By.XPATH, self.HOBBY_LABEL.format(hobby=hobby_text))
-        self.wait.until(EC.element_to_be_clickable(xpath)).click()
+        self._clickable(xpath).click()
 
     def upload_picture(self, file_path: str) -> None:
         """Upload image file.
@@ -115,7 +321,7 @@ class FormPage:
         abs_path = os.path.abspath(file_path)
         if not os.path.exists(abs_path):
             raise FileNotFoundError(f"File not found: {abs_path}")
-        self.wait.until(EC.presence_of_element_located(self.UPLOAD)).send_keys(abs_path)
+        self._present(self.UPLOAD).send_keys(abs_path)
 
     def fill_address(self, address_text: str) -> None:
         """Enter address.
@@ -123,7 +329,7 @@ class FormPage:
         Args:
             address_text: Address text
         """
-        self.wait.until(EC.visibility_of_element_located(self.ADDRESS)).send_keys(address_text)
+        self._visible(self.ADDRESS).send_keys(address_text)
 
     def choose_state_and_city(self, state: str, city: str) -> None:
         """Select state and city.
@@ -135,28 +341,30 @@ class FormPage:
             state: State name
             city: City name
         """
-        state_input = self.wait.until(EC.element_to_be_clickable(self.STATE))
-        state_input.send_keys(state)
-        state_input.send_keys(Keys.RETURN)
+        self._choose_react_select(self.STATE, state)
+        self._choose_react_select(self.CITY, city)
 
-        city_input = self.wait.until(EC.element_to_be_clickable(self.CITY))
-        city_input.send_keys(city)
-        city_input.send_keys(Keys.RETURN)
+    def _choose_react_select(self, locator: tuple[str, str], value: str) -> None:
+        """Type value into react-select helper input and confirm with Enter."""
+        select_input = self._clickable(locator)
+        select_input.send_keys(value)
+        select_input.send_keys(Keys.RETURN)
 
     def submit(self) -> None:
         """Scroll to button and click submit via JavaScript."""
-        button = self.wait.until(EC.element_to_be_clickable(self.SUBMIT_BUTTON))
+        button = self._clickable(self.SUBMIT_BUTTON)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
         self.driver.execute_script("arguments[0].click();", button)
 
     def wait_for_modal(self) -> str:
         """Wait for result modal to appear and return title text.
 
+        The wait runs inside the browser (one round trip, see pages/browser_wait.py).
+
         Returns:
             Modal title text
         """
-        title = self.wait.until(EC.visibility_of_element_located(self.MODAL_TITLE)).text
-        return title
+        return wait_in_browser(self.driver, self.MODAL_TITLE, self.timeout).text
 
     def get_modal_table_text(self) -> str:
         """Return result table text.
@@ -164,4 +372,4 @@ class FormPage:
         Returns:
             Result table text
         """
-        return self.wait.until(EC.visibility_of_element_located(self.MODAL_TABLE)).text
+        return wait_in_browser(self.driver, self.MODAL_TABLE, self.timeout).text
@@ -1,67 +1,112 @@
-"""Pytest configuration for mobile tests (Appium)."""
+"""Pytest configuration for mobile tests (Appium).
+
+Appium client and failure artifact helpers are imported where they are
+used: collecting tests that do not request `driver` (device pool, proxy,
+snapshot parsing, ...) does not load the Appium client.
+"""
+from __future__ import annotations
 
 import os
-from typing import Generator
+from typing import TYPE_CHECKING, Generator
 
 import pytest
-from appium import webdriver
-from appium.options.android import UiAutomator2Options
 
-from mobile_utils.artifacts import dump_visible_texts, save_artifacts
+from mobile_utils.appium_proxy import AppiumProxy
+from mobile_utils.device_pool import DeviceLease, DevicePool
+from mobile_utils.session import DriverSession, FixtureTimings, make_driver, stop_app
+
+if TYPE_CHECKING:
+    from appium.webdriver.webdriver import WebDriver
+
+# APPIUM_REUSE_SESSION=1 -> one Appium session per pytest process / xdist worker
+REUSE_SESSION = os.getenv("APPIUM_REUSE_SESSION", "0") == "1"
+
+# Setup/teardown durations of the `driver` fixture (reported in terminal summary)
+TIMINGS = FixtureTimings()
+_sessions_created = 0
+
+# ANDROID_UDIDS / ANDROID_UDIDS_FILE -> several devices, one per xdist worker
+DEVICE_POOL = DevicePool.from_env()
 
+# MOBILE_REPLAY_DIR=tests/mobile/replay/settings -> offline run on recorded screens
+REPLAY_DIR = os.getenv("MOBILE_REPLAY_DIR")
 
-def make_driver() -> webdriver.Remote:
+# APPIUM_PROXY=record|replay -> commands go through the record/replay proxy
+APPIUM_PROXY = AppiumProxy.from_env()
+
+
+@pytest.fixture(scope="session")
+def device_lease() -> Generator[DeviceLease | None, None, None]:
     """
-    Create and configure Appium WebDriver for Android.
+    Device leased by this pytest process (xdist worker) for the whole run.
 
-    All parameters are taken from environment variables (if set),
-    or use reasonable default values.
+    Yields None when no device pool is configured (single ANDROID_UDID mode)
+    or in replay mode.
+    The lease is released at session end; if the worker crashes, the lock
+    is reclaimed by the next worker that needs a device.
     """
-    options = UiAutomator2Options()
-    options.platform_name = "Android"
-    options.automation_name = "UiAutomator2"
-    options.device_name = os.getenv("ANDROID_DEVICE_NAME", "Android Emulator")
-    options.udid = os.getenv("ANDROID_UDID", "emulator-5554")
-    options.no_reset = True  # Don't reinstall app between tests
-    options.new_command_timeout = 300  # Session idle timeout in seconds
+    if DEVICE_POOL is None or REPLAY_DIR:
+        yield None
+        return
+    owner = os.getenv("PYTEST_XDIST_WORKER", "main")
+    timeout = float(os.getenv("DEVICE_LEASE_TIMEOUT", "600"))
+    with DEVICE_POOL.leased(owner=owner, timeout=timeout) as lease:
+        yield lease
 
-    # Appium server URL can be overridden via APPIUM_SERVER_URL.
-    server_url = os.getenv("APPIUM_SERVER_URL", "http://127.0.0.1:4723")
-    driver = webdriver.Remote(server_url, options=options)
 
-    # Important: implicit wait should not be used to avoid interfering with explicit waits.
-    driver.implicitly_wait(0)
-    return driver
+@pytest.fixture(scope="session")
+def appium_session(device_lease) -> Generator[DriverSession, None, None]:
+    """
+    Shared Appium session for reuse mode (APPIUM_REUSE_SESSION=1).
+
+    Session scope means one session per pytest process, so with pytest-xdist
+    every worker gets its own session.
+    """
+    session = DriverSession(lambda: make_driver(device_lease, APPIUM_PROXY, REPLAY_DIR))
+    yield session
+    session.close()
 
 
 @pytest.fixture
-def driver() -> Generator[webdriver.Remote, None, None]:
+def driver(request, device_lease) -> Generator[WebDriver, None, None]:
     """
-    Fixture for creating and closing Appium WebDriver.
+    Fixture for providing Appium WebDriver to a test.
 
-    - setup: create driver via make_driver();
+    Default mode:
+    - setup: create driver via make_driver() (mobile_utils/session.py);
     - yield: provide it to test;
-    - teardown: after test completion, always call driver.quit().
+    - teardown: stop Settings and always call driver.quit().
+
+    Reuse mode (APPIUM_REUSE_SESSION=1):
+    - setup: take the shared session (replaced only if it is dead);
+    - teardown: only stop Settings, the session stays open.
     """
-    drv = make_driver()
+    global _sessions_created
+
+    started = TIMINGS.now()
+    session: DriverSession | None = None
+    if REUSE_SESSION:
+        session = request.getfixturevalue("appium_session")
+        drv = session.acquire()
+        _sessions_created = session.created
+    else:
+        drv = make_driver(device_lease, APPIUM_PROXY, REPLAY_DIR)
+        _sessions_created += 1
+    TIMINGS.setup.append(TIMINGS.now() - started)
+
     try:
         yield drv
     finally:
-        # 1) Close Settings so next test always starts clean
-        try:
-            drv.terminate_app("com.android.settings")
-        except Exception:
-            # Fallback: force-stop via shell
-            try:
-                drv.execute_script(
-                    "mobile: shell",
-                    {"command": "am", "args": ["force-stop", "com.android.settings"]},
-                )
-            except Exception:
-                pass
-
-        # 2) Close Appium session
-        drv.quit()
+        started = TIMINGS.now()
+        if session is not None:
+            # Reuse mode: stop Settings, the session is closed at session end
+            session.reset()
+        else:
+            # 1) Close Settings so next test always starts clean
+            stop_app(drv)
+            # 2) Close Appium session
+            drv.quit()
+        TIMINGS.teardown.append(TIMINGS.now() - started)
 
 
 @pytest.hookimpl(hookwrapper=True)
@@ -80,5 +125,34 @@ def pytest_runtest_makereport(item, call):
     if rep.when == "call" and rep.failed:
         drv = item.funcargs.get("driver")
         if drv:
-            save_artifacts(drv, prefix="settings_fail")
-            dump_visible_texts(drv)
+            from mobile_utils.artifacts import dump_visible_texts, save_artifacts
+
+            page_source = save_artifacts(drv, prefix="settings_fail")
+            # Reuse saved XML: no extra requests to the device
+            dump_visible_texts(page_source=page_source)
+
+
+def pytest_runtest_logstart(nodeid, location) -> None:
+    """Attribute proxied Appium commands to the test that is starting."""
+    if APPIUM_PROXY is not None:
+        APPIUM_PROXY.begin_test(nodeid)
+
+
+def pytest_sessionfinish(session) -> None:
+    """Stop the proxy; in record mode the cassette is complete after this."""
+    if APPIUM_PROXY is not None:
+        APPIUM_PROXY.stop()
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Report `driver` fixture timings and proxied command counts for the run."""
+    mode = "reuse" if REUSE_SESSION else "per-test"
+    lines = TIMINGS.summary_lines(mode, _sessions_created)
+    if lines:
+        terminalreporter.section("appium driver timings")
+        for line in lines:
+            terminalreporter.write_line(line)
+    if APPIUM_PROXY is not None and APPIUM_PROXY.commands:
+        terminalreporter.section("appium proxy")
+        for line in APPIUM_PROXY.summary_lines():
+            terminalreporter.write_line(line)
@@ -0,0 +1,79 @@
+"""Offline tests for single-round-trip anchor probing in BasePage."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from mobile_pages.base_page import BasePage, _java_regex_literal
+from mobile_pages.internet_page import InternetPage
+from mobile_pages.settings_main_page import SettingsMainPage
+
+ARTIFACTS = Path(__file__).resolve().parents[2] / "artifacts"
+SETTINGS_MAIN_XML = ARTIFACTS / "settings_fail_20251215_221134.xml"
+
+
+class FakeElement:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeDriver:
+    """Counts round trips; answers textMatches queries with a fixed element."""
+
+    def __init__(self, page_source: str = "", element_text: str | None = None) -> None:
+        self._page_source = page_source
+        self.element_text = element_text
+        self.calls: list[str] = []
+
+    @property
+    def page_source(self) -> str:
+        self.calls.append("page_source")
+        return self._page_source
+
+    def find_elements(self, by, value):
+        self.calls.append(value)
+        return [FakeElement(self.element_text)] if self.element_text else []
+
+
+def test_regex_probe_checks_all_anchors_in_one_query() -> None:
+    drv = FakeDriver(element_text="Network & internet")
+    page = BasePage(drv)
+
+    hit = page.probe_anchors(SettingsMainPage.ANCHORS)
+
+    assert hit[0] == "Network & internet"
+    assert len(drv.calls) == 1
+    assert drv.calls[0].startswith('new UiSelector().textMatches("(?s).*(')
+
+
+def test_source_probe_matches_locally() -> None:
+    drv = FakeDriver(page_source=SETTINGS_MAIN_XML.read_text(encoding="utf-8"))
+    page = SettingsMainPage(drv)
+    page.ANCHOR_PROBE = "source"
+
+    assert page.wait_loaded().loaded_anchor == "Network & internet"
+    assert drv.calls == ["page_source"]
+
+
+def test_regex_literal_escapes_special_characters() -> None:
+    assert _java_regex_literal("Wi-Fi (5G).") == "Wi-Fi [(]5G[)][.]"
+
+
+def test_declared_anchors_are_deduplicated() -> None:
+    class DuplicatedAnchorsPage(BasePage, register=False):
+        ANCHORS = ("Internet", "Wi-Fi", "Wi-Fi", "SIMs")
+
+    assert DuplicatedAnchorsPage.ANCHORS == ("Internet", "Wi-Fi", "SIMs")
+
+
+def test_wait_loaded_is_bounded_by_one_timeout() -> None:
+    drv = FakeDriver()  # Nothing is ever found
+    page = InternetPage(drv, timeout=1)
+
+    started = time.monotonic()
+    with pytest.raises(AssertionError):
+        page.wait_loaded()
+
+    # Five anchors used to cost five timeouts; now all share one deadline
+    assert time.monotonic() - started < 2
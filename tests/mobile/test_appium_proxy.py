@@ -0,0 +1,113 @@
+"""Tests for the record/replay Appium proxy (fake upstream, no device required)."""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mobile_utils.appium_proxy import AppiumProxy, command_name, parse_command_latency
+
+
+class FakeAppium(BaseHTTPRequestHandler):
+    """Answers new session, source and find element like a W3C server."""
+
+    calls = 0
+
+    def _send(self, status: int, value) -> None:
+        FakeAppium.calls += 1
+        payload = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/session":
+            self._send(200, {"sessionId": "s1", "capabilities": {}})
+        elif self.path.endswith("/element"):
+            self._send(404, {"error": "no such element", "message": "", "stacktrace": ""})
+        else:
+            self._send(200, None)
+
+    def do_GET(self) -> None:
+        self._send(200, "<hierarchy/>")
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def upstream():
+    FakeAppium.calls = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAppium)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def call(url: str, method: str, path: str, body: dict | None = None) -> tuple[int, dict]:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def scenario(url: str) -> list[tuple[int, dict]]:
+    return [
+        call(url, "POST", "/session", {"capabilities": {"udid": "emulator-5554"}}),
+        call(url, "GET", "/session/s1/source"),
+        call(url, "POST", "/session/s1/element", {"using": "id", "value": "missing"}),
+    ]
+
+
+def test_command_names() -> None:
+    assert command_name("POST", "/session") == "POST session"
+    assert command_name("DELETE", "/session/abc") == "DELETE session"
+    assert command_name("POST", "/session/abc/element/e-1/click") == "POST element/:id/click"
+    assert parse_command_latency("GET source=300; POST element=80") == {
+        "GET source": 300.0,
+        "POST element": 80.0,
+    }
+
+
+def test_record_then_replay_with_latency(upstream, tmp_path) -> None:
+    cassette = tmp_path / "cassette.jsonl"
+    recorder = AppiumProxy("record", cassette)
+    recorder.begin_test("test_a")
+    recorded = scenario(recorder.start(upstream=upstream))
+    recorder.stop()
+    assert FakeAppium.calls == 3
+
+    player = AppiumProxy("replay", cassette, latency_ms=0, command_latency={"GET source": 50})
+    player.begin_test("test_b")
+    url = player.start()
+    started = time.perf_counter()
+    replayed = scenario(url)
+    elapsed = time.perf_counter() - started
+    player.stop()
+
+    assert replayed == recorded
+    assert FakeAppium.calls == 3  # Upstream was not touched in replay
+    assert elapsed >= 0.05
+    assert player.tests["test_b"].count == 3
+    assert player.commands["GET source"].total_ms >= 50
+
+
+def test_unrecorded_command_is_reported(upstream, tmp_path) -> None:
+    cassette = tmp_path / "cassette.jsonl"
+    cassette.write_text("", encoding="utf-8")
+    player = AppiumProxy("replay", cassette)
+    status, body = call(player.start(), "GET", "/session/s1/source")
+    player.stop()
+
+    assert status == 404
+    assert body["value"]["error"] == "unknown command"
+    assert player.unmatched == 1
@@ -0,0 +1,111 @@
+"""Offline tests for the device pool allocator (fake driver factory)."""
+
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from mobile_utils.device_pool import DevicePool
+
+
+class FakeDriver:
+    """Stands in for Appium driver: remembers the lease it was created for."""
+
+    def __init__(self, lease) -> None:
+        self.lease = lease
+        self.quit_called = False
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+def test_each_lease_gets_own_device_and_ports(tmp_path) -> None:
+    pool = DevicePool(["emulator-5554", "emulator-5556"], lock_dir=tmp_path)
+
+    first = pool.lease(owner="gw0")
+    second = pool.lease(owner="gw1")
+
+    assert {first.udid, second.udid} == {"emulator-5554", "emulator-5556"}
+    assert first.system_port != second.system_port
+    assert first.mjpeg_server_port != second.mjpeg_server_port
+    assert first.appium_port != second.appium_port
+    # Pool is exhausted until someone releases a device
+    assert pool.try_lease() is None
+
+    pool.release(first)
+    assert pool.try_lease().udid == first.udid
+
+
+def test_parallel_workers_never_share_device(tmp_path) -> None:
+    pool = DevicePool(["d1", "d2"], lock_dir=tmp_path, poll_interval=0.01)
+    in_use: set[str] = set()
+    errors: list[str] = []
+    guard = threading.Lock()
+
+    def worker() -> None:
+        for _ in range(5):
+            with pool.session(FakeDriver, timeout=5) as drv:
+                with guard:
+                    if drv.lease.udid in in_use:
+                        errors.append(drv.lease.udid)
+                    in_use.add(drv.lease.udid)
+                with guard:
+                    in_use.discard(drv.lease.udid)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert pool.try_lease() is not None
+
+
+def test_lease_of_killed_worker_is_free_at_once(tmp_path) -> None:
+    root = Path(__file__).resolve().parents[2]
+    script = (
+        "import sys, time; from mobile_utils.device_pool import DevicePool; "
+        f"DevicePool(['d1'], lock_dir={str(tmp_path)!r}).lease(); print('leased', flush=True); time.sleep(60)"
+    )
+    worker = subprocess.Popen([sys.executable, "-c", script], cwd=root, stdout=subprocess.PIPE, text=True)
+    try:
+        assert worker.stdout.readline().strip() == "leased"
+        pool = DevicePool(["d1"], lock_dir=tmp_path, poll_interval=0.01)
+        assert pool.try_lease() is None
+    finally:
+        worker.kill()
+        worker.wait()
+
+    assert pool.lease(timeout=5).udid == "d1"
+
+
+def test_pools_of_different_workers_never_share_device(tmp_path) -> None:
+    # Separate pool objects do not share the in-process lock, like xdist workers
+    pools = [DevicePool(["d1"], lock_dir=tmp_path) for _ in range(8)]
+    barrier = threading.Barrier(len(pools))
+    leases = []
+
+    def worker(pool: DevicePool) -> None:
+        barrier.wait()
+        lease = pool.try_lease()
+        if lease is not None:
+            leases.append(lease)
+
+    threads = [threading.Thread(target=worker, args=(pool,)) for pool in pools]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(leases) == 1
+
+
+def test_lease_times_out_when_pool_is_busy(tmp_path) -> None:
+    pool = DevicePool(["d1"], lock_dir=tmp_path, poll_interval=0.01)
+    pool.lease()
+
+    with pytest.raises(TimeoutError):
+        pool.lease(timeout=0.05)
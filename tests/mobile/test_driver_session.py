@@ -0,0 +1,48 @@
+"""Offline tests for shared Appium session logic (no device required)."""
+
+from mobile_utils.session import DriverSession
+
+
+class FakeDriver:
+    """Minimal driver stub: health check command and app/session control."""
+
+    def __init__(self) -> None:
+        self.alive = True
+        self.terminated: list[str] = []
+        self.quit_called = False
+
+    @property
+    def current_package(self) -> str:
+        if not self.alive:
+            raise RuntimeError("session is dead")
+        return "com.android.settings"
+
+    def terminate_app(self, package: str) -> None:
+        self.terminated.append(package)
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+def test_session_is_reused_between_tests() -> None:
+    session = DriverSession(FakeDriver)
+
+    first = session.acquire()
+    session.reset()
+    second = session.acquire()
+
+    assert first is second
+    assert session.created == 1
+    assert first.terminated == ["com.android.settings"]
+
+
+def test_dead_session_is_replaced() -> None:
+    session = DriverSession(FakeDriver)
+    first = session.acquire()
+    first.alive = False
+
+    second = session.acquire()
+
+    assert second is not first
+    assert first.quit_called
+    assert session.created == 2
@@ -0,0 +1,58 @@
+"""Offline tests for navigation graph routing (no device required)."""
+
+from pathlib import Path
+
+from mobile_pages.internet_page import InternetPage
+from mobile_pages.navigation import EdgeCosts, Navigator, arrival_anchors
+from mobile_pages.network_internet_page import NetworkInternetPage
+from mobile_pages.settings_main_page import SettingsMainPage
+from mobile_utils.ui_snapshot import UiSnapshot
+
+PAGES = [SettingsMainPage, NetworkInternetPage, InternetPage]
+REPLAY = Path(__file__).resolve().parent / "replay" / "settings"
+SCREENS = {SettingsMainPage: "settings.xml", NetworkInternetPage: "network_internet.xml", InternetPage: "internet.xml"}
+
+
+def test_deep_link_is_preferred_when_cheaper() -> None:
+    nav = Navigator(driver=None, pages=PAGES, costs=EdgeCosts())
+
+    path = nav.shortest_path(SettingsMainPage, InternetPage)
+
+    assert [e.action for e in path] == ["android.settings.WIFI_SETTINGS"]
+
+
+def test_observed_timings_change_the_route() -> None:
+    costs = EdgeCosts()
+    nav = Navigator(driver=None, pages=PAGES, costs=costs)
+    deep_link = nav.shortest_path(SettingsMainPage, InternetPage)[0]
+
+    # Deep link turned out to be slow on this device
+    for _ in range(10):
+        costs.observe(deep_link, 12.0)
+
+    path = nav.shortest_path(SettingsMainPage, InternetPage)
+    assert [e.action for e in path] == [
+        "android.settings.WIRELESS_SETTINGS",
+        "open_internet",
+    ]
+
+
+def test_unknown_screen_starts_with_deep_link() -> None:
+    nav = Navigator(driver=None, pages=PAGES, costs=EdgeCosts())
+
+    path = nav.shortest_path(None, NetworkInternetPage)
+
+    assert [e.deep_link for e in path] == [True]
+
+
+def test_arrival_anchors_are_not_shared_with_other_screens() -> None:
+    assert "Network & internet" not in arrival_anchors(NetworkInternetPage, PAGES)
+    snapshots = {page: UiSnapshot.from_source((REPLAY / name).read_text(encoding="utf-8"))
+                 for page, name in SCREENS.items()}
+
+    # Arrival anchors appear on the recorded target screen only, so the wait
+    # after a transition cannot succeed on the screen it started from
+    for page, snapshot in snapshots.items():
+        for other, other_snapshot in snapshots.items():
+            hits = [a for a in arrival_anchors(page, PAGES) if other_snapshot.has_label(a)]
+            assert bool(hits) == (other is page), (page.__name__, other.__name__, hits)
@@ -1,9 +1,12 @@
+import pytest
+
 from mobile_pages.settings_main_page import SettingsMainPage
 from mobile_pages.network_internet_page import NetworkInternetPage
 from mobile_pages.internet_page import InternetPage
-from mobile_utils.artifacts import save_artifacts
 
 
+@pytest.mark.max_commands(20)
+@pytest.mark.shared_setup("settings-main")
 def test_open_internet(driver):
     # Открываем Settings через intent
     driver.execute_script(
@@ -1,19 +1,25 @@
 """Mobile tests for opening Android Settings screen."""
 
-from mobile_pages.settings_main_page import SettingsMainPage
+import pytest
+
 from mobile_pages.network_internet_page import NetworkInternetPage
-from mobile_utils.artifacts import save_artifacts
+from mobile_pages.screen_classifier import wait_for_screen
+from mobile_pages.settings_main_page import SettingsMainPage
 
 
+# Replay run takes 10 commands; the rest is headroom for wait polls on a slow device
+@pytest.mark.max_commands(20)
+@pytest.mark.shared_setup("settings-main")
 def test_open_android_settings(driver) -> None:
     """
     Basic scenario:
     1. Open system Settings app via shell command (like `adb shell`).
-    2. Check if we're already on Network & internet screen.
-    3. If not, open Settings -> Network & internet section via menu click.
+    2. Recognize which Settings screen was opened (one page_source per poll).
+    3. If it is not Network & internet, open it from Settings main screen.
     4. Verify that Network & internet screen has actually loaded.
     5. Save successful run artifacts (screenshot + page source).
     """
+    from mobile_utils.artifacts import save_artifacts
 
     # 1) Open Settings via mobile: shell (analog of adb shell)
     driver.execute_script(
@@ -23,15 +29,12 @@ def test_open_android_settings(driver) -> None:
 
     # 2) Fast path: system might have opened the target screen directly
     #    For example, if user was previously in Network & internet.
-    net = NetworkInternetPage(driver)
-    try:
-        net.wait_loaded()
-        # If Network & internet anchors are found, test can be considered successful.
+    #    The classifier answers "where am I?" right away, without waiting
+    #    for the Network & internet timeout first.
+    screen = wait_for_screen(driver, [SettingsMainPage, NetworkInternetPage])
+    if screen is NetworkInternetPage:
         save_artifacts(driver, prefix="settings_direct_ok")
         return
-    except Exception:
-        # Otherwise ignore and proceed with "normal" path via main screen.
-        pass
 
     # 3) Normal path:
     #    Settings main screen -> click "Network & internet" menu item.
@@ -0,0 +1,77 @@
+"""Offline tests of page objects against the replay driver (no device required).
+
+ReplayDriver is imported by the tests: collecting the suite does not load it.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from mobile_pages.internet_page import InternetPage
+from mobile_pages.navigation import EdgeCosts, Navigator, start_intent
+from mobile_pages.network_internet_page import NetworkInternetPage
+from mobile_pages.screen_classifier import where_am_i
+from mobile_pages.settings_main_page import SettingsMainPage
+from mobile_utils.session import stop_app
+
+if TYPE_CHECKING:
+    from mobile_utils.replay_driver import ReplayDriver
+
+SCENARIO = Path(__file__).parent / "replay" / "settings"
+
+
+@pytest.fixture
+def replay() -> ReplayDriver:
+    from mobile_utils.replay_driver import ReplayDriver
+
+    return ReplayDriver.from_dir(SCENARIO)
+
+
+def test_parse_ui_selector_handles_escapes_and_scrollable() -> None:
+    from mobile_utils.replay_driver import parse_ui_selector
+
+    assert parse_ui_selector('new UiSelector().resourceId("a:id/t").text("Say \\"hi\\"")') == [
+        ("resourceId", "a:id/t"),
+        ("text", 'Say "hi"'),
+    ]
+    ui = (
+        "new UiScrollable(new UiSelector().scrollable(true))"
+        '.scrollIntoView(new UiSelector().textContains("Internet"))'
+    )
+    assert parse_ui_selector(ui) == [("textContains", "Internet")]
+
+
+@pytest.mark.parametrize("use_snapshot", [False, True])
+def test_settings_flow_by_clicks(replay, use_snapshot) -> None:
+    start_intent(replay, "android.settings.SETTINGS")
+
+    SettingsMainPage(replay, use_snapshot=use_snapshot).wait_loaded().open_network_and_internet()
+    NetworkInternetPage(replay, use_snapshot=use_snapshot).wait_loaded().open_internet()
+    InternetPage(replay, use_snapshot=use_snapshot).wait_loaded()
+
+    assert replay.history == ["launcher", "settings", "network_internet", "internet"]
+
+
+def test_navigator_and_classifier(replay) -> None:
+    assert where_am_i(replay) is None  # Launcher is not a known screen
+
+    Navigator(replay, costs=EdgeCosts()).navigate_to(InternetPage)
+
+    assert where_am_i(replay) is InternetPage
+
+
+def test_elements_go_stale_and_stop_app_returns_home(replay) -> None:
+    start_intent(replay, "android.settings.SETTINGS")
+    el = SettingsMainPage(replay).find_text_contains("Network")
+    el.click()
+
+    with pytest.raises(StaleElementReferenceException):
+        el.click()
+    with pytest.raises(NoSuchElementException):
+        SettingsMainPage(replay).find_text_contains("Battery")
+
+    stop_app(replay)
+    assert replay.screen == "launcher"
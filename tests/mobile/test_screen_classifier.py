@@ -0,0 +1,32 @@
+"""Offline tests for the screen classifier on recorded UI dumps."""
+
+from pathlib import Path
+
+import pytest
+
+from mobile_pages.internet_page import InternetPage
+from mobile_pages.network_internet_page import NetworkInternetPage
+from mobile_pages.screen_classifier import where_am_i
+from mobile_pages.settings_main_page import SettingsMainPage
+
+ARTIFACTS = Path(__file__).resolve().parents[2] / "artifacts"
+
+
+class SourceDriver:
+    """Fake driver that only serves a recorded page_source."""
+
+    def __init__(self, xml_name: str) -> None:
+        self.page_source = (ARTIFACTS / xml_name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    ("xml_name", "expected"),
+    [
+        ("settings_fail_20251215_221134.xml", SettingsMainPage),
+        ("settings_fail_20251215_204204.xml", NetworkInternetPage),
+        ("settings_fail_20251216_185327.xml", InternetPage),
+        ("settings_fail_20251213_092626.xml", None),  # launcher
+    ],
+)
+def test_screen_is_recognized_from_single_snapshot(xml_name, expected) -> None:
+    assert where_am_i(SourceDriver(xml_name)) is expected
@@ -0,0 +1,68 @@
+"""Offline tests for snapshot mode of BasePage (local page_source queries)."""
+
+from pathlib import Path
+
+from mobile_pages.network_internet_page import NetworkInternetPage
+from mobile_utils.ui_snapshot import UiSnapshot
+
+ARTIFACTS = Path(__file__).resolve().parents[2] / "artifacts"
+NETWORK_XML = ARTIFACTS / "settings_fail_20251215_204204.xml"
+
+
+class RecordingDriver:
+    """Serves one recorded screen and records every command sent to device."""
+
+    def __init__(self, page_source: str) -> None:
+        self._page_source = page_source
+        self.commands: list[tuple] = []
+
+    @property
+    def page_source(self) -> str:
+        self.commands.append(("page_source",))
+        return self._page_source
+
+    def execute_script(self, script: str, args: dict) -> None:
+        self.commands.append((script, args))
+
+
+def test_indexed_queries() -> None:
+    snap = UiSnapshot.from_source(NETWORK_XML.read_text(encoding="utf-8"))
+
+    internet = snap.find(resource_id="android:id/title", text="Internet")
+
+    assert internet is not None
+    assert internet.center is not None
+    assert snap.find(text_contains="Hotspot").text == "Hotspot & tethering"
+    assert snap.find(resource_id="android:id/title", text="No such item") is None
+
+
+def test_snapshot_mode_uses_one_fetch_and_taps_by_bounds() -> None:
+    drv = RecordingDriver(NETWORK_XML.read_text(encoding="utf-8"))
+    page = NetworkInternetPage(drv, use_snapshot=True)
+
+    page.wait_loaded()
+    page.open_internet()
+
+    # One page_source for the wait, lookup reused it, click is a tap
+    assert drv.commands[0] == ("page_source",)
+    assert drv.commands[1][0] == "mobile: clickGesture"
+    assert len(drv.commands) == 2
+    # After the tap the cached snapshot is dropped
+    assert page._snapshot is None
+
+
+def test_visible_texts_are_dumped_without_device_queries(capsys) -> None:
+    # Failure artifact helpers load the artifact writer: imported by the test, not at collection
+    from mobile_utils.artifacts import collect_nodes, dump_visible_texts
+
+    source = NETWORK_XML.read_text(encoding="utf-8")
+
+    dump_visible_texts(page_source=source, limit=3)
+    nodes = collect_nodes(page_source=source)
+
+    out = capsys.readouterr().out
+    assert "'Internet'" in out
+    assert "more" in out
+    internet = next(n for n in nodes if n["text"] == "Internet")
+    assert internet["resource-id"] == "android:id/title"
+    assert internet["bounds"] is not None
@@ -0,0 +1 @@
+# Тесты инструментов (tools/)
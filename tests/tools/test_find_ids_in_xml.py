@@ -0,0 +1,39 @@
+"""Tests for the UI dump indexer (tools/find_ids_in_xml.py)."""
+
+import gzip
+import shutil
+from pathlib import Path
+
+from tools.find_ids_in_xml import open_index, query_index, update_index
+
+ARTIFACTS = Path(__file__).resolve().parents[2] / "artifacts"
+
+
+def test_index_is_incremental_and_reads_compressed_dumps(tmp_path) -> None:
+    shutil.copy(ARTIFACTS / "settings_fail_20251215_204204.xml", tmp_path / "network.xml")
+    db = open_index(tmp_path / "index.sqlite")
+
+    assert update_index(db, tmp_path) == (1, 0)
+    assert update_index(db, tmp_path) == (0, 0)  # Nothing changed
+
+    blob_dir = tmp_path / "blobs" / "ab"
+    blob_dir.mkdir(parents=True)
+    source = (ARTIFACTS / "settings_fail_20251216_185327.xml").read_bytes()
+    (blob_dir / "abc.xml.gz").write_bytes(gzip.compress(source))
+    assert update_index(db, tmp_path) == (1, 0)
+
+    (tmp_path / "network.xml").unlink()
+    assert update_index(db, tmp_path) == (0, 1)
+
+
+def test_query_by_id_text_and_regex(tmp_path) -> None:
+    shutil.copy(ARTIFACTS / "settings_fail_20251215_204204.xml", tmp_path / "network.xml")
+    shutil.copy(ARTIFACTS / "settings_fail_20251216_185327.xml", tmp_path / "internet.xml")
+    db = open_index(tmp_path / "index.sqlite")
+    update_index(db, tmp_path)
+
+    rows = query_index(db, text="Internet", res_id="android:id/title")
+    assert [Path(r[0]).name for r in rows] == ["network.xml"]
+
+    rows = query_index(db, regex=r"^Wi.Fi$")
+    assert {r[1] for r in rows} == {"Wi‑Fi"}
@@ -0,0 +1,77 @@
+"""Tests for tools/form_runner.py (record streaming and report, no browser)."""
+
+from pathlib import Path
+
+import pytest
+
+from tools.form_runner import RunReport, SubmissionResult, iter_records, run, run_records
+from utils.step_timing import percentile
+
+DATA = Path(__file__).resolve().parent.parent / "web" / "data"
+
+
+def test_csv_and_jsonl_give_the_same_records() -> None:
+    csv_records = list(iter_records(DATA / "form_records.csv"))
+    jsonl_records = list(iter_records(DATA / "form_records.jsonl"))
+
+    assert csv_records == jsonl_records
+    assert csv_records[1]["subjects"] == ["English", "Physics"]
+    # Empty CSV cells are not sent to the form
+    assert "email" not in csv_records[2]
+
+
+def test_records_are_streamed(tmp_path: Path) -> None:
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"first_name": "A"}\nnot json\n', encoding="utf-8")
+
+    records = iter_records(path)
+    # The broken second line is not read until it is needed
+    assert next(records) == {"first_name": "A"}
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_unsupported_extension(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unsupported"):
+        next(iter_records(tmp_path / "records.xlsx"))
+
+
+def test_failures_do_not_stop_the_run() -> None:
+    def submit(page, record) -> None:
+        if record["first_name"] == "Bad":
+            raise AssertionError("'Bad Record' not in result modal\nmore details")
+
+    records = ({"first_name": name} for name in ["Ivan", "Bad", "Anna", "Alex"])
+    report = run(records, page=None, submit=submit, limit=3)
+
+    assert report.submitted == 3
+    assert report.failed == 1
+    assert report.failures[0].index == 1
+    assert report.failures[0].error == "AssertionError: 'Bad Record' not in result modal"
+    assert report.per_second > 0
+
+
+def test_run_records_is_lazy() -> None:
+    consumed = []
+
+    def records():
+        for i in range(1000):
+            consumed.append(i)
+            yield {"first_name": str(i)}
+
+    results = run_records(records(), page=None, submit=lambda page, record: None)
+    assert next(results).ok
+    assert consumed == [0]
+
+
+def test_report_percentiles() -> None:
+    report = RunReport()
+    for i in range(1, 101):
+        report.add(SubmissionResult(i, True, i / 100))
+    report.elapsed = 10
+
+    data = report.as_dict()
+    assert data["per_second"] == 10
+    assert data["latency_s"] == {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+    assert percentile([], 95) == 0.0
+    assert report.summary_lines()[0] == "submitted 100, failed 0, 10.0s, 10.00 submissions/s"
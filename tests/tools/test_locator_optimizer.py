@@ -0,0 +1,42 @@
+"""Tests for the locator optimizer (tools/locator_optimizer.py)."""
+
+import shutil
+from pathlib import Path
+
+from mobile_utils.ui_snapshot import UiSnapshot
+from tools.locator_optimizer import benchmark, candidates, load_snapshots, optimize
+
+ARTIFACTS = Path(__file__).resolve().parents[2] / "artifacts"
+
+
+def test_prefers_fastest_unique_strategy(tmp_path) -> None:
+    shutil.copy(ARTIFACTS / "settings_fail_20251215_204204.xml", tmp_path / "network.xml")
+    shutil.copy(ARTIFACTS / "settings_fail_20251216_185327.xml", tmp_path / "internet.xml")
+
+    locator_map = optimize(load_snapshots(tmp_path), extra_targets=["Hotspot"])
+
+    internet = locator_map["InternetPage"]
+    # Screen title is a content-desc on the toolbar: accessibility id is unique
+    assert internet["Internet"]["strategy"] == "accessibility id"
+    # android:id/title repeats on every row, so the id alone is not enough
+    assert internet["Mobile data"] == {
+        "strategy": "id+text",
+        "by": "-android uiautomator",
+        "value": 'new UiSelector().resourceId("android:id/title").text("Mobile data")',
+        "dumps": 1,
+    }
+    assert "Hotspot" in locator_map["NetworkInternetPage"]
+
+
+def test_benchmark_times_every_candidate() -> None:
+    source = (ARTIFACTS / "settings_fail_20251216_185327.xml").read_text(encoding="utf-8")
+    snapshot = UiSnapshot.from_source(source)
+
+    class FakeDriver:
+        def find_elements(self, by, value):
+            return [object()]
+
+    rows = benchmark(FakeDriver(), snapshot, ["Mobile data", "Missing"], repeats=2)
+    node = snapshot.find(text="Mobile data")
+    assert [r[1] for r in rows] == [c.strategy for c in candidates(node, "Mobile data")]
+    assert all(found == 1 for *_, found in rows)
@@ -0,0 +1 @@
+# Тесты общих утилит (utils/)
@@ -0,0 +1,41 @@
+"""Offline tests for the content-addressed artifact store."""
+
+import time
+
+from utils.artifact_store import ArtifactStore
+
+
+def test_identical_content_is_stored_once(tmp_path) -> None:
+    store = ArtifactStore(tmp_path)
+
+    first = store.put(b"<hierarchy/>", "xml", test="t1", step="fail")
+    second = store.put(b"<hierarchy/>", "xml", test="t2", step="fail")
+
+    assert first.blob == second.blob
+    # The second put only adds a manifest line
+    assert first.written > 0
+    assert second.written == 0
+    assert first.blob.endswith(".xml.gz")
+    assert len(list((tmp_path / "blobs").rglob("*.gz"))) == 1
+    assert [e.test for e in store.entries()] == ["t1", "t2"]
+    assert store.read(second) == b"<hierarchy/>"
+
+
+def test_retention_by_age_and_size(tmp_path) -> None:
+    store = ArtifactStore(tmp_path, max_bytes=150, max_age_days=1)
+    old = store.put(b"o" * 100, "png", test="old")
+    first = store.put(b"a" * 100, "png", test="first")
+    last = store.put(b"b" * 100, "png", test="last")
+
+    # Make the first entry two days old
+    entries = store.entries()
+    entries[0].ts -= 2 * 86400
+    store._rewrite_manifest(entries)
+
+    removed = store.enforce_retention(now=time.time())
+
+    assert removed == 2  # "old" by age, "first" by size
+    assert [e.test for e in store.entries()] == ["last"]
+    assert not (tmp_path / old.blob).exists()
+    assert not (tmp_path / first.blob).exists()
+    assert (tmp_path / last.blob).exists()
@@ -0,0 +1,65 @@
+"""Offline tests for background artifact writing."""
+
+import base64
+
+from utils.artifact_store import ArtifactStore
+from utils import artifact_writer
+from utils.artifact_writer import ArtifactWriter, capture_artifacts
+
+
+class ScreenDriver:
+    """Fake driver with screenshot and page source capture."""
+
+    page_source = "<hierarchy><node text='Internet'/></hierarchy>"
+
+    def get_screenshot_as_base64(self) -> str:
+        return base64.b64encode(b"\x89PNG fake").decode()
+
+
+def test_capture_returns_immediately_and_flush_writes_files(tmp_path, monkeypatch) -> None:
+    # Keep tmp stores out of the session-end retention report
+    monkeypatch.setattr(artifact_writer, "_stores", {})
+    writer = ArtifactWriter(queue_size=1)
+
+    source = capture_artifacts(ScreenDriver(), tmp_path, "case", "xml", writer=writer)
+    writer.close()
+
+    assert source == ScreenDriver.page_source
+    assert sorted(p.name.split(".", 1)[1] for p in tmp_path.rglob("*.*") if "blobs" in p.parts) == [
+        "png",
+        "xml.gz",
+    ]
+    screenshot = next(e for e in ArtifactStore(tmp_path).entries() if e.kind == "png")
+    assert screenshot.step == "case"
+    assert ArtifactStore(tmp_path).read(screenshot) == b"\x89PNG fake"
+    assert writer.stats.written == 2
+    assert writer.stats.max_queue_depth >= 1
+
+
+def test_repeated_capture_writes_no_bytes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(artifact_writer, "_stores", {})
+    writer = ArtifactWriter()
+    capture_artifacts(ScreenDriver(), tmp_path, "case", "xml", writer=writer)
+    writer.flush()
+    first = writer.stats.bytes_written
+
+    capture_artifacts(ScreenDriver(), tmp_path, "case", "xml", writer=writer)
+    writer.close()
+
+    assert first > 0
+    # Same screen again: blobs already exist, only manifest lines are added
+    assert writer.stats.bytes_written == first
+    assert len(ArtifactStore(tmp_path).entries()) == 4
+
+
+def test_write_errors_do_not_break_the_run(tmp_path) -> None:
+    writer = ArtifactWriter()
+
+    def broken() -> bytes:
+        raise OSError("disk full")
+
+    writer.submit(tmp_path / "a.png", broken)
+    writer.close()
+
+    assert writer.stats.failed == 1
+    assert writer.stats.written == 0
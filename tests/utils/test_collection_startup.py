@@ -0,0 +1,76 @@
+"""Startup guard: selecting driver-free tests must not load driver clients.
+
+Collection imports every test module of the tree, `-k` only deselects
+afterwards. So conftests, test modules and page objects import Appium,
+the Selenium WebDriver client, webdriver-manager, NumPy and the replay
+driver where they are used, not at module level. Collection runs in a fresh
+interpreter, so modules loaded by this process do not hide a regression.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Whole tree, only tests that need neither a device nor a browser are selected
+COLLECT_ARGS = ["tests", "-k", "scheduler or device_pool or browser_pool"]
+
+# selenium.webdriver itself is a lazy namespace: By / Keys constants used by
+# page object locators are cheap, the WebDriver client lives in .remote / .support
+HEAVY_MODULES = [
+    "appium",
+    "webdriver_manager",
+    "selenium.webdriver.remote",
+    "selenium.webdriver.support",
+    "selenium.webdriver.chrome",
+    "numpy",
+    "mobile_utils.artifacts",
+    "mobile_utils.replay_driver",
+]
+
+# Seconds; collection takes well under a second, the budget only catches a heavy import
+COLLECT_BUDGET = float(os.getenv("COLLECT_TIME_BUDGET", "5"))
+
+COLLECT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import pytest
+code = pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider", *sys.argv[2:]])
+heavy = [name for name in json.loads(sys.argv[1]) if name in sys.modules]
+print(json.dumps({"code": int(code), "seconds": time.perf_counter() - started, "heavy": heavy}))
+"""
+
+
+@pytest.fixture(scope="module")
+def collection() -> dict:
+    env = {**os.environ, "STEP_HISTORY": "0", "DURATION_SCHEDULE": "0"}
+    env.pop("MOBILE_REPLAY_DIR", None)
+    result = subprocess.run(
+        [sys.executable, "-c", COLLECT_SCRIPT, json.dumps(HEAVY_MODULES), *COLLECT_ARGS],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.strip().splitlines()
+    # Last line is the summary, collected node ids come before it
+    return {**json.loads(lines[-1]), "output": "\n".join(lines[:-1])}
+
+
+def test_driver_free_collection_does_not_import_drivers(collection: dict) -> None:
+    assert collection["code"] == 0
+    assert collection["heavy"] == []
+    # Driver tests were imported and deselected, not skipped by path
+    assert "tests/utils/test_scheduler.py::" in collection["output"]
+    assert "deselected" in collection["output"]
+
+
+def test_driver_free_collection_time(collection: dict) -> None:
+    assert collection["seconds"] < COLLECT_BUDGET
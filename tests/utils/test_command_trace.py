@@ -0,0 +1,49 @@
+"""Tests for WebDriver command instrumentation (utils/command_trace.py)."""
+
+import json
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from mobile_pages.navigation import start_intent
+from mobile_pages.settings_main_page import SettingsMainPage
+from utils.command_trace import CommandTracer, summarize_args
+
+SCENARIO = Path(__file__).resolve().parents[1] / "mobile" / "replay" / "settings"
+
+
+def test_commands_are_grouped_by_test_and_page_object_method(tmp_path) -> None:
+    from mobile_utils.replay_driver import ReplayDriver
+
+    tracer = CommandTracer()
+    driver = tracer.instrument(ReplayDriver.from_dir(SCENARIO))
+    assert tracer.instrument(driver) is driver  # Wrapped only once
+
+    tracer.begin("test_x", "call")
+    start_intent(driver, "android.settings.SETTINGS")
+    SettingsMainPage(driver).wait_loaded().open_network_and_internet()
+    with pytest.raises(NoSuchElementException):
+        SettingsMainPage(driver).find_text_contains("Battery")
+
+    records = tracer.for_test("test_x", "call")
+    steps = [r.step for r in records]
+    assert steps[0] == "mobile_pages.navigation.start_intent"
+    assert steps.count("SettingsMainPage.open_network_and_internet") == 2
+    assert [r.command for r in records if not r.ok] == ["findElement"]
+    assert records[-1].error == "NoSuchElementException"
+
+    summary = tracer.summary()["test_x"]
+    assert summary["commands"] == len(records)
+    assert summary["failed"] == 1
+
+    trace = json.loads(tracer.write_trace(tmp_path / "trace.json").read_text(encoding="utf-8"))
+    events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert len(events) == len(records)
+    assert events[0]["args"]["step"] == steps[0]
+
+
+def test_args_summary_is_short() -> None:
+    text = summarize_args({"sessionId": "s", "using": "id", "value": "x" * 500})
+    assert text.startswith("using='id'")
+    assert len(text) <= 120
@@ -0,0 +1,70 @@
+"""Tests for utils/scheduler.py (duration-aware distribution over workers)."""
+
+from pathlib import Path
+
+from utils.nodeids import split_group
+from utils.scheduler import DurationStore, ScheduleReport, make_plan, predicted_loads
+
+
+def store_with(tmp_path: Path, durations: dict[str, float]) -> DurationStore:
+    store = DurationStore(tmp_path / "durations.json")
+    store.update(durations)
+    return store
+
+
+def test_longest_first_balances_workers(tmp_path: Path) -> None:
+    store = store_with(tmp_path, {"t.py::a": 8, "t.py::b": 5, "t.py::c": 4, "t.py::d": 3, "t.py::e": 3})
+    plan = make_plan([(f"t.py::{n}", None) for n in "edcba"], store, workers=2)
+
+    # 8+3 / 5+4+3 instead of 3+4+8 / 3+5 in collection order
+    assert sorted(plan.loads) == [11, 12]
+    assert plan.makespan == 12
+    assert plan.bins[0][0] == "t.py::a"
+    # Inside a worker: longest first
+    assert all(plan.estimates[x] >= plan.estimates[y] for share in plan.bins for x, y in zip(share, share[1:]))
+
+
+def test_shared_setup_stays_on_one_worker(tmp_path: Path) -> None:
+    store = store_with(tmp_path, {"m.py::open_settings": 6, "m.py::open_internet": 6, "w.py::form": 10})
+    plan = make_plan(
+        [("m.py::open_settings", "settings-main"), ("w.py::form", None), ("m.py::open_internet", "settings-main")],
+        store,
+        workers=2,
+    )
+    groups = plan.group_of()
+    assert groups["m.py::open_settings"] == groups["m.py::open_internet"] != groups["w.py::form"]
+    assert plan.makespan == 12
+
+
+def test_unknown_tests_get_suite_median(tmp_path: Path) -> None:
+    store = store_with(tmp_path, {"tests/mobile/a.py::x": 20, "tests/mobile/b.py::y": 30, "tests/mobile/c.py::z": 40})
+    assert store.estimate("tests/mobile/new.py::t@lpt1") == 30
+    assert store.estimate("tests/web/new.py::t") == 1.0
+
+
+def test_durations_are_smoothed_and_saved(tmp_path: Path) -> None:
+    store = store_with(tmp_path, {"t.py::a": 10})
+    store.update({"t.py::a": 20})
+    store.save()
+    assert DurationStore(tmp_path / "durations.json").estimate("t.py::a") == 15
+
+
+def test_group_suffix_parsing() -> None:
+    assert split_group("t.py::a@lpt0") == ("t.py::a", "lpt0")
+    assert split_group("t.py::a[user@example.com]") == ("t.py::a[user@example.com]", "")
+
+
+def test_predicted_vs_actual(tmp_path: Path) -> None:
+    store = store_with(tmp_path, {"t.py::a": 8, "t.py::b": 5})
+    report = ScheduleReport()
+    report.predicted = predicted_loads(["t.py::a@lpt0", "t.py::b@lpt1"], store)
+    report.add("t.py::a@lpt0", "gw0", 0.5, ran=False)
+    report.add("t.py::a@lpt0", "gw0", 9.0)
+    report.add("t.py::b@lpt1", "gw1", 4.0)
+    report.add("t.py::c", "gw1", 0.1, ran=False)
+
+    assert report.measured() == {"t.py::a": 9.5, "t.py::b": 4.0}
+    assert report.summary_lines() == [
+        "predicted makespan 8.0s  [lpt0 8.0s, lpt1 5.0s]",
+        "actual makespan    9.5s  [gw0 9.5s, gw1 4.1s]",
+    ]
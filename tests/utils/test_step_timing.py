@@ -0,0 +1,148 @@
+"""Tests for utils/step_timing.py (step timing, history and regression detection)."""
+
+from pathlib import Path
+
+import pytest
+
+from utils import step_timing
+from utils.step_timing import (
+    StepHistory,
+    StepRecord,
+    StepTimer,
+    analyze,
+    summary_lines,
+    target_of,
+    timed_steps,
+)
+
+
+def fake_driver(caps: dict | None = None):
+    """Counts as a real session for step timing, sends nothing."""
+    # Imported here: collecting this module must not load the WebDriver client
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    driver = WebDriver.__new__(WebDriver)
+    driver.caps = caps or {"browserName": "chrome", "browserVersion": "131.0.6778.85"}
+    return driver
+
+
+class OfflineDriver:
+    capabilities = {"browserName": "chrome", "browserVersion": "131.0.6778.85"}
+
+
+@timed_steps
+class FakePage:
+    def __init__(self, driver=None) -> None:
+        self.driver = driver if driver is not None else fake_driver()
+
+    def open(self) -> str:
+        return "opened"
+
+    def fail(self) -> None:
+        raise TimeoutError("not loaded")
+
+    def _helper(self) -> None:
+        pass
+
+    @staticmethod
+    def parse(value: str) -> str:
+        return value
+
+
+class FakeChildPage(FakePage):
+    pass
+
+
+@pytest.fixture
+def timer(monkeypatch) -> StepTimer:
+    """Own timer: records of real steps in the shared STEP_TIMER are kept."""
+    timer = StepTimer()
+    monkeypatch.setattr(step_timing, "STEP_TIMER", timer)
+    return timer
+
+
+def test_public_methods_are_timed_per_class(timer: StepTimer) -> None:
+    page = FakeChildPage()
+    assert page.open() == "opened"
+    with pytest.raises(TimeoutError):
+        page.fail()
+    page._helper()
+    assert FakePage.parse("x") == "x"
+
+    records = timer.take()
+    assert [(r.step, r.target, r.ok) for r in records] == [
+        ("FakeChildPage.open", "chrome 131", True),
+        ("FakeChildPage.fail", "chrome 131", False),
+    ]
+    assert records[0].test.endswith("test_public_methods_are_timed_per_class")
+
+
+def test_offline_drivers_are_not_recorded(timer: StepTimer) -> None:
+    page = FakePage(OfflineDriver())
+    assert page.open() == "opened"
+    page.driver = None
+    assert page.open() == "opened"
+    assert timer.take() == []
+
+
+def test_decorator_keeps_method_attributes() -> None:
+    def open_internet(self) -> None:
+        pass
+
+    open_internet._nav_target = "InternetPage"
+    page_class = timed_steps(type("Page", (), {"open_internet": open_internet}))
+    assert page_class.open_internet._nav_target == "InternetPage"
+    # Decorating twice does not wrap twice
+    assert timed_steps(page_class).open_internet is page_class.open_internet
+
+
+def test_target_of_mobile_and_unknown_drivers() -> None:
+    appium = fake_driver({"platformName": "Android", "udid": "emulator-5556"})
+
+    assert target_of(appium) == "android:emulator-5556"
+    assert target_of(object()) == "object"
+    assert target_of(None) == "unknown"
+
+
+def record(step: str, seconds: float, ok: bool = True) -> StepRecord:
+    return StepRecord("t", step, "android:emulator-5554", seconds, ok)
+
+
+def test_regression_is_flagged_against_previous_runs(tmp_path: Path) -> None:
+    history = StepHistory(tmp_path / "history.jsonl")
+    for run in ("r1", "r2"):
+        history.append(run, [record("Page.wait_loaded", 1.0), record("Page.submit", 0.2)] * 3)
+    history.append("r3", [record("Page.wait_loaded", 1.6), record("Page.submit", 0.21)] * 3
+                   + [record("Page.submit", 20.0, ok=False)])
+
+    stats = {s.step: s for s in analyze(history.rows(), "r3", threshold=0.25)}
+
+    assert stats["Page.wait_loaded"].regressed
+    assert stats["Page.wait_loaded"].baseline_p95 == 1.0
+    # +5% is within the threshold; failed calls do not count for latency
+    assert not stats["Page.submit"].regressed
+    assert stats["Page.submit"].calls == 4
+    assert stats["Page.submit"].failed == 1
+    assert summary_lines(list(stats.values()))[0].startswith("REGRESSED Page.wait_loaded")
+
+
+def test_small_or_rare_slowdowns_are_not_regressions() -> None:
+    rows = [
+        {"run": run, "target": "chrome", "step": step, "seconds": seconds, "ok": True}
+        for run, step, seconds in [
+            ("old", "Page.fast", 0.01), ("old", "Page.fast", 0.01), ("old", "Page.fast", 0.01),
+            ("new", "Page.fast", 0.05), ("new", "Page.fast", 0.05), ("new", "Page.fast", 0.05),
+            ("old", "Page.rare", 1.0), ("new", "Page.rare", 5.0),
+        ]
+    ]
+    stats = analyze(rows, "new")
+    assert not any(s.regressed for s in stats)
+
+
+def test_history_keeps_last_runs(tmp_path: Path) -> None:
+    history = StepHistory(tmp_path / "history.jsonl")
+    for i in range(5):
+        history.append(f"r{i}", [record("Page.open", 0.1)], ts=1000 + i)
+
+    history.compact(keep_runs=2)
+    assert [row["run"] for row in history.rows()] == ["r3", "r4"]
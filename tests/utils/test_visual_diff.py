@@ -0,0 +1,181 @@
+"""Tests for utils/visual_diff.py (synthetic PNG screenshots).
+
+NumPy and utils/visual_diff.py are imported through the `np` / `vd` fixtures:
+collecting the suite does not load NumPy, and without it these tests are skipped.
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING
+
+import pytest
+
+from utils.artifact_store import ArtifactStore
+
+if TYPE_CHECKING:
+    import numpy
+
+
+@pytest.fixture
+def np() -> ModuleType:
+    return pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def vd(np) -> ModuleType:
+    from utils import visual_diff
+
+    return visual_diff
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if pa <= pb and pa <= pc else b if pb <= pc else c
+
+
+def encode_png(pixels: numpy.ndarray, filters: tuple[int, ...] = (0,)) -> bytes:
+    """Encode (h, w, 3|4) uint8 pixels; row y uses filters[y % len(filters)]."""
+    import numpy as np
+
+    height, width, bpp = pixels.shape
+    rows = pixels.reshape(height, width * bpp).astype(int)
+    raw = bytearray()
+    for y in range(height):
+        kind = filters[y % len(filters)]
+        line, up = rows[y], rows[y - 1] if y else np.zeros_like(rows[0])
+        raw.append(kind)
+        for i, x in enumerate(line):
+            a = line[i - bpp] if i >= bpp else 0
+            c = up[i - bpp] if i >= bpp else 0
+            predictor = [0, a, up[i], (a + up[i]) >> 1, _paeth(a, up[i], c)][kind]
+            raw.append((x - predictor) & 0xFF)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6 if bpp == 4 else 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(bytes(raw))) + chunk(b"IEND", b""))
+
+
+def screen(status_text: int = 0, content: int = 0, size: tuple[int, int] = (200, 100)) -> numpy.ndarray:
+    """RGB "screenshot": status bar with clock at the top, a button whose position depends on `content`."""
+    import numpy as np
+
+    height, width = size
+    image = np.full((height, width, 3), 240, dtype=np.uint8)
+    image[: height // 25, :] = 30
+    image[1:5, 80 + status_text % 15: 90 + status_text % 15] = 255  # clock digits
+    top = 60 + content * 30
+    image[top: top + 25, 20:80] = (20, 120, 220)
+    return image
+
+
+@pytest.mark.parametrize("filters", [(0,), (1,), (2,), (3,), (4,), (0, 1, 2, 3, 4)])
+def test_png_decoder_handles_all_filters(filters, np, vd) -> None:
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 256, size=(7, 5, 4), dtype=np.uint8)
+    assert np.array_equal(vd._decode_png_numpy(encode_png(pixels, filters)), pixels)
+
+
+def test_downsample_is_block_mean(np, vd) -> None:
+    gray = np.arange(16, dtype=np.float32).reshape(4, 4)
+    assert vd.downsample(gray, (2, 2)).tolist() == [[2.5, 4.5], [10.5, 12.5]]
+
+
+def test_status_bar_is_ignored(vd) -> None:
+    before = encode_png(screen(status_text=0))
+    clock_ticked = encode_png(screen(status_text=7))
+
+    assert not vd.screen_changed(before, clock_ticked)
+    # Without the mask the clock counts as a change
+    assert vd.compare(before, clock_ticked, mask=()).changed > 0
+
+
+def test_content_change_is_detected(vd) -> None:
+    before = encode_png(screen(content=0))
+    after = encode_png(screen(content=2))
+
+    diff = vd.compare(before, after)
+    assert vd.screen_changed(before, after)
+    assert diff.changed > 0.05
+    assert diff.hash_distance > 0
+
+
+def test_dhash_survives_resolution_change(np, vd) -> None:
+    small = screen().mean(axis=2)
+    # Same screen on a device with twice the density
+    large = np.repeat(np.repeat(small, 2, axis=0), 2, axis=1)
+    assert vd.dhash(vd.downsample(small)) == vd.dhash(vd.downsample(large))
+
+
+def test_batch_compare_with_baselines(tmp_path: Path, vd) -> None:
+    baselines = tmp_path / "baselines"
+    baselines.mkdir()
+    (baselines / "same.png").write_bytes(encode_png(screen(status_text=3)))
+    (baselines / "changed.png").write_bytes(encode_png(screen(content=0)))
+
+    diffs = vd.compare_with_baselines(
+        {
+            "same.png": encode_png(screen(status_text=9)),
+            "changed.png": encode_png(screen(content=2)),
+            "new.png": encode_png(screen()),
+        },
+        baselines,
+    )
+    assert diffs["same.png"].same()
+    assert not diffs["changed.png"].same()
+    assert diffs["new.png"] is None
+
+
+def test_latest_screens_from_artifact_store(tmp_path: Path, vd) -> None:
+    store = ArtifactStore(tmp_path)
+    store.put(encode_png(screen(content=0)), "png", "tests/mobile/test_x.py::test_y", "FAILED")
+    store.put("<hierarchy/>", "xml", "tests/mobile/test_x.py::test_y", "FAILED")
+    latest = encode_png(screen(content=1))
+    store.put(latest, "png", "tests/mobile/test_x.py::test_y", "FAILED")
+
+    assert vd.latest_screens(tmp_path) == {"tests_mobile_test_x__test_y__FAILED.png": latest}
+    assert vd.baseline_name("a.py::test[param 1]", "ok") == "a__test_param_1___ok.png"
+
+
+def test_same_test_name_in_different_modules(tmp_path: Path, vd) -> None:
+    store = ArtifactStore(tmp_path)
+    store.put(encode_png(screen(content=0)), "png", "tests/mobile/test_a.py::test_open", "FAILED")
+    store.put(encode_png(screen(content=1)), "png", "tests/mobile/test_b.py::Test::test_open", "FAILED")
+
+    assert sorted(vd.latest_screens(tmp_path)) == [
+        "tests_mobile_test_a__test_open__FAILED.png",
+        "tests_mobile_test_b__Test__test_open__FAILED.png",
+    ]
+
+
+def test_custom_mask_region(vd) -> None:
+    before = encode_png(screen(content=0))
+    after = encode_png(screen(content=2))
+    # Mask the whole area where the button moves
+    assert not vd.screen_changed(before, after, mask=(vd.Region(0.0, 0.0, 1.0, 1.0),))
+
+
+class AnimatedDriver:
+    """Screen moves for a few frames, then stays."""
+
+    def __init__(self, moving_frames: int) -> None:
+        self.frames = [encode_png(screen(content=i % 3)) for i in range(moving_frames)]
+        self.final = encode_png(screen(content=1))
+        self.shots = 0
+
+    def get_screenshot_as_png(self) -> bytes:
+        self.shots += 1
+        return self.frames.pop(0) if self.frames else self.final
+
+
+def test_wait_screen_settled(vd) -> None:
+    driver = AnimatedDriver(moving_frames=3)
+    vd.wait_screen_settled(driver, timeout=5)
+    # 3 moving frames + 2 identical final frames
+    assert driver.shots == 5
@@ -0,0 +1,68 @@
+"""Tests for adaptive polling waits (utils/waits.py)."""
+
+import itertools
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from utils.waits import AdaptiveWait, PollSchedule, WaitStats, condition_key
+
+
+def test_schedule_fast_polls_then_backoff_with_cap() -> None:
+    schedule = PollSchedule(initial=0.1, fast_polls=2, backoff=2, max_interval=0.5)
+
+    assert list(itertools.islice(schedule.delays(), 7)) == [0.0, 0.1, 0.1, 0.2, 0.4, 0.5, 0.5]
+    # Learned delay: immediate first poll, then most of the delay is slept
+    assert list(itertools.islice(schedule.delays(expected=1.0), 3)) == [0.0, pytest.approx(0.7), 0.1]
+
+
+def test_ready_condition_does_not_pay_learned_delay() -> None:
+    stats = WaitStats()
+    stats.record("slow once", 2.0, polls=3, satisfied=True)
+    wait = AdaptiveWait(None, timeout=5, stats=stats)
+
+    started = time.monotonic()
+    assert wait.until(lambda d: "ready", key="slow once") == "ready"
+
+    assert time.monotonic() - started < 0.5
+    assert stats.conditions["slow once"].polls == 4
+
+
+def test_until_counts_polls_and_learns_delay(tmp_path) -> None:
+    stats = WaitStats(tmp_path / "wait_stats.json")
+    wait = AdaptiveWait(None, timeout=2, schedule=PollSchedule(initial=0.01), stats=stats)
+    ready_at = time.monotonic() + 0.05
+
+    def ready(_driver):
+        if time.monotonic() < ready_at:
+            raise NoSuchElementException()
+        return "element"
+
+    assert wait.until(ready, key="ready") == "element"
+    first = stats.conditions["ready"]
+    assert first.satisfied == 1 and first.polls > 1
+    assert first.expected == pytest.approx(0.05, abs=0.04)
+
+    stats.save()
+    assert WaitStats(tmp_path / "wait_stats.json").expected("ready") == pytest.approx(first.expected, abs=1e-3)
+
+
+def test_timeout_is_recorded_and_raised() -> None:
+    stats = WaitStats()
+    wait = AdaptiveWait(None, timeout=0.2, stats=stats)
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutException, match="never"):
+        wait.until(lambda d: False, message="never", key="k")
+
+    assert time.monotonic() - started < 0.5
+    assert stats.conditions["k"].timeouts == 1
+    assert wait.until_not(lambda d: False, key="k") is False
+
+
+def test_condition_key_uses_closed_over_locator() -> None:
+    from selenium.webdriver.support import expected_conditions as EC
+
+    key = condition_key(EC.visibility_of_element_located(("id", "firstName")))
+    assert key == "visibility_of_element_located(('id', 'firstName'))"
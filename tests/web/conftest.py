@@ -1,32 +1,107 @@
-"""Pytest configuration for web tests."""
-from typing import Generator
+"""Pytest configuration for web tests.
+
+Selenium WebDriver and webdriver-manager are imported by `make_browser`
+(web_utils/browser_pool.py): collecting tests that do not request `browser`
+(pool reset logic, local site) does not load them.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Generator
 
 import pytest
 
-try:
+from utils.artifact_writer import capture_artifacts
+from web_utils.browser_pool import BrowserPool, make_browser
+from web_utils.local_site import LocalSite
+from web_utils.page_load import OPEN_TIMINGS
+
+# Same folder as mobile artifacts; page source of web pages is saved as HTML
+ARTIFACTS_DIR = Path("artifacts")
+
+if TYPE_CHECKING:
     from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service as ChromeService
-    from webdriver_manager.chrome import ChromeDriverManager
 
-    WEB_DEPS_AVAILABLE = True
-except ImportError:
-    WEB_DEPS_AVAILABLE = False
+# Checked without importing: find_spec only locates the packages
+WEB_DEPS_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None for name in ("selenium", "webdriver_manager")
+)
+
+# WEB_REUSE_BROWSER=1 -> one browser per pytest process / xdist worker, reset between tests
+REUSE_BROWSER = os.getenv("WEB_REUSE_BROWSER", "0") == "1"
+
+# Launch / reuse counts of the pooled mode (reported in terminal summary)
+_pool: BrowserPool | None = None
+
+
+@pytest.fixture(scope="session")
+def browser_pool() -> Generator[BrowserPool, None, None]:
+    """Browsers shared by tests of this process (pooled mode)."""
+    global _pool
+    _pool = BrowserPool(make_browser)
+    yield _pool
+    _pool.close()
 
 
 @pytest.fixture(scope="function")
-def browser() -> Generator[webdriver.Chrome, None, None]:
+def browser(request) -> Generator[webdriver.Chrome, None, None]:
     """Fixture for creating and closing Chrome browser for web tests.
 
+    Default mode: new browser for every test, closed after it.
+    Pooled mode (WEB_REUSE_BROWSER=1): browser is taken from the pool and
+    reset (windows, cookies, storage, about:blank) after the test.
+
     Yields:
         Chrome WebDriver instance
     """
     if not WEB_DEPS_AVAILABLE:
         pytest.skip("Web dependencies (selenium, webdriver-manager) are not installed")
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")
-    driver = webdriver.Chrome(
-        service=ChromeService(ChromeDriverManager().install()), options=options
-    )
+    if REUSE_BROWSER:
+        pool: BrowserPool = request.getfixturevalue("browser_pool")
+        driver = pool.acquire()
+        yield driver
+        pool.release(driver)
+        return
+
+    driver = make_browser()
     yield driver
     driver.quit()
+
+
+@pytest.fixture(scope="session")
+def local_site() -> Generator[LocalSite, None, None]:
+    """Local copy of the DemoQA form with slow dummy ads/fonts (tests/web/site)."""
+    with LocalSite() as site:
+        yield site
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Pytest hook: saves screenshot and page HTML on web test failure.
+
+    Uses the same background artifact writer as mobile tests.
+    """
+    outcome = yield
+    rep = outcome.get_result()
+
+    if rep.when == "call" and rep.failed:
+        drv = item.funcargs.get("browser")
+        if drv:
+            capture_artifacts(drv, ARTIFACTS_DIR, prefix="web_fail", source_ext="html")
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Report browser launch / reuse counts of the pooled mode and page open timings."""
+    sections = {
+        "browser pool": _pool.summary_lines() if _pool is not None else [],
+        "page opens": OPEN_TIMINGS.summary_lines(),
+    }
+    for title, lines in sections.items():
+        if lines:
+            terminalreporter.section(title)
+            for line in lines:
+                terminalreporter.write_line(line)
@@ -0,0 +1,78 @@
+"""Offline tests for the browser pool (fake drivers, no Chrome required)."""
+
+from web_utils.browser_pool import BrowserPool, reset_browser
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: "FakeBrowser") -> None:
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        self.driver.current = handle
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.alive = True
+        self.window_handles = ["main", "popup"]
+        self.current = "popup"
+        self.origins = {"main": "https://demoqa.com", "popup": "https://ads.example"}
+        self.log: list[str] = []
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def current_window_handle(self) -> str:
+        if not self.alive:
+            raise ConnectionError("chrome not reachable")
+        return self.current
+
+    def close(self) -> None:
+        self.window_handles.remove(self.current)
+
+    def execute_script(self, script: str) -> str:
+        self.log.append(f"storage {self.current}")
+        return self.origins[self.current]
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> None:
+        self.log.append(f"{cmd} {params.get('origin', '')}".strip())
+
+    def get(self, url: str) -> None:
+        self.log.append(url)
+
+    def quit(self) -> None:
+        self.alive = False
+
+
+def test_reset_closes_extra_windows_and_clears_state() -> None:
+    drv = FakeBrowser()
+    reset_browser(drv)
+
+    assert drv.window_handles == ["main"]
+    assert drv.current == "main"
+    assert drv.log == [
+        "storage popup",
+        "storage main",
+        "Network.clearBrowserCookies",
+        # Every origin open at the end of the test, popup included
+        "Storage.clearDataForOrigin https://ads.example",
+        "Storage.clearDataForOrigin https://demoqa.com",
+        "about:blank",
+    ]
+
+
+def test_browser_is_reused_and_crashed_one_replaced() -> None:
+    pool = BrowserPool(FakeBrowser)
+
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+
+    first.alive = False  # Crashed during the test
+    pool.release(first)  # Reset fails -> dropped
+    second = pool.acquire()
+    assert second is not first
+
+    assert (pool.stats.launched, pool.stats.reused, pool.stats.replaced) == (2, 1, 1)
+    pool.release(second)
+    pool.close()
+    assert not second.alive
@@ -0,0 +1,59 @@
+"""Offline tests for browser-side waits (pages/browser_wait.py)."""
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.timeouts import Timeouts
+
+from pages.browser_wait import to_browser_locator, wait_in_browser
+
+
+class FakeDriver:
+    """Returns prepared results of execute_async_script."""
+
+    def __init__(self, *results, script_timeout: float = 30) -> None:
+        self.results = list(results)
+        self.timeouts = Timeouts(script=script_timeout)
+        self.script_timeouts: list[float] = []
+        self.calls: list[tuple] = []
+
+    def set_script_timeout(self, seconds: float) -> None:
+        self.script_timeouts.append(seconds)
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        return self.results.pop(0)
+
+
+def test_locators_are_converted() -> None:
+    assert to_browser_locator((By.ID, "example-modal-sizes-title-lg")) == (
+        "css", '[id="example-modal-sizes-title-lg"]'
+    )
+    assert to_browser_locator((By.XPATH, "//label")) == ("xpath", "//label")
+    with pytest.raises(ValueError):
+        to_browser_locator((By.LINK_TEXT, "Home"))
+
+
+def test_one_round_trip_per_wait_and_timeout() -> None:
+    element = object()
+    driver = FakeDriver([element, "Thanks for submitting the form"], None)
+
+    result = wait_in_browser(driver, (By.CSS_SELECTOR, ".table-responsive"), timeout=3)
+    assert result.element is element
+    assert result.text == "Thanks for submitting the form"
+    assert driver.calls[0] == ("css", ".table-responsive", True, 3000)
+
+    with pytest.raises(TimeoutException, match="modal"):
+        wait_in_browser(driver, (By.ID, "x"), timeout=2, message="no modal")
+    # Default script timeout (30 s) already covers both waits
+    assert driver.script_timeouts == []
+
+
+def test_raised_script_timeout_is_restored() -> None:
+    driver = FakeDriver(None, script_timeout=5)
+
+    with pytest.raises(TimeoutException):
+        wait_in_browser(driver, (By.ID, "x"), timeout=3)
+
+    assert driver.script_timeouts == [8, 5]
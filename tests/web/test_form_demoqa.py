@@ -3,11 +3,30 @@
 import os
 from typing import TYPE_CHECKING
 
+import pytest
+
 from pages.form_page import FormPage
+from tools.form_runner import iter_records, run
 
 if TYPE_CHECKING:
     from selenium.webdriver.remote.webdriver import WebDriver
 
+    from web_utils.local_site import LocalSite
+
+RECORDS = os.path.join(os.path.dirname(__file__), "data", "form_records.jsonl")
+
+
+def sample_picture() -> str:
+    """Return path of the upload file, creating it in tests/resources if needed."""
+    resources_dir = os.path.join(os.path.dirname(__file__), "..", "resources")
+    os.makedirs(resources_dir, exist_ok=True)
+    sample_file = os.path.join(resources_dir, "sample_pic.png")
+    if not os.path.exists(sample_file):
+        # Create minimal "valid" PNG file (header + signature)
+        with open(sample_file, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+    return sample_file
+
 
 def test_fill_form_success(browser: "WebDriver") -> None:
     """
@@ -33,17 +52,8 @@ def test_fill_form_success(browser: "WebDriver") -> None:
     page.fill_subject("Maths")
     page.choose_hobby("Sports")
 
-    # Step 2: Prepare file for upload
-    # File is created on-the-fly in tests/resources directory if it doesn't exist
-    resources_dir = os.path.join(os.path.dirname(__file__), "..", "resources")
-    os.makedirs(resources_dir, exist_ok=True)
-    sample_file = os.path.join(resources_dir, "sample_pic.png")
-    if not os.path.exists(sample_file):
-        # Create minimal "valid" PNG file (header + signature)
-        with open(sample_file, "wb") as f:
-            f.write(b"\x89PNG\r\n\x1a\n")
-
-    page.upload_picture(sample_file)
+    # Step 2: Upload test file
+    page.upload_picture(sample_picture())
 
     # Step 3: Fill address and dropdown selects "State / City"
     page.fill_address("Test address 123")
@@ -60,3 +70,41 @@ def test_fill_form_success(browser: "WebDriver") -> None:
     table_text = page.get_modal_table_text()
     assert "Ivan Petrov" in table_text
     assert "ivanpetrov@example.com" in table_text
+
+
+# Same scenario as above; per-field filling takes several times more commands
+@pytest.mark.max_commands(30)
+def test_fill_form_bulk(browser: "WebDriver") -> None:
+    """Fill the whole form with one script call (FormPage.fill_all) and submit."""
+    page = FormPage(browser)
+    page.open()
+
+    page.fill_all({
+        "first_name": "Ivan",
+        "last_name": "Petrov",
+        "email": "ivanpetrov@example.com",
+        "gender": "Male",
+        "mobile": "7599172463",
+        "subjects": ["Maths"],
+        "hobbies": ["Sports"],
+        "picture": sample_picture(),
+        "address": "Test address 123",
+        "state": "NCR",
+        "city": "Delhi",
+    })
+    page.submit()
+
+    assert "Thanks for submitting the form" in page.wait_for_modal()
+    table_text = page.get_modal_table_text()
+    assert "Ivan Petrov" in table_text
+    assert "Maths" in table_text
+    assert "NCR Delhi" in table_text
+
+
+def test_fill_form_local_records(browser: "WebDriver", local_site: "LocalSite") -> None:
+    """Submit every record of tests/web/data against the local copy of the form."""
+    page = FormPage(browser, timeout=5, base_url=local_site.url)
+    report = run(iter_records(RECORDS), page)
+
+    assert report.submitted == 3
+    assert report.failures == []
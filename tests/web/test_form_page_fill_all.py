@@ -0,0 +1,66 @@
+"""Offline tests for FormPage.fill_all routing (no browser required)."""
+
+import pytest
+
+from pages.form_page import FormPage
+
+
+class FakeElement:
+    def __init__(self, text: str = "") -> None:
+        self.text = text
+
+    def is_displayed(self) -> bool:
+        return True
+
+
+class FakeDriver:
+    """Answers element lookups; the fill script reports `failed` keys."""
+
+    def __init__(self, failed: list[str], chips: list[str] = ()) -> None:
+        self.failed = failed
+        self.chips = list(chips)
+        self.scripts: list[dict] = []
+
+    def find_element(self, by, value):
+        return FakeElement()
+
+    def find_elements(self, by, value):
+        return [FakeElement(text) for text in self.chips]
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args[0])
+        return self.failed
+
+
+def test_one_script_call_and_typing_fallback(monkeypatch) -> None:
+    driver = FakeDriver(failed=["city"])
+    page = FormPage(driver)
+    typed = []
+    monkeypatch.setattr(page, "_type_field", lambda key, value: typed.append((key, value)))
+
+    fallback = page.fill_all(
+        {"first_name": "Ivan", "hobbies": "Sports", "picture": "pic.png", "state": "NCR", "city": "Delhi"},
+        type_fields=["first_name"],
+    )
+
+    # Picture always needs send_keys; first_name was requested as typed; city failed in script
+    assert fallback == ["first_name", "picture", "city"]
+    assert typed == [("first_name", "Ivan"), ("picture", "pic.png"), ("city", "Delhi")]
+    assert driver.scripts == [{"hobbies": ["Sports"], "state": "NCR", "city": "Delhi"}]
+
+
+def test_subjects_added_by_the_script_are_not_typed_again(monkeypatch) -> None:
+    # Script selected "Maths", then failed on "Physics"
+    driver = FakeDriver(failed=["subjects"], chips=["Maths"])
+    page = FormPage(driver)
+    typed = []
+    monkeypatch.setattr(page, "fill_subject", typed.append)
+
+    page.fill_all({"subjects": ["Maths", "Physics"]})
+
+    assert typed == ["Physics"]
+
+
+def test_unknown_keys_are_rejected() -> None:
+    with pytest.raises(ValueError, match="zip"):
+        FormPage(FakeDriver(failed=[])).fill_all({"zip": "12345"})
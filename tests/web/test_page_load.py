@@ -0,0 +1,101 @@
+"""Resource policy, page open timing and the local form copy."""
+
+import time
+import urllib.request
+from typing import TYPE_CHECKING
+
+from pages.form_page import FormPage
+from web_utils.local_site import LocalSite
+from web_utils import page_load
+from web_utils.page_load import OpenTimings, ResourcePolicy, apply_resource_policy, open_page
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class FakeCdpDriver:
+    def __init__(self) -> None:
+        self.cdp: list[tuple[str, dict]] = []
+        self.visited: list[str] = []
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> None:
+        self.cdp.append((cmd, params))
+
+    def get(self, url: str) -> None:
+        self.visited.append(url)
+
+
+def test_allow_list_wins_over_block_list() -> None:
+    policy = ResourcePolicy(
+        block=("*.woff2", "*/ads/*", "*doubleclick.net*"),
+        allow=("https://demoqa.com/fonts/main.woff2",),
+    )
+    assert policy.blocked_patterns() == ["*/ads/*", "*doubleclick.net*"]
+
+
+def test_allowed_url_unblocks_its_whole_pattern() -> None:
+    policy = ResourcePolicy(block=("*/ads/*",), allow=("https://demoqa.com/ads/logo.png",))
+    # CDP has no per-URL exceptions: other ads are not blocked either
+    assert policy.blocked_patterns() == []
+
+
+def test_policy_is_sent_once_per_driver(monkeypatch) -> None:
+    monkeypatch.delenv("WEB_BLOCK_RESOURCES", raising=False)
+    driver = FakeCdpDriver()
+    policy = ResourcePolicy(block=("*/ads/*",))
+
+    assert apply_resource_policy(driver, policy) == 1
+    assert apply_resource_policy(driver, policy) == 1
+    assert driver.cdp == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": ["*/ads/*"]})]
+
+    # Another page object without a policy unblocks everything
+    apply_resource_policy(driver, None)
+    assert driver.cdp[-1] == ("Network.setBlockedURLs", {"urls": []})
+
+
+def test_blocking_can_be_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("WEB_BLOCK_RESOURCES", "0")
+    driver = FakeCdpDriver()
+    assert apply_resource_policy(driver, ResourcePolicy(block=("*/ads/*",))) == 0
+    assert driver.cdp[-1] == ("Network.setBlockedURLs", {"urls": []})
+
+
+def test_non_chromium_driver_is_left_alone() -> None:
+    assert apply_resource_policy(object(), ResourcePolicy(block=("*/ads/*",))) == 0
+
+
+def test_open_page_times_navigation_and_readiness(monkeypatch) -> None:
+    timings = OpenTimings()
+    # The real OPEN_TIMINGS goes to the terminal summary of this run
+    monkeypatch.setattr(page_load, "OPEN_TIMINGS", timings)
+    driver = FakeCdpDriver()
+    timing = open_page(driver, "http://site/form", None, lambda: time.sleep(0.05), page="FormPage")
+
+    assert driver.visited == ["http://site/form"]
+    assert timing.ready >= 0.05
+    assert timings.items == [timing]
+    assert timings.summary_lines()[0].startswith("FormPage: opens 1")
+
+
+def test_form_page_base_url() -> None:
+    assert FormPage(FakeCdpDriver(), base_url="http://127.0.0.1:8000/").url == (
+        "http://127.0.0.1:8000/automation-practice-form"
+    )
+    assert FormPage(FakeCdpDriver()).url == FormPage.URL
+
+
+def test_local_site_serves_form_and_slow_assets() -> None:
+    with LocalSite() as site:
+        with urllib.request.urlopen(f"{site.url}/automation-practice-form") as response:
+            html = response.read().decode()
+        assert 'id="firstName"' in html
+
+        started = time.perf_counter()
+        urllib.request.urlopen(f"{site.url}/slow/300/ads/banner.png").read()
+        assert time.perf_counter() - started >= 0.3
+
+
+def test_open_local_form_skips_slow_assets(browser: "WebDriver", local_site: LocalSite) -> None:
+    """Ads and fonts of the local copy take 2 s; the form must be usable well before that."""
+    timing = FormPage(browser, base_url=local_site.url).open()
+    assert timing.navigation + timing.ready < 1.5
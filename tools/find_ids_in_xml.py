@@ -1,47 +1,200 @@
+"""Поиск resource-id / text / content-desc по UI-дампам из artifacts.
+
+Два режима:
+- без фильтров: печатает первые 40 полезных элементов одного XML
+  (самого свежего или переданного аргументом);
+- с фильтрами (--text / --id / --desc / --cls / --regex): ищет по ВСЕМ дампам
+  через локальный индекс SQLite (artifacts/.ui_index.sqlite).
+
+Индекс обновляется инкрементально: заново разбираются только новые или
+изменённые файлы, XML читается потоково (iterparse), без загрузки в память целиком.
+
+Примеры:
+    python tools/find_ids_in_xml.py
+    python tools/find_ids_in_xml.py artifacts\\xxx.xml
+    python tools/find_ids_in_xml.py --text Internet
+    python tools/find_ids_in_xml.py --id android:id/title --text Wi
+    python tools/find_ids_in_xml.py --regex "Wi.?Fi"
+"""
+import argparse
+import gzip
+import re
+import sqlite3
 import sys
 from pathlib import Path
+from typing import Iterator
 import xml.etree.ElementTree as ET
 
+ARTIFACTS = Path("artifacts")
+INDEX_NAME = ".ui_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dumps (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    dump_id INTEGER NOT NULL REFERENCES dumps(id) ON DELETE CASCADE,
+    text TEXT NOT NULL,
+    resource_id TEXT NOT NULL,
+    content_desc TEXT NOT NULL,
+    cls TEXT NOT NULL,
+    bounds TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_text ON nodes(text);
+CREATE INDEX IF NOT EXISTS nodes_resource_id ON nodes(resource_id);
+CREATE INDEX IF NOT EXISTS nodes_content_desc ON nodes(content_desc);
+CREATE INDEX IF NOT EXISTS nodes_dump ON nodes(dump_id);
+"""
+
+
+def list_dumps(artifacts_dir: Path) -> list[Path]:
+    # Старые дампы лежат прямо в artifacts/, новые - сжатыми в хранилище artifacts/blobs/
+    return list(artifacts_dir.glob("*.xml")) + list(artifacts_dir.glob("blobs/*/*.xml.gz"))
+
 
 def pick_latest_xml(artifacts_dir: Path) -> Path | None:
-    xmls = sorted(artifacts_dir.glob("*.xml"), key=lambda p: p.stat().st_mtime, reverse=True)
+    xmls = sorted(list_dumps(artifacts_dir), key=lambda p: p.stat().st_mtime, reverse=True)
     return xmls[0] if xmls else None
 
 
-def main():
-    artifacts = Path("artifacts")
+def open_xml(xml_path: Path):
+    """Открывает XML-дамп, в том числе сжатый (.xml.gz)."""
+    if xml_path.suffix == ".gz":
+        return gzip.open(xml_path, "rb")
+    return open(xml_path, "rb")
 
-    # 1) Определяем, какой XML читать:
-    # - если передали путь аргументом: python tools/find_ids_in_xml.py artifacts\file.xml
-    # - иначе берём самый свежий XML из папки artifacts
-    if len(sys.argv) >= 2:
-        xml_path = Path(sys.argv[1])
-    else:
-        xml_path = pick_latest_xml(artifacts)
-
-    if not xml_path or not xml_path.exists():
-        print("Не найден XML. Запусти тест, чтобы появился artifacts/*.xml")
-        print("Или укажи путь явно: python tools/find_ids_in_xml.py artifacts\\xxx.xml")
-        return
 
-    print(f"[OK] читаю XML: {xml_path}")
+def iter_nodes(xml_path: Path) -> Iterator[tuple[str, str, str, str, str]]:
+    """
+    Потоково отдаёт (text, resource-id, content-desc, class, bounds) элементов.
+
+    Элементы очищаются сразу после обработки, поэтому память не растёт
+    даже на больших дампах.
+    """
+    with open_xml(xml_path) as f:
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            if event == "end":
+                el.clear()
+                continue
+            # Атрибуты доступны уже на "start" - порядок как в документе
+            a = el.attrib
+            rid = a.get("resource-id", "")
+            text = a.get("text", "")
+            desc = a.get("content-desc", "")
+            if rid or text or desc:
+                yield text, rid, desc, a.get("class", ""), a.get("bounds", "")
+
+
+# ====== Индекс ======
+
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(db_path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(SCHEMA)
+    # REGEXP для --regex (в SQLite нет встроенной реализации)
+    db.create_function(
+        "REGEXP", 2, lambda pattern, value: re.search(pattern, value or "") is not None,
+        deterministic=True,
+    )
+    return db
+
+
+def update_index(db: sqlite3.Connection, artifacts_dir: Path) -> tuple[int, int]:
+    """
+    Добавляет в индекс новые/изменённые дампы и удаляет пропавшие.
 
-    # 2) Парсим XML (это “снимок” всего экрана)
-    root = ET.parse(xml_path).getroot()
+    Returns:
+        (сколько файлов переиндексировано, сколько удалено)
+    """
+    known = {path: (mtime, size) for path, mtime, size in db.execute("SELECT path, mtime, size FROM dumps")}
+    seen = set()
+    updated = 0
+    for xml_path in list_dumps(artifacts_dir):
+        key = xml_path.as_posix()
+        seen.add(key)
+        st = xml_path.stat()
+        if known.get(key) == (st.st_mtime, st.st_size):
+            continue
+        db.execute("DELETE FROM dumps WHERE path = ?", (key,))
+        try:
+            rows = list(iter_nodes(xml_path))
+        except (ET.ParseError, OSError) as e:
+            print(f"[WARN] пропускаю {xml_path}: {e}")
+            continue
+        cur = db.execute(
+            "INSERT INTO dumps (path, mtime, size) VALUES (?, ?, ?)", (key, st.st_mtime, st.st_size)
+        )
+        db.executemany(
+            "INSERT INTO nodes (dump_id, text, resource_id, content_desc, cls, bounds) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((cur.lastrowid, *row) for row in rows),
+        )
+        updated += 1
+    removed = [path for path in known if path not in seen]
+    db.executemany("DELETE FROM dumps WHERE path = ?", ((p,) for p in removed))
+    db.commit()
+    return updated, len(removed)
 
-    # 3) Собираем элементы, у которых есть хоть какие-то полезные атрибуты
-    items = []
-    for el in root.iter():
-        rid = el.attrib.get("resource-id", "")
-        text = el.attrib.get("text", "")
-        desc = el.attrib.get("content-desc", "")
-        cls = el.attrib.get("class", "")
-        if any([rid, text, desc]):
-            items.append((rid, text, desc, cls))
+
+def query_index(
+    db: sqlite3.Connection,
+    text: str | None = None,
+    res_id: str | None = None,
+    desc: str | None = None,
+    cls: str | None = None,
+    regex: str | None = None,
+    limit: int = 50,
+) -> list[tuple[str, str, str, str, str, str]]:
+    """
+    Ищет элементы по всем проиндексированным дампам.
+
+    --text/--desc - подстрока, --id/--cls - точное совпадение (по индексу),
+    --regex - регулярное выражение по text, resource-id и content-desc.
+    """
+    where, params = [], []
+    if res_id is not None:
+        where.append("n.resource_id = ?")
+        params.append(res_id)
+    if cls is not None:
+        where.append("n.cls = ?")
+        params.append(cls)
+    if text is not None:
+        where.append("instr(n.text, ?) > 0")
+        params.append(text)
+    if desc is not None:
+        where.append("instr(n.content_desc, ?) > 0")
+        params.append(desc)
+    if regex is not None:
+        where.append("(n.text REGEXP ? OR n.resource_id REGEXP ? OR n.content_desc REGEXP ?)")
+        params.extend([regex] * 3)
+    sql = (
+        "SELECT d.path, n.text, n.resource_id, n.content_desc, n.cls, n.bounds "
+        "FROM nodes n JOIN dumps d ON d.id = n.dump_id"
+    )
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY d.mtime DESC LIMIT ?"
+    params.append(limit)
+    return db.execute(sql, params).fetchall()
+
+
+# ====== CLI ======
+
+
+def print_top(xml_path: Path) -> None:
+    """Старый режим: первые 40 полезных элементов одного дампа."""
+    print(f"[OK] читаю XML: {xml_path}")
+
+    # Собираем элементы, у которых есть хоть какие-то полезные атрибуты
+    items = [(rid, text, desc, cls) for text, rid, desc, cls, _ in iter_nodes(xml_path)]
 
     print(f"[INFO] элементов с (resource-id/text/content-desc): {len(items)}")
 
-    # 4) Печатаем примеры (первые 40)
+    # Печатаем примеры (первые 40)
     print("\n--- TOP 40 ---")
     for i, (rid, text, desc, cls) in enumerate(items[:40], start=1):
         print(f"{i:02d}. class={cls!r}")
@@ -52,9 +205,68 @@ def main():
         if desc:
             print(f"    content-desc: {desc!r}")
 
-    print("\nПодсказка: если хочешь найти конкретное слово, скажи мне какое (например 'Internet'/'Wi-Fi'),")
-    print("и я сделаю фильтр, который печатает только совпадения.")
+    print("\nПодсказка: для поиска по всем дампам используй фильтры, например:")
+    print("    python tools/find_ids_in_xml.py --text Internet")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Поиск элементов в UI-дампах artifacts/")
+    parser.add_argument("xml", nargs="?", help="XML-дамп для просмотра (по умолчанию самый свежий)")
+    parser.add_argument("--artifacts", default=str(ARTIFACTS), help="папка с дампами")
+    parser.add_argument("--db", help=f"файл индекса (по умолчанию <artifacts>/{INDEX_NAME})")
+    parser.add_argument("--text", help="подстрока в text")
+    parser.add_argument("--id", dest="res_id", help="точный resource-id")
+    parser.add_argument("--desc", help="подстрока в content-desc")
+    parser.add_argument("--cls", help="точный class")
+    parser.add_argument("--regex", help="регулярка по text / resource-id / content-desc")
+    parser.add_argument("--limit", type=int, default=50, help="максимум результатов")
+    parser.add_argument("--reindex", action="store_true", help="только обновить индекс")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    artifacts = Path(args.artifacts)
+    filters = [args.text, args.res_id, args.desc, args.cls, args.regex]
+
+    # 1) Без фильтров - старый режим просмотра одного XML:
+    # - если передали путь аргументом: python tools/find_ids_in_xml.py artifacts\file.xml
+    # - иначе берём самый свежий XML из папки artifacts
+    if not args.reindex and all(f is None for f in filters):
+        xml_path = Path(args.xml) if args.xml else pick_latest_xml(artifacts)
+        if not xml_path or not xml_path.exists():
+            print("Не найден XML. Запусти тест, чтобы появился artifacts/*.xml")
+            print("Или укажи путь явно: python tools/find_ids_in_xml.py artifacts\\xxx.xml")
+            return
+        print_top(xml_path)
+        return
+
+    # 2) Поиск по всем дампам через индекс
+    db_path = Path(args.db) if args.db else artifacts / INDEX_NAME
+    artifacts.mkdir(exist_ok=True)
+    db = open_index(db_path)
+    try:
+        updated, removed = update_index(db, artifacts)
+        total = db.execute("SELECT COUNT(*) FROM dumps").fetchone()[0]
+        print(f"[INDEX] дампов: {total}, обновлено: {updated}, удалено: {removed}")
+        if args.reindex:
+            return
+
+        rows = query_index(
+            db, args.text, args.res_id, args.desc, args.cls, args.regex, args.limit
+        )
+        for path, text, rid, desc, cls, bounds in rows:
+            print(f"{path}  class={cls!r} bounds={bounds}")
+            if rid:
+                print(f"    resource-id: {rid!r}")
+            if text:
+                print(f"    text: {text!r}")
+            if desc:
+                print(f"    content-desc: {desc!r}")
+        print(f"[FOUND] совпадений: {len(rows)}")
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,220 @@
+"""Data-driven runner: submit the DemoQA form once per record of a CSV / JSONL file.
+
+Records are streamed (one line at a time, nothing is loaded up front), so a
+file with thousands of rows costs constant memory. Every record goes through
+`FormPage`: open -> fill_all -> submit -> result modal; the submission is
+successful when the modal shows the student name.
+
+By default the runner starts the local copy of the form (`tests/web/site/`,
+see web_utils/local_site.py); `--base-url https://demoqa.com` targets the real site.
+
+Record keys are FormPage.FILL_KEYS. In CSV, `subjects` and `hobbies` are
+separated by ";" and empty cells are skipped. Example JSONL line:
+    {"first_name": "Ivan", "last_name": "Petrov", "gender": "Male", "mobile": "7599172463"}
+
+Usage:
+    python -m tools.form_runner tests/web/data/form_records.jsonl
+    python -m tools.form_runner records.csv --limit 1000 --report artifacts/form_run.json
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from pages.form_page import FormPage
+from utils.step_timing import percentile
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Multi-value CSV cells ("Maths;English")
+LIST_KEYS = ("subjects", "hobbies")
+LIST_SEPARATOR = ";"
+
+# Failures kept in the report (the counter covers all of them)
+MAX_FAILURES_KEPT = 50
+
+
+def iter_records(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Yield form records of a .csv or .jsonl file one by one.
+
+    Raises:
+        ValueError: If the file extension is not supported
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in (".csv", ".jsonl"):
+        raise ValueError(f"Unsupported records file (expected .csv or .jsonl): {path}")
+    with path.open(encoding="utf-8", newline="") as f:
+        if suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        for row in csv.DictReader(f):
+            record: dict[str, Any] = {}
+            for key, value in row.items():
+                if key is None or not value:
+                    continue
+                record[key] = value.split(LIST_SEPARATOR) if key in LIST_KEYS else value
+            yield record
+
+
+@dataclass
+class SubmissionResult:
+    """Outcome of one record."""
+
+    index: int
+    ok: bool
+    seconds: float
+    error: str = ""
+
+
+@dataclass
+class RunReport:
+    """Throughput, latency percentiles and failures of a run."""
+
+    submitted: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    failures: list[SubmissionResult] = field(default_factory=list)
+
+    def add(self, result: SubmissionResult) -> None:
+        self.submitted += 1
+        self.latencies.append(result.seconds)
+        if not result.ok:
+            self.failed += 1
+            if len(self.failures) < MAX_FAILURES_KEPT:
+                self.failures.append(result)
+
+    @property
+    def per_second(self) -> float:
+        return self.submitted / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "submitted": self.submitted,
+            "failed": self.failed,
+            "elapsed_s": round(self.elapsed, 3),
+            "per_second": round(self.per_second, 2),
+            "latency_s": {f"p{q}": round(percentile(latencies, q), 4) for q in (50, 90, 95, 99)},
+            "failures": [asdict(f) for f in self.failures],
+        }
+
+    def summary_lines(self) -> list[str]:
+        data = self.as_dict()
+        latency = ", ".join(f"{k} {v:.3f}s" for k, v in data["latency_s"].items())
+        lines = [
+            f"submitted {self.submitted}, failed {self.failed}, "
+            f"{self.elapsed:.1f}s, {self.per_second:.2f} submissions/s",
+            f"latency: {latency}",
+        ]
+        lines.extend(f"  #{f.index}: {f.error}" for f in self.failures[:10])
+        return lines
+
+
+def submit_record(page: FormPage, record: dict[str, Any]) -> None:
+    """
+    Submit one record and check the result modal.
+
+    Raises:
+        AssertionError: If the modal does not show the student name
+    """
+    page.open()
+    page.fill_all(record)
+    page.submit()
+    table_text = page.get_modal_table_text()
+    name = f"{record.get('first_name', '')} {record.get('last_name', '')}".strip()
+    assert name in table_text, f"{name!r} not in result modal"
+
+
+def run_records(
+    records: Iterable[dict[str, Any]],
+    page: FormPage,
+    submit: Callable[[FormPage, dict[str, Any]], None] = submit_record,
+    limit: int | None = None,
+) -> Iterator[SubmissionResult]:
+    """
+    Submit records one by one, yielding the result of each (failures do not stop the run).
+
+    Args:
+        records: Record stream (e.g. iter_records(path))
+        page: Page object bound to a browser
+        submit: Submits one record, raises on failure
+        limit: Stop after this many records
+    """
+    for index, record in enumerate(records):
+        if limit is not None and index >= limit:
+            return
+        started = time.perf_counter()
+        error = ""
+        try:
+            submit(page, record)
+        except Exception as e:  # noqa: BLE001 (one bad record must not stop the run)
+            error = f"{type(e).__name__}: {e}".strip().splitlines()[0]
+        yield SubmissionResult(index, not error, time.perf_counter() - started, error)
+
+
+def run(
+    records: Iterable[dict[str, Any]],
+    page: FormPage,
+    submit: Callable[[FormPage, dict[str, Any]], None] = submit_record,
+    limit: int | None = None,
+) -> RunReport:
+    """Run all records and return the report."""
+    report = RunReport()
+    started = time.perf_counter()
+    for result in run_records(records, page, submit, limit):
+        report.add(result)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Submit the DemoQA form for every record of a CSV / JSONL file")
+    parser.add_argument("records", help=".csv or .jsonl file")
+    parser.add_argument("--base-url", help="site to test (default: local copy of the form)")
+    parser.add_argument("--limit", type=int, help="stop after N records")
+    parser.add_argument("--timeout", type=int, default=5, help="page object wait timeout, s")
+    parser.add_argument("--report", help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    # Browser is created the same way as in web tests
+    from web_utils.browser_pool import make_browser
+    from web_utils.local_site import LocalSite
+
+    site = None if args.base_url else LocalSite()
+    base_url = args.base_url or site.start()
+    driver: "WebDriver" = make_browser()
+    try:
+        page = FormPage(driver, timeout=args.timeout, base_url=base_url)
+        report = run(iter_records(args.records), page, limit=args.limit)
+    finally:
+        driver.quit()
+        if site is not None:
+            site.stop()
+
+    print(f"[RUN] {args.records} -> {base_url}")
+    for line in report.summary_lines():
+        print(line)
+    if args.report:
+        out = Path(args.report)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report.as_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"[OK] report: {out}")
+
+
+if __name__ == "__main__":
+    main()
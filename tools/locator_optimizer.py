@@ -0,0 +1,239 @@
+"""Locator optimizer: cheapest unique selector for page object targets.
+
+Page objects mostly locate elements by `textContains` UiSelector scans,
+which is the slowest strategy UiAutomator2 has. This tool goes through the
+recorded UI dumps (artifacts/*.xml and compressed store blobs), recognizes
+the screen of every dump with the screen classifier and, for each element
+the page objects target (ANCHORS, TITLE, --target), checks candidate
+locators from fastest to slowest:
+
+    accessibility id  ->  id  ->  id + text  ->  text  ->  textContains
+
+The first candidate that matches exactly one element in every dump of that
+screen wins. Result is written as a JSON locator map.
+
+`--benchmark` additionally times every candidate against a live session
+(`make_driver()` from mobile_utils/session.py) on the screen open right now.
+
+Run from repository root:
+    python -m tools.locator_optimizer
+    python -m tools.locator_optimizer --target "Hotspot" --out artifacts/locator_map.json
+    python -m tools.locator_optimizer --benchmark --repeats 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from mobile_pages.base_page import BasePage, _ui_string
+from mobile_pages.screen_classifier import MIN_SCORE, classify
+from mobile_utils.ui_snapshot import UiNode, UiSnapshot
+from tools.find_ids_in_xml import list_dumps, open_xml
+
+if TYPE_CHECKING:
+    from appium.webdriver.webdriver import WebDriver
+
+ARTIFACTS = Path("artifacts")
+DEFAULT_OUT = ARTIFACTS / "locator_map.json"
+
+# Strategies ordered from fastest to slowest lookup on UiAutomator2
+STRATEGIES = ("accessibility id", "id", "id+text", "text", "textContains")
+
+
+@dataclass(frozen=True)
+class Locator:
+    """Candidate locator in Appium terms (by, value) plus its snapshot query."""
+
+    strategy: str
+    by: str
+    value: str
+    # Same lookup on a UiSnapshot: keyword arguments of UiSnapshot.find_all
+    criteria: tuple[tuple[str, str], ...]
+
+    def count(self, snapshot: UiSnapshot) -> int:
+        """How many elements of the dump the locator would match."""
+        return len(snapshot.find_all(**dict(self.criteria)))
+
+
+def _selector(**parts: str) -> str:
+    calls = "".join(f'.{name}("{_ui_string(value)}")' for name, value in parts.items())
+    return f"new UiSelector(){calls}"
+
+
+def candidates(node: UiNode, target: str) -> list[Locator]:
+    """Candidate locators for `node`, fastest strategy first."""
+    result = []
+    if node.content_desc:
+        result.append(Locator(
+            "accessibility id", "accessibility id", node.content_desc,
+            (("content_desc", node.content_desc),),
+        ))
+    if node.resource_id:
+        result.append(Locator("id", "id", node.resource_id, (("resource_id", node.resource_id),)))
+        if node.text:
+            result.append(Locator(
+                "id+text", "-android uiautomator",
+                _selector(resourceId=node.resource_id, text=node.text),
+                (("resource_id", node.resource_id), ("text", node.text)),
+            ))
+    if node.text:
+        result.append(Locator(
+            "text", "-android uiautomator", _selector(text=node.text), (("text", node.text),)
+        ))
+    result.append(Locator(
+        "textContains", "-android uiautomator", _selector(textContains=target),
+        (("text_contains", target),),
+    ))
+    return result
+
+
+def find_target_node(snapshot: UiSnapshot, target: str) -> UiNode | None:
+    """Element the page object means by `target`: exact label first, then contains."""
+    return (
+        snapshot.find(text=target)
+        or snapshot.find(content_desc=target)
+        or snapshot.find(text_contains=target)
+        or next((n for n in snapshot if target in n.content_desc), None)
+    )
+
+
+def page_targets(page: type[BasePage], extra: Iterable[str]) -> list[str]:
+    targets = list(page.ANCHORS)
+    if page.TITLE:
+        targets.append(page.TITLE)
+    targets.extend(extra)
+    return list(dict.fromkeys(targets))
+
+
+def load_snapshots(artifacts_dir: Path) -> list[tuple[Path, UiSnapshot]]:
+    snapshots = []
+    for path in list_dumps(artifacts_dir):
+        with open_xml(path) as f:
+            snapshots.append((path, UiSnapshot.from_source(f.read().decode("utf-8"))))
+    return snapshots
+
+
+def optimize(
+    snapshots: list[tuple[Path, UiSnapshot]],
+    extra_targets: Iterable[str] = (),
+) -> dict[str, dict[str, dict]]:
+    """
+    Build locator map {page: {target: {strategy, by, value, dumps}}}.
+
+    Only dumps recognized as the page's screen are used for that page.
+    """
+    by_page: dict[type[BasePage], list[UiSnapshot]] = defaultdict(list)
+    for _, snap in snapshots:
+        matches = classify(snap)
+        if matches and matches[0].score >= MIN_SCORE:
+            by_page[matches[0].page].append(snap)
+
+    extra_targets = list(extra_targets)
+    result: dict[str, dict[str, dict]] = {}
+    for page, snaps in by_page.items():
+        page_map: dict[str, dict] = {}
+        for target in page_targets(page, extra_targets):
+            # Candidate locators from every dump where the target is present
+            present = [(s, find_target_node(s, target)) for s in snaps]
+            present = [(s, n) for s, n in present if n is not None]
+            if not present:
+                continue
+            options: list[Locator] = []
+            for _, node in present:
+                for loc in candidates(node, target):
+                    if loc not in options:
+                        options.append(loc)
+            options.sort(key=lambda loc: STRATEGIES.index(loc.strategy))
+            for loc in options:
+                if all(loc.count(s) == 1 for s, _ in present):
+                    page_map[target] = {
+                        "strategy": loc.strategy,
+                        "by": loc.by,
+                        "value": loc.value,
+                        "dumps": len(present),
+                    }
+                    break
+        if page_map:
+            result[page.__name__] = page_map
+    return result
+
+
+def benchmark(
+    driver: "WebDriver",
+    snapshot: UiSnapshot,
+    targets: Iterable[str],
+    repeats: int = 5,
+) -> list[tuple[str, str, float, int]]:
+    """
+    Time every candidate locator on the current screen.
+
+    Works with any driver: live Appium session or a replayed one.
+
+    Returns:
+        (target, strategy, median ms, number of matched elements)
+    """
+    rows = []
+    for target in targets:
+        node = find_target_node(snapshot, target)
+        if node is None:
+            continue
+        for loc in candidates(node, target):
+            timings, found = [], 0
+            for _ in range(repeats):
+                started = time.perf_counter()
+                found = len(driver.find_elements(loc.by, loc.value))
+                timings.append((time.perf_counter() - started) * 1000)
+            rows.append((target, loc.strategy, statistics.median(timings), found))
+    return rows
+
+
+def parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Suggest the cheapest unique locators from UI dumps")
+    parser.add_argument("--artifacts", default=str(ARTIFACTS), help="folder with UI dumps")
+    parser.add_argument("--out", default=str(DEFAULT_OUT), help="where to write the locator map")
+    parser.add_argument("--target", action="append", default=[], help="extra text to locate")
+    parser.add_argument("--benchmark", action="store_true", help="time candidates on a live session")
+    parser.add_argument("--repeats", type=int, default=5, help="lookups per candidate in benchmark")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    snapshots = load_snapshots(Path(args.artifacts))
+    locator_map = optimize(snapshots, args.target)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(locator_map, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"[OK] dumps: {len(snapshots)}, locator map: {out}")
+    for page, targets in locator_map.items():
+        print(page)
+        for target, loc in targets.items():
+            print(f"    {target!r:28} {loc['strategy']:17} {loc['value']}")
+
+    if not args.benchmark:
+        return
+
+    # Live session is created the same way as in mobile tests
+    from mobile_utils.session import make_driver
+
+    driver = make_driver()
+    try:
+        snapshot = UiSnapshot.from_driver(driver)
+        matches = classify(snapshot)
+        targets = page_targets(matches[0].page, args.target) if matches else args.target
+        print(f"\n[BENCHMARK] screen: {matches[0].page.__name__ if matches else 'unknown'}")
+        for target, strategy, ms, found in benchmark(driver, snapshot, targets, args.repeats):
+            print(f"    {target!r:28} {strategy:17} {ms:8.1f} ms  found={found}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
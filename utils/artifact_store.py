@@ -0,0 +1,205 @@
+"""Content-addressed store for test artifacts.
+
+Layout inside the artifacts folder:
+- `blobs/ab/abcdef....png` — screenshots, file name is SHA-256 of content;
+- `blobs/12/1234....xml.gz` — page sources, compressed with gzip;
+- `manifest.jsonl` — one line per saved artifact: test id, step, kind, blob.
+
+Identical screenshots / dumps are stored once (near-identical failures of
+the same screen are very common), file names never collide between
+parallel workers, and retention limits by total size and age keep disk
+usage flat on long CI soaks.
+
+Configuration (environment variables):
+- ARTIFACT_MAX_MB — total size limit of blobs (default 500);
+- ARTIFACT_MAX_AGE_DAYS — manifest entries older than this are dropped (default 14).
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from utils.nodeids import base_nodeid
+
+# Text formats are compressed; PNG is already compressed
+COMPRESSED_KINDS = {"xml", "html", "json", "txt"}
+
+MANIFEST_NAME = "manifest.jsonl"
+BLOBS_DIR = "blobs"
+
+
+@dataclass
+class ManifestEntry:
+    """One saved artifact: which test/step produced which blob."""
+
+    ts: float
+    test: str
+    step: str
+    kind: str
+    sha256: str
+    blob: str  # path relative to store root
+    size: int  # size of original (uncompressed) content
+    written: int = 0  # bytes written to disk by this put (0 if the blob already existed)
+
+
+def current_test_id() -> str:
+    """Id of the running pytest test, e.g. `tests/mobile/test_x.py::test_y`."""
+    current = os.getenv("PYTEST_CURRENT_TEST", "")
+    # Value looks like "path::name (call)" - drop the phase and the xdist group suffix
+    return base_nodeid(current.rsplit(" (", 1)[0])
+
+
+class ArtifactStore:
+    """Deduplicating, compressing artifact storage with retention limits."""
+
+    def __init__(
+        self,
+        root: str | Path = "artifacts",
+        max_bytes: int | None = None,
+        max_age_days: float | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = (
+            max_bytes if max_bytes is not None
+            else int(float(os.getenv("ARTIFACT_MAX_MB", "500")) * 1024 * 1024)
+        )
+        self.max_age_days = (
+            max_age_days if max_age_days is not None
+            else float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "14"))
+        )
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._lock = threading.Lock()
+
+    # ====== Writing ======
+
+    def blob_path(self, sha256: str, kind: str) -> Path:
+        suffix = f".{kind}.gz" if kind in COMPRESSED_KINDS else f".{kind}"
+        return self.root / BLOBS_DIR / sha256[:2] / f"{sha256}{suffix}"
+
+    def put(self, data: bytes | str, kind: str, test: str = "", step: str = "") -> ManifestEntry:
+        """
+        Store content (once per unique hash) and record it in the manifest.
+
+        Args:
+            data: File content
+            kind: File type / extension: "png", "xml", "html", ...
+            test: Test id (current pytest test by default)
+            step: Step name within the test (e.g. "settings_fail")
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha256, kind)
+        written = 0
+        if not path.exists():
+            content = gzip.compress(data, mtime=0) if kind in COMPRESSED_KINDS else data
+            self._write_atomic(path, content)
+            written = len(content)
+        entry = ManifestEntry(
+            ts=time.time(),
+            test=test or current_test_id(),
+            step=step,
+            kind=kind,
+            sha256=sha256,
+            blob=path.relative_to(self.root).as_posix(),
+            size=len(data),
+            written=written,
+        )
+        self._append_manifest(entry)
+        return entry
+
+    @staticmethod
+    def _write_atomic(path: Path, content: bytes) -> None:
+        # Parallel workers may store the same blob: write to temp file, then rename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _append_manifest(self, entry: ManifestEntry) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(asdict(entry), ensure_ascii=False) + "\n"
+        with self._lock, open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    # ====== Reading ======
+
+    def entries(self) -> list[ManifestEntry]:
+        """All manifest entries, oldest first."""
+        if not self.manifest_path.exists():
+            return []
+        result = []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    result.append(ManifestEntry(**json.loads(line)))
+        return result
+
+    def read(self, entry: ManifestEntry) -> bytes:
+        """Original (decompressed) content of the artifact."""
+        data = (self.root / entry.blob).read_bytes()
+        return gzip.decompress(data) if entry.blob.endswith(".gz") else data
+
+    # ====== Retention ======
+
+    def enforce_retention(self, now: float | None = None) -> int:
+        """
+        Apply age and size limits; returns number of deleted blobs.
+
+        Entries older than `max_age_days` are dropped first. If blobs still
+        take more than `max_bytes`, the oldest entries are dropped until the
+        limit is met. Blobs no longer referenced by the manifest are deleted.
+        """
+        now = now or time.time()
+        min_ts = now - self.max_age_days * 86400
+        entries = [e for e in self.entries() if e.ts >= min_ts]
+
+        def blob_size(blob: str) -> int:
+            try:
+                return (self.root / blob).stat().st_size
+            except FileNotFoundError:
+                return 0
+
+        sizes = {e.blob: blob_size(e.blob) for e in entries}
+        total = sum(sizes.values())
+        # Drop oldest entries while over the size limit
+        while entries and total > self.max_bytes:
+            dropped = entries.pop(0)
+            if all(e.blob != dropped.blob for e in entries):
+                total -= sizes.pop(dropped.blob, 0)
+
+        self._rewrite_manifest(entries)
+        keep = {e.blob for e in entries}
+        removed = 0
+        blobs_root = self.root / BLOBS_DIR
+        if blobs_root.exists():
+            for path in blobs_root.rglob("*"):
+                if path.is_file() and path.relative_to(self.root).as_posix() not in keep:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+    def _rewrite_manifest(self, entries: list[ManifestEntry]) -> None:
+        content = "".join(json.dumps(asdict(e), ensure_ascii=False) + "\n" for e in entries)
+        with self._lock:
+            self._write_atomic(self.manifest_path, content.encode("utf-8"))
+
+    def disk_usage(self) -> int:
+        """Total size of stored blobs in bytes."""
+        blobs_root = self.root / BLOBS_DIR
+        if not blobs_root.exists():
+            return 0
+        return sum(p.stat().st_size for p in blobs_root.rglob("*") if p.is_file())
@@ -0,0 +1,230 @@
+"""Background writer for test artifacts (screenshots, page sources).
+
+Capturing must happen right away (the screen is about to change), but
+decoding the screenshot and writing files to disk do not have to block
+the test. `save_artifacts` grabs the raw data and hands it to a worker
+thread through a bounded queue:
+- when the queue is full, the test waits (backpressure) instead of
+  piling up unlimited data in memory;
+- everything is flushed at the end of the pytest session;
+- queue depth and write throughput are reported in the terminal summary.
+
+Files go to the content-addressed store (see utils.artifact_store).
+
+Works for any Selenium-compatible driver: Appium (`driver`) and Chrome (`browser`).
+"""
+from __future__ import annotations
+
+import base64
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Union
+
+from utils.artifact_store import ArtifactStore, current_test_id
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Data to write: ready bytes/text, or a function producing bytes in the worker
+Payload = Union[bytes, str, Callable[[], bytes]]
+
+# Maximum number of pending files before save_artifacts starts waiting
+QUEUE_SIZE = int(os.getenv("ARTIFACT_QUEUE_SIZE", "16"))
+
+
+@dataclass
+class WriterStats:
+    """Counters of the artifact writer."""
+
+    submitted: int = 0
+    written: int = 0
+    failed: int = 0
+    bytes_written: int = 0
+    write_seconds: float = 0.0
+    max_queue_depth: int = 0
+    # Time tests spent waiting because the queue was full
+    blocked_seconds: float = 0.0
+
+    @property
+    def throughput_mb_s(self) -> float:
+        if not self.write_seconds:
+            return 0.0
+        return self.bytes_written / self.write_seconds / 1024 / 1024
+
+
+class ArtifactWriter:
+    """Writes files on a background thread fed by a bounded queue."""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE) -> None:
+        self._queue: "queue.Queue[tuple[str, Callable[[], int]] | None]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self.stats = WriterStats()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str | Path, payload: Payload) -> Path:
+        """
+        Queue file for writing and return its path immediately.
+
+        Blocks only while the queue is full (backpressure).
+        """
+        path = Path(path)
+
+        def job() -> int:
+            data = payload() if callable(payload) else payload
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            return len(data)
+
+        self.submit_job(job, label=str(path))
+        return path
+
+    def submit_job(self, job: Callable[[], int], label: str = "") -> None:
+        """
+        Queue arbitrary write job; it returns the number of bytes written.
+
+        Blocks only while the queue is full (backpressure).
+        """
+        started = time.perf_counter()
+        self._queue.put((label or getattr(job, "__name__", "job"), job))
+        blocked = time.perf_counter() - started
+        with self._lock:
+            self.stats.submitted += 1
+            self.stats.blocked_seconds += blocked
+            self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue.qsize())
+
+    def flush(self) -> None:
+        """Wait until all queued files are written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending files and stop the worker thread."""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._execute(*item)
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, label: str, job: Callable[[], int]) -> None:
+        started = time.perf_counter()
+        try:
+            size = job()
+        except Exception as e:
+            # Artifacts are diagnostics: never break the run because of them
+            with self._lock:
+                self.stats.failed += 1
+            print(f"[ARTIFACT] failed to write {label}: {e!r}")
+            return
+        with self._lock:
+            self.stats.written += 1
+            self.stats.bytes_written += size
+            self.stats.write_seconds += time.perf_counter() - started
+
+
+_writer: ArtifactWriter | None = None
+_writer_lock = threading.Lock()
+# Stores used during the run, by root folder
+_stores: dict[Path, ArtifactStore] = {}
+
+
+def get_writer() -> ArtifactWriter:
+    """Shared writer of the process (started on first use)."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ArtifactWriter()
+        return _writer
+
+
+def get_store(root: str | Path) -> ArtifactStore:
+    """Shared store for the given artifacts folder."""
+    root = Path(root)
+    with _writer_lock:
+        if root not in _stores:
+            _stores[root] = ArtifactStore(root)
+        return _stores[root]
+
+
+def used_stores() -> list[ArtifactStore]:
+    """Stores that received artifacts during this run."""
+    with _writer_lock:
+        return list(_stores.values())
+
+
+def shutdown_writer() -> WriterStats | None:
+    """Flush and stop shared writer; returns its stats (None if never used)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is None:
+        return None
+    writer.close()
+    return writer.stats
+
+
+def capture_artifacts(
+    driver: "WebDriver",
+    directory: Path,
+    prefix: str,
+    source_ext: str,
+    writer: ArtifactWriter | None = None,
+) -> str:
+    """
+    Capture screenshot and page source now, store them in the background.
+
+    Args:
+        driver: Appium or Selenium WebDriver session
+        directory: Artifacts folder (root of the content-addressed store)
+        prefix: Step name recorded in the manifest (e.g., "FAILED" or "settings_ok")
+        source_ext: Kind of page source ("xml" for Android, "html" for web)
+        writer: Writer to use (shared writer by default)
+
+    Returns:
+        Captured page source
+    """
+    writer = writer or get_writer()
+    store = get_store(directory)
+    # Test id must be taken now: the worker runs when the next test is active
+    test = current_test_id()
+
+    # Capture synchronously: both must show the current screen
+    screenshot_b64 = driver.get_screenshot_as_base64()
+    page_source = driver.page_source
+
+    # Base64 decoding, hashing, compression and disk writes happen on the writer thread
+    writer.submit_job(
+        lambda: store.put(base64.b64decode(screenshot_b64), "png", test, prefix).written,
+        label=f"{prefix}.png",
+    )
+    writer.submit_job(
+        lambda: store.put(page_source, source_ext, test, prefix).written,
+        label=f"{prefix}.{source_ext}",
+    )
+
+    print(f"[ARTIFACT] screenshot + page_source ({prefix}) -> {store.manifest_path}")
+    return page_source
+
+
+def summary_lines(stats: WriterStats) -> list[str]:
+    """Build lines for the pytest terminal summary."""
+    return [
+        f"files: {stats.written} written, {stats.failed} failed, "
+        f"{stats.bytes_written / 1024 / 1024:.2f} MB",
+        f"write throughput: {stats.throughput_mb_s:.1f} MB/s, "
+        f"max queue depth: {stats.max_queue_depth}, "
+        f"tests blocked by full queue: {stats.blocked_seconds:.3f}s",
+    ]
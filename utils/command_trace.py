@@ -0,0 +1,226 @@
+"""Per-command WebDriver instrumentation and round-trip budgets.
+
+Every Selenium / Appium command goes through `driver.execute(command, params)`.
+`CommandTracer.instrument(driver)` wraps that method on the driver instance
+and records each command:
+- name, short summary of arguments, latency, success / exception type;
+- test id and pytest phase (setup / call / teardown);
+- step: the outermost page object method on the call stack
+  (e.g. `SettingsMainPage.open_network_and_internet`), so commands hidden
+  in probe loops and WebDriverWait polls are attributed to the page action.
+
+`@pytest.mark.max_commands(n)` fails a test that sends more than `n`
+commands during its call phase (see root conftest.py).
+
+WEBDRIVER_TRACE=artifacts/command_trace.json writes all records as a
+trace-event file (open in chrome://tracing or https://ui.perfetto.dev).
+
+Works for any Selenium-compatible driver: Appium (`driver`), Chrome (`browser`)
+and the offline ReplayDriver.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Modules with page objects: their methods become step names
+STEP_MODULES = ("mobile_pages.", "pages.")
+# Frames of these modules are never used as a step name
+_SKIP_MODULES = (
+    "selenium.", "appium.", "urllib3.", "utils.command_trace", "utils.step_timing", "mobile_utils.replay_driver",
+)
+
+ARGS_SUMMARY_LEN = 120
+
+
+@dataclass
+class CommandRecord:
+    """One WebDriver command."""
+
+    test: str
+    phase: str
+    step: str
+    command: str
+    args: str
+    started: float  # seconds since tracer start
+    duration_ms: float
+    ok: bool
+    error: str = ""
+
+
+def summarize_args(params: dict | None) -> str:
+    """Short human readable view of command parameters."""
+    if not params:
+        return ""
+    parts = []
+    for key, value in params.items():
+        if key == "sessionId":
+            continue
+        if key == "args" and isinstance(value, list):
+            # Script arguments may contain whole elements / large dicts
+            value = [v if isinstance(v, (str, int, float, bool, dict)) else type(v).__name__ for v in value]
+        parts.append(f"{key}={value!r}")
+    text = ", ".join(parts)
+    return text if len(text) <= ARGS_SUMMARY_LEN else text[: ARGS_SUMMARY_LEN - 3] + "..."
+
+
+def caller_step(frame=None) -> str:
+    """
+    Name of the page object action that issued the command.
+
+    The outermost page object frame wins (`open_internet` rather than the
+    `find_by_id_and_text` it calls). Without page objects on the stack the
+    nearest non-library function is used (a test or a fixture helper).
+    """
+    frame = frame or sys._getframe(1)
+    step = ""
+    fallback = ""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_SKIP_MODULES):
+            code = frame.f_code
+            if module.startswith(STEP_MODULES):
+                owner = frame.f_locals.get("self") if code.co_argcount and code.co_varnames[0] == "self" else None
+                step = f"{type(owner).__name__}.{code.co_name}" if owner is not None else f"{module}.{code.co_name}"
+            elif not fallback:
+                fallback = code.co_name
+        frame = frame.f_back
+    return step or fallback
+
+
+class CommandTracer:
+    """Collects command records of all instrumented drivers of the process."""
+
+    def __init__(self) -> None:
+        self.records: list[CommandRecord] = []
+        self.test = ""
+        self.phase = ""
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def begin(self, test: str, phase: str) -> None:
+        """Attribute following commands to `test` / `phase`."""
+        self.test, self.phase = test, phase
+
+    def instrument(self, driver: T) -> T:
+        """Wrap `driver.execute` (once per driver) and return the driver."""
+        if getattr(driver, "_command_tracer", None) is self:
+            return driver
+        original = driver.execute
+
+        def execute(driver_command: str, params: dict | None = None):
+            started = time.perf_counter()
+            error = ""
+            try:
+                return original(driver_command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self._add(driver_command, params, started, error)
+
+        driver.execute = execute  # type: ignore[method-assign]
+        driver._command_tracer = self  # type: ignore[attr-defined]
+        return driver
+
+    def _add(self, command: str, params: dict | None, started: float, error: str) -> None:
+        record = CommandRecord(
+            test=self.test,
+            phase=self.phase,
+            step=caller_step(sys._getframe(2)),
+            command=command,
+            args=summarize_args(params),
+            started=started - self._t0,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            ok=not error,
+            error=error,
+        )
+        with self._lock:
+            self.records.append(record)
+
+    # ====== Queries ======
+
+    def for_test(self, test: str, phase: str | None = None) -> list[CommandRecord]:
+        with self._lock:
+            return [r for r in self.records if r.test == test and (phase is None or r.phase == phase)]
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Per test: command count, failed commands, total ms, counts by step and command."""
+        result: dict[str, dict[str, Any]] = defaultdict(
+            lambda: {"commands": 0, "failed": 0, "ms": 0.0, "steps": Counter(), "by_command": Counter()}
+        )
+        with self._lock:
+            records = list(self.records)
+        for r in records:
+            item = result[r.test or "<no test>"]
+            item["commands"] += 1
+            item["failed"] += not r.ok
+            item["ms"] += r.duration_ms
+            item["steps"][r.step] += 1
+            item["by_command"][r.command] += 1
+        return {test: {**v, "ms": round(v["ms"], 1)} for test, v in result.items()}
+
+    # ====== Output ======
+
+    def write_trace(self, path: str | Path) -> Path:
+        """Write records in Chrome trace-event format, one lane (tid) per test."""
+        path = Path(path)
+        with self._lock:
+            records = list(self.records)
+        tests = list(dict.fromkeys(r.test for r in records))
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": test or "<no test>"}}
+            for tid, test in enumerate(tests)
+        ]
+        for r in records:
+            events.append({
+                "name": r.command,
+                "cat": r.phase,
+                "ph": "X",
+                "ts": round(r.started * 1e6),
+                "dur": round(r.duration_ms * 1000),
+                "pid": pid,
+                "tid": tests.index(r.test),
+                "args": {k: v for k, v in asdict(r).items() if k in ("step", "args", "ok", "error")},
+            })
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": events, "summary": self.summary()}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        return path
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        """Lines for the pytest terminal summary: tests with most commands."""
+        summary = self.summary()
+        lines = []
+        for test, item in sorted(summary.items(), key=lambda kv: -kv[1]["commands"])[:top]:
+            steps = ", ".join(f"{step or '-'}: {n}" for step, n in item["steps"].most_common(3))
+            lines.append(
+                f"{item['commands']:5d} cmds ({item['failed']} failed) {item['ms']:9.1f} ms  {test}  [{steps}]"
+            )
+        return lines
+
+
+# Shared tracer of the process (one per xdist worker)
+TRACER = CommandTracer()
+
+
+def trace_path() -> Path | None:
+    """Trace file from WEBDRIVER_TRACE; xdist workers get their own file."""
+    value = os.getenv("WEBDRIVER_TRACE")
+    if not value:
+        return None
+    path = Path(value)
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    return path.with_name(f"{path.stem}_{worker}{path.suffix}") if worker else path
@@ -0,0 +1,20 @@
+"""Pytest node id helpers shared by the artifact store and the scheduler.
+
+With `--dist loadgroup` pytest-xdist appends the group to the node id
+(`tests/x.py::test_y@lpt0`); stored artifacts and durations are keyed by
+the plain node id.
+"""
+from __future__ import annotations
+
+
+def split_group(nodeid: str) -> tuple[str, str]:
+    """(node id, xdist group) of a node id with the `@group` suffix that --dist loadgroup adds."""
+    head, sep, group = nodeid.rpartition("@")
+    # "@" inside parameters (test[user@example.com]) is not a group suffix
+    if not sep or "]" in group or "::" in group:
+        return nodeid, ""
+    return head, group
+
+
+def base_nodeid(nodeid: str) -> str:
+    return split_group(nodeid)[0]
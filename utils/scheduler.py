@@ -0,0 +1,175 @@
+"""Duration-aware distribution of tests over pytest-xdist workers.
+
+pytest-xdist `--dist load` hands out tests in collection order; a slow Appium
+test that starts last keeps one worker busy while the others are idle.
+With DURATION_SCHEDULE=1 (see root conftest.py):
+- past per-test durations are read from TEST_DURATIONS
+  (default artifacts/test_durations.json, updated after every run);
+  unknown tests get the median of their suite (folder) or DEFAULT_ESTIMATE;
+- tests with the same `@pytest.mark.shared_setup(name)` (same app and
+  starting screen) form one unit that stays on one worker;
+- units are assigned longest-first to the least loaded worker (LPT), each
+  worker's share becomes an `xdist_group` and `--dist load` is switched to
+  `loadgroup`; inside a worker tests run longest-first;
+- the predicted makespan (the busiest worker) is reported next to the
+  actual per-worker busy time.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from utils.nodeids import base_nodeid, split_group
+
+DEFAULT_DURATIONS = "artifacts/test_durations.json"
+# Estimate (seconds) for a test of a suite without any known durations
+DEFAULT_ESTIMATE = 1.0
+# Weight of the newest run in the stored duration (moving average)
+DURATION_SMOOTHING = 0.5
+# xdist_group name prefix of worker shares
+GROUP_PREFIX = "lpt"
+
+
+def suite_of(nodeid: str) -> str:
+    """Folder of the test file: tests/mobile, tests/web, ..."""
+    return base_nodeid(nodeid).split("::", 1)[0].rsplit("/", 1)[0]
+
+
+class DurationStore:
+    """Smoothed duration of every test from previous runs."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path or os.getenv("TEST_DURATIONS", DEFAULT_DURATIONS))
+        self.durations: dict[str, float] = {}
+        if self.path.exists():
+            self.durations = json.loads(self.path.read_text(encoding="utf-8"))
+        self._suite_medians: dict[str, float] | None = None
+
+    def estimate(self, nodeid: str) -> float:
+        nodeid = base_nodeid(nodeid)
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self._suite_medians is None:
+            by_suite: dict[str, list[float]] = defaultdict(list)
+            for known, seconds in self.durations.items():
+                by_suite[suite_of(known)].append(seconds)
+            self._suite_medians = {suite: statistics.median(v) for suite, v in by_suite.items()}
+        return self._suite_medians.get(suite_of(nodeid), DEFAULT_ESTIMATE)
+
+    def update(self, measured: dict[str, float]) -> None:
+        for nodeid, seconds in measured.items():
+            old = self.durations.get(nodeid)
+            self.durations[nodeid] = seconds if old is None else (
+                (1 - DURATION_SMOOTHING) * old + DURATION_SMOOTHING * seconds
+            )
+        self._suite_medians = None
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rounded = {k: round(v, 3) for k, v in sorted(self.durations.items())}
+        self.path.write_text(json.dumps(rounded, indent=1, ensure_ascii=False), encoding="utf-8")
+
+
+@dataclass
+class Plan:
+    """Tests of every worker (longest first) and predicted busy time."""
+
+    bins: list[list[str]]
+    loads: list[float]
+    estimates: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def makespan(self) -> float:
+        return max(self.loads, default=0.0)
+
+    def group_of(self) -> dict[str, str]:
+        """Node id -> xdist_group name."""
+        return {nodeid: f"{GROUP_PREFIX}{i}" for i, tests in enumerate(self.bins) for nodeid in tests}
+
+
+def make_plan(
+    tests: Iterable[tuple[str, str | None]],
+    store: DurationStore,
+    workers: int,
+) -> Plan:
+    """
+    Longest processing time first: biggest unit to the least loaded worker.
+
+    Args:
+        tests: (node id, shared setup key or None) in collection order
+        store: Past durations
+        workers: Number of workers
+    """
+    workers = max(1, workers)
+    units: dict[str, list[str]] = defaultdict(list)
+    for nodeid, setup_key in tests:
+        units[f"setup:{setup_key}" if setup_key else nodeid].append(nodeid)
+    estimates = {nodeid: store.estimate(nodeid) for members in units.values() for nodeid in members}
+
+    # Stable order for equal durations: collection order
+    ordered = sorted(units.values(), key=lambda members: -sum(estimates[n] for n in members))
+    bins: list[list[str]] = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    heap = [(0.0, i) for i in range(workers)]
+    for members in ordered:
+        load, i = heapq.heappop(heap)
+        bins[i].extend(members)
+        loads[i] = load + sum(estimates[n] for n in members)
+        heapq.heappush(heap, (loads[i], i))
+    for tests_of_worker in bins:
+        tests_of_worker.sort(key=lambda n: -estimates[n])
+    return Plan(bins, loads, estimates)
+
+
+def predicted_loads(nodeids: Iterable[str], store: DurationStore) -> dict[str, float]:
+    """Predicted busy time per xdist group from collected node ids (`...@lpt0`)."""
+    loads: dict[str, float] = defaultdict(float)
+    for nodeid in nodeids:
+        loads[split_group(nodeid)[1] or "-"] += store.estimate(nodeid)
+    return dict(loads)
+
+
+class ScheduleReport:
+    """Measured durations of this run: per test and per worker."""
+
+    def __init__(self) -> None:
+        self.tests: dict[str, float] = defaultdict(float)
+        self.workers: dict[str, float] = defaultdict(float)
+        self.predicted: dict[str, float] = {}
+        # Tests whose body ran (skipped tests would teach a wrong duration)
+        self.ran: set[str] = set()
+
+    def add(self, nodeid: str, worker: str, seconds: float, ran: bool = True) -> None:
+        """Add duration of one phase (setup / call / teardown) of a test."""
+        nodeid = base_nodeid(nodeid)
+        self.tests[nodeid] += seconds
+        self.workers[worker] += seconds
+        if ran:
+            self.ran.add(nodeid)
+
+    def measured(self) -> dict[str, float]:
+        """Total duration of every test that ran."""
+        return {nodeid: seconds for nodeid, seconds in self.tests.items() if nodeid in self.ran}
+
+    def summary_lines(self, wall: float | None = None) -> list[str]:
+        if not self.workers:
+            return []
+        lines = []
+        if self.predicted:
+            loads = ", ".join(f"{g} {s:.1f}s" for g, s in sorted(self.predicted.items()))
+            lines.append(f"predicted makespan {max(self.predicted.values()):.1f}s  [{loads}]")
+        busy = ", ".join(f"{w} {s:.1f}s" for w, s in sorted(self.workers.items()))
+        lines.append(f"actual makespan    {max(self.workers.values()):.1f}s  [{busy}]")
+        if wall is not None:
+            lines.append(f"wall time          {wall:.1f}s")
+        return lines
+
+
+def schedule_enabled() -> bool:
+    return os.getenv("DURATION_SCHEDULE", "0") == "1"
@@ -0,0 +1,327 @@
+"""Per-step timing history of page object methods and regression detection.
+
+Every public method of a page object (`SettingsMainPage.open_network_and_internet`,
+`FormPage.submit`, ...) is timed by the `timed_steps` class decorator
+(mobile page objects get it through BasePage). A step is named after the
+page object class and the method, as in command traces. Only calls on real
+WebDriver sessions (Selenium / Appium) are recorded: offline tests drive the
+same page objects with fake and replay drivers, and their timings would
+pollute the history the percentiles are computed from.
+
+At the end of the session (see root conftest.py):
+- the durations of this run are appended to a JSONL history
+  (one line per call: run, target, step, seconds, ok);
+- p50 / p95 per step and per target (device udid or browser name + version)
+  are compared with the previous runs;
+- steps whose p95 grew by more than the threshold are flagged in the
+  "step timings" terminal section and in a JSON report.
+
+Configuration (environment variables):
+- STEP_HISTORY — history file (default artifacts/step_history.jsonl, "0" disables);
+- STEP_REPORT — JSON report (default artifacts/step_report.json);
+- STEP_REGRESSION_THRESHOLD — allowed p95 growth, share (default 0.25 = +25%);
+- STEP_HISTORY_RUNS — how many runs the history keeps (default 20).
+"""
+from __future__ import annotations
+
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, TypeVar
+
+from utils.artifact_store import current_test_id
+
+C = TypeVar("C", bound=type)
+
+DEFAULT_HISTORY = "artifacts/step_history.jsonl"
+DEFAULT_REPORT = "artifacts/step_report.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_KEEP_RUNS = 20
+# Slowdowns smaller than this are noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.1
+# Fewer samples than this (in the run or in the history) are not compared
+MIN_SAMPLES = 3
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty one)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def is_session_driver(driver: Any) -> bool:
+    """Whether `driver` is a real Selenium / Appium WebDriver (not a fake or replay driver)."""
+    # Looked up in sys.modules: if Selenium WebDriver was never imported, no session exists
+    remote = sys.modules.get("selenium.webdriver.remote.webdriver")
+    return remote is not None and isinstance(driver, remote.WebDriver)
+
+
+def target_of(driver: Any) -> str:
+    """Device or browser the step ran on, from session capabilities (no round trip)."""
+    caps = getattr(driver, "capabilities", None) or {}
+    udid = caps.get("udid") or caps.get("appium:udid") or caps.get("deviceName") or caps.get("appium:deviceName")
+    if udid:
+        return f"android:{udid}"
+    browser = caps.get("browserName")
+    if browser:
+        version = str(caps.get("browserVersion", "")).split(".")[0]
+        return f"{browser} {version}".strip()
+    return type(driver).__name__ if driver is not None else "unknown"
+
+
+@dataclass
+class StepRecord:
+    """One page object method call."""
+
+    test: str
+    step: str
+    target: str
+    seconds: float
+    ok: bool
+
+
+class StepTimer:
+    """Collects step durations of the process."""
+
+    def __init__(self) -> None:
+        self.records: list[StepRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, step: str, target: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.records.append(StepRecord(current_test_id(), step, target, seconds, ok))
+
+    def take(self) -> list[StepRecord]:
+        """Return and forget collected records."""
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+
+# Shared timer of the process (one per xdist worker)
+STEP_TIMER = StepTimer()
+
+
+def timed_steps(cls: C) -> C:
+    """Class decorator: time every public method defined in the class body."""
+    for name, value in list(vars(cls).items()):
+        # Plain functions only: properties, static and class methods are left as is
+        if name.startswith("_") or not isinstance(value, types.FunctionType):
+            continue
+        if getattr(value, "_timed_step", False):
+            continue
+        setattr(cls, name, _timed(value))
+    return cls
+
+
+def _timed(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        driver = getattr(self, "driver", None)
+        if not is_session_driver(driver):
+            return method(self, *args, **kwargs)
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = method(self, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            STEP_TIMER.record(
+                f"{type(self).__name__}.{method.__name__}",
+                target_of(driver),
+                time.perf_counter() - started,
+                ok,
+            )
+
+    wrapper._timed_step = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+# ====== History ======
+
+
+class StepHistory:
+    """JSONL history of step durations, one line per call."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def append(self, run_id: str, records: Iterable[StepRecord], ts: float | None = None) -> int:
+        ts = ts or time.time()
+        lines = [
+            json.dumps({"run": run_id, "ts": round(ts, 3), **asdict(r), "seconds": round(r.seconds, 4)},
+                       ensure_ascii=False)
+            for r in records
+        ]
+        if not lines:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One write per process: lines of parallel workers do not interleave
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return len(lines)
+
+    def rows(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def compact(self, keep_runs: int) -> None:
+        """Keep only the rows of the last `keep_runs` runs."""
+        rows = self.rows()
+        first_ts: dict[str, float] = {}
+        for row in rows:
+            first_ts.setdefault(row["run"], row["ts"])
+        if len(first_ts) <= keep_runs:
+            return
+        keep = set(sorted(first_ts, key=first_ts.get)[-keep_runs:])
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows if r["run"] in keep),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# ====== Analysis ======
+
+
+@dataclass
+class StepStats:
+    """Latency of one step on one target: this run vs previous runs."""
+
+    target: str
+    step: str
+    calls: int
+    failed: int
+    p50: float
+    p95: float
+    baseline_calls: int = 0
+    baseline_p50: float | None = None
+    baseline_p95: float | None = None
+    regressed: bool = False
+
+    @property
+    def growth(self) -> float | None:
+        if not self.baseline_p95:
+            return None
+        return self.p95 / self.baseline_p95 - 1
+
+
+def analyze(
+    rows: Iterable[dict[str, Any]],
+    run_id: str,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta: float = MIN_REGRESSION_SECONDS,
+    min_samples: int = MIN_SAMPLES,
+) -> list[StepStats]:
+    """
+    Percentiles of the current run per (target, step) and regressions against older runs.
+
+    Only successful calls count for latency (a failed step usually ends in a timeout).
+    """
+    current: dict[tuple[str, str], list[float]] = defaultdict(list)
+    failed: dict[tuple[str, str], int] = defaultdict(int)
+    baseline: dict[tuple[str, str], list[float]] = defaultdict(list)
+    for row in rows:
+        key = (row["target"], row["step"])
+        if row["run"] == run_id:
+            if row["ok"]:
+                current[key].append(row["seconds"])
+            else:
+                failed[key] += 1
+        elif row["ok"]:
+            baseline[key].append(row["seconds"])
+
+    result = []
+    for key in sorted(set(current) | set(failed)):
+        now = sorted(current.get(key, []))
+        stats = StepStats(key[0], key[1], len(now) + failed[key], failed[key], percentile(now, 50), percentile(now, 95))
+        before = sorted(baseline.get(key, []))
+        if before:
+            stats.baseline_calls = len(before)
+            stats.baseline_p50 = percentile(before, 50)
+            stats.baseline_p95 = percentile(before, 95)
+            stats.regressed = (
+                len(now) >= min_samples
+                and len(before) >= min_samples
+                and stats.p95 > stats.baseline_p95 * (1 + threshold)
+                and stats.p95 - stats.baseline_p95 >= min_delta
+            )
+        result.append(stats)
+    return result
+
+
+def write_report(path: str | Path, run_id: str, stats: list[StepStats], threshold: float) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "run": run_id,
+                "threshold": threshold,
+                "regressions": [asdict(s) for s in stats if s.regressed],
+                "steps": [asdict(s) for s in stats],
+            },
+            indent=2,
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def summary_lines(stats: list[StepStats], top: int = 10) -> list[str]:
+    """Regressed steps first, then the slowest steps of the run."""
+    ordered = sorted(stats, key=lambda s: (not s.regressed, -s.p95))[:top]
+    lines = []
+    for s in ordered:
+        base = (
+            f"  was p95 {s.baseline_p95:6.2f}s ({s.growth:+.0%})"
+            if s.baseline_p95 is not None and s.growth is not None else ""
+        )
+        flag = "REGRESSED " if s.regressed else ""
+        lines.append(
+            f"{flag}{s.step}  [{s.target}]  calls {s.calls}  p50 {s.p50:6.2f}s  p95 {s.p95:6.2f}s{base}"
+        )
+    return lines
+
+
+# ====== Configuration ======
+
+
+def history_path() -> Path | None:
+    value = os.getenv("STEP_HISTORY", DEFAULT_HISTORY)
+    return None if value in ("", "0") else Path(value)
+
+
+def report_path() -> Path:
+    return Path(os.getenv("STEP_REPORT", DEFAULT_REPORT))
+
+
+def regression_threshold() -> float:
+    return float(os.getenv("STEP_REGRESSION_THRESHOLD", str(DEFAULT_THRESHOLD)))
+
+
+def keep_runs() -> int:
+    return int(os.getenv("STEP_HISTORY_RUNS", str(DEFAULT_KEEP_RUNS)))
+
+
+def run_id() -> str:
+    """Id of this pytest run, shared with xdist workers through the environment."""
+    value = os.getenv("STEP_RUN_ID")
+    if not value:
+        value = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        os.environ["STEP_RUN_ID"] = value
+    return value
@@ -0,0 +1,388 @@
+"""Screenshot comparison with NumPy: perceptual hashes and masked pixel diffs.
+
+Screenshots are compared at low resolution, which is both cheaper and
+tolerant to anti-aliasing / compression noise:
+- PNG is decoded to a grayscale array (Pillow is used when installed,
+  otherwise a small NumPy decoder) and area-downsampled to COMPARE_SIZE;
+- `dhash` — 64-bit difference hash; Hamming distance tells "same screen
+  roughly" in one integer comparison;
+- masked diff — share of pixels that differ by more than a threshold, with
+  regions ignored (status bar with the clock, battery, notifications).
+
+Batch mode compares many screenshots against baselines in one vectorized
+operation: a directory of PNG files, or the latest screenshot of every
+test step in the artifact store (manifest.jsonl, see utils/artifact_store.py).
+
+`wait_screen_settled(driver)` polls screenshots until two consecutive frames
+are the same (animations finished), using the adaptive waits of utils/waits.py.
+
+Usage:
+    python -m utils.visual_diff artifacts/screens baselines/       # directory vs directory
+    python -m utils.visual_diff --manifest artifacts baselines/     # latest artifact per step
+    python -m utils.visual_diff --manifest artifacts baselines/ --update   # accept as baselines
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+import numpy as np
+
+from utils.artifact_store import ArtifactStore
+from utils.waits import AdaptiveWait, PollSchedule
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# (height, width) of the grayscale thumbnails that are compared
+COMPARE_SIZE = (128, 64)
+# Gray levels (0-255) two thumbnails may differ by without counting as a change
+PIXEL_THRESHOLD = 16
+# Share of changed (not masked) pixels still treated as "same screen"
+DEFAULT_TOLERANCE = 0.005
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Channels by PNG color type: gray, RGB, gray + alpha, RGBA
+_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+
+@dataclass(frozen=True)
+class Region:
+    """Rectangle in fractions of the image size (0..1), independent of resolution."""
+
+    left: float
+    top: float
+    right: float
+    bottom: float
+
+
+# Android status bar: clock, battery, notification icons
+STATUS_BAR = Region(0.0, 0.0, 1.0, 0.04)
+MOBILE_MASK: tuple[Region, ...] = (STATUS_BAR,)
+
+
+@dataclass(frozen=True)
+class VisualDiff:
+    """Result of comparing two screenshots."""
+
+    changed: float  # share of not masked thumbnail pixels that differ
+    mean_abs: float  # mean absolute gray difference of not masked pixels
+    hash_distance: int  # Hamming distance of dhash values (0..64)
+
+    def same(self, tolerance: float = DEFAULT_TOLERANCE) -> bool:
+        return self.changed <= tolerance
+
+
+# ====== Decoding ======
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """
+    Decode 8-bit PNG to a grayscale float32 array (height, width).
+
+    Raises:
+        ValueError: If data is not a PNG supported by the NumPy decoder
+                    (palette / 16-bit / interlaced images need Pillow)
+    """
+    if PIL_AVAILABLE:
+        with Image.open(io.BytesIO(data)) as image:
+            return np.asarray(image.convert("L"), dtype=np.float32)
+    return to_gray(_decode_png_numpy(data))
+
+
+def _decode_png_numpy(data: bytes) -> np.ndarray:
+    """Pixels (height, width, channels) uint8 of a non-interlaced 8-bit PNG."""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+    pos = len(PNG_SIGNATURE)
+    header = b""
+    idat = []
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = chunk
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+    if not header:
+        raise ValueError("PNG without IHDR")
+    width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+    if depth != 8 or color_type not in _CHANNELS or interlace:
+        raise ValueError(
+            f"Unsupported PNG (bit depth {depth}, color type {color_type}, interlace {interlace}); install Pillow"
+        )
+    bpp = _CHANNELS[color_type]
+    stride = width * bpp
+    rows = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8).reshape(height, stride + 1)
+    pixels = np.empty((height, stride), dtype=np.uint8)
+    prev = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        pixels[y] = prev = _unfilter(rows[y, 0], rows[y, 1:], prev, bpp)
+    return pixels.reshape(height, width, bpp)
+
+
+def _unfilter(kind: int, line: np.ndarray, prev: np.ndarray, bpp: int) -> np.ndarray:
+    """Undo PNG filter of one row. None/Sub/Up are vectorized; Average/Paeth depend on the left pixel."""
+    if kind == 0:
+        return line
+    if kind == 1:
+        # Sub: running sum of each channel along the row (mod 256)
+        return (line.reshape(-1, bpp).cumsum(axis=0, dtype=np.uint64) % 256).astype(np.uint8).ravel()
+    if kind == 2:
+        return line + prev  # uint8 wraps mod 256
+    if kind not in (3, 4):
+        raise ValueError(f"Unknown PNG filter type {kind}")
+    out = bytearray(line.tobytes())
+    up = prev.tobytes()
+    for i in range(len(out)):
+        a = out[i - bpp] if i >= bpp else 0
+        b = up[i]
+        if kind == 3:
+            out[i] = (out[i] + ((a + b) >> 1)) & 0xFF
+            continue
+        c = up[i - bpp] if i >= bpp else 0
+        p = a + b - c
+        pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+        out[i] = (out[i] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xFF
+    return np.frombuffer(bytes(out), dtype=np.uint8)
+
+
+def to_gray(pixels: np.ndarray) -> np.ndarray:
+    """Luminance (ITU-R 601) of (h, w, channels) pixels; alpha is ignored."""
+    pixels = pixels.astype(np.float32)
+    if pixels.ndim == 2:
+        return pixels
+    if pixels.shape[2] in (1, 2):
+        return pixels[:, :, 0]
+    return pixels[:, :, :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+# ====== Thumbnails, hashes, diffs ======
+
+
+def downsample(gray: np.ndarray, size: tuple[int, int] = COMPARE_SIZE) -> np.ndarray:
+    """Area (box) downsampling to `size` = (height, width): mean of every source block."""
+    gray = np.asarray(gray, dtype=np.float32)
+    height, width = gray.shape
+    out_h, out_w = min(size[0], height), min(size[1], width)
+    row_starts = np.arange(out_h) * height // out_h
+    col_starts = np.arange(out_w) * width // out_w
+    sums = np.add.reduceat(np.add.reduceat(gray, row_starts, axis=0), col_starts, axis=1)
+    counts = np.outer(np.diff(np.append(row_starts, height)), np.diff(np.append(col_starts, width)))
+    return (sums / counts).astype(np.float32)
+
+
+def thumbnail(data: bytes, size: tuple[int, int] = COMPARE_SIZE) -> np.ndarray:
+    """PNG bytes -> grayscale thumbnail used by all comparisons."""
+    return downsample(decode_png(data), size)
+
+
+def dhash(gray: np.ndarray, hash_size: int = 8) -> int:
+    """Difference hash: is each cell brighter than its right neighbour (hash_size**2 bits)."""
+    cells = downsample(gray, (hash_size, hash_size + 1))
+    bits = (cells[:, 1:] > cells[:, :-1]).ravel()
+    return int(np.packbits(bits).tobytes().hex(), 16)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def mask_array(shape: tuple[int, int], regions: Iterable[Region]) -> np.ndarray:
+    """Boolean array: True for pixels that are compared (outside all regions)."""
+    height, width = shape
+    keep = np.ones(shape, dtype=bool)
+    for r in regions:
+        keep[round(r.top * height):round(r.bottom * height), round(r.left * width):round(r.right * width)] = False
+    return keep
+
+
+def compare_thumbnails(
+    a: np.ndarray,
+    b: np.ndarray,
+    mask: Sequence[Region] = MOBILE_MASK,
+    threshold: float = PIXEL_THRESHOLD,
+) -> VisualDiff:
+    """Compare two thumbnails of the same size."""
+    if a.shape != b.shape:
+        raise ValueError(f"Thumbnails differ in size: {a.shape} vs {b.shape}")
+    keep = mask_array(a.shape, mask)
+    delta = np.abs(a - b)[keep]
+    return VisualDiff(
+        changed=float((delta > threshold).mean()) if delta.size else 0.0,
+        mean_abs=float(delta.mean()) if delta.size else 0.0,
+        hash_distance=hamming(dhash(np.where(keep, a, 0)), dhash(np.where(keep, b, 0))),
+    )
+
+
+def compare(a: bytes, b: bytes, mask: Sequence[Region] = MOBILE_MASK) -> VisualDiff:
+    """Compare two PNG screenshots (any resolution, same aspect ratio expected)."""
+    return compare_thumbnails(thumbnail(a), thumbnail(b), mask)
+
+
+def compare_batch(
+    actual: Sequence[np.ndarray],
+    baseline: Sequence[np.ndarray],
+    mask: Sequence[Region] = MOBILE_MASK,
+    threshold: float = PIXEL_THRESHOLD,
+) -> list[VisualDiff]:
+    """Compare pairs of thumbnails at once: one vectorized pass over (n, h, w) stacks."""
+    if not actual:
+        return []
+    a, b = np.stack(actual), np.stack(baseline)
+    keep = mask_array(a.shape[1:], mask)
+    delta = np.abs(a - b)[:, keep]  # (n, compared pixels)
+    changed = (delta > threshold).mean(axis=1) if delta.shape[1] else np.zeros(len(a))
+    mean_abs = delta.mean(axis=1) if delta.shape[1] else np.zeros(len(a))
+    hashes = [(dhash(np.where(keep, x, 0)), dhash(np.where(keep, y, 0))) for x, y in zip(a, b)]
+    return [
+        VisualDiff(float(c), float(m), hamming(ha, hb))
+        for c, m, (ha, hb) in zip(changed, mean_abs, hashes)
+    ]
+
+
+# ====== Baselines ======
+
+
+def baseline_name(test: str, step: str) -> str:
+    """
+    File name of the baseline for a test step, e.g.
+    `tests_mobile_test_open_settings__test_open_settings__FAILED.png`.
+
+    The module path is part of the name: tests with the same name in
+    different modules must not share a baseline.
+    """
+    module, _, name = test.partition("::")
+    module = module.removesuffix(".py")
+    test_id = f"{module}__{name.replace('::', '__')}" if name else module or "no_test"
+    return re.sub(r"[^\w.-]+", "_", f"{test_id}__{step}") + ".png"
+
+
+def latest_screens(store_root: str | Path) -> dict[str, bytes]:
+    """Latest screenshot of every test step in the artifact store, by baseline name."""
+    store = ArtifactStore(store_root)
+    latest = {baseline_name(e.test, e.step): e for e in store.entries() if e.kind == "png"}
+    return {name: store.read(entry) for name, entry in latest.items()}
+
+
+def directory_screens(directory: str | Path) -> dict[str, bytes]:
+    """PNG files of a directory (recursively) by relative path."""
+    directory = Path(directory)
+    return {p.relative_to(directory).as_posix(): p.read_bytes() for p in sorted(directory.rglob("*.png"))}
+
+
+def compare_with_baselines(
+    screens: dict[str, bytes],
+    baseline_dir: str | Path,
+    mask: Sequence[Region] = MOBILE_MASK,
+) -> dict[str, VisualDiff | None]:
+    """
+    Compare screenshots with `baseline_dir/<name>`; None for screens without a baseline.
+    """
+    baseline_dir = Path(baseline_dir)
+    pairs = {name: baseline_dir / name for name in screens}
+    present = [name for name, path in pairs.items() if path.is_file()]
+    diffs = compare_batch(
+        [thumbnail(screens[name]) for name in present],
+        [thumbnail(pairs[name].read_bytes()) for name in present],
+        mask,
+    )
+    result: dict[str, VisualDiff | None] = dict.fromkeys(screens)
+    result.update(zip(present, diffs))
+    return result
+
+
+# ====== Live checks ======
+
+
+def screen_changed(before: bytes, after: bytes, mask: Sequence[Region] = MOBILE_MASK,
+                   tolerance: float = DEFAULT_TOLERANCE) -> bool:
+    """Did the screen change between two screenshots (status bar ignored)?"""
+    return not compare(before, after, mask).same(tolerance)
+
+
+def wait_screen_settled(
+    driver: "WebDriver",
+    timeout: float = 5,
+    mask: Sequence[Region] = MOBILE_MASK,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> bytes:
+    """
+    Wait until two consecutive screenshots are the same (animations finished).
+
+    Returns:
+        PNG screenshot of the settled screen
+
+    Raises:
+        TimeoutException: If the screen keeps changing for `timeout` seconds
+    """
+    previous: list[np.ndarray] = []
+
+    def settled(drv) -> bytes | None:
+        png = drv.get_screenshot_as_png()
+        frame = thumbnail(png)
+        last = previous[-1] if previous else None
+        previous[:] = [frame]
+        if last is not None and last.shape == frame.shape and compare_thumbnails(last, frame, mask).same(tolerance):
+            return png
+        return None
+
+    # Screenshots are expensive: no bursts of fast polls
+    schedule = PollSchedule(initial=0.1, fast_polls=1, backoff=1.5, max_interval=0.5)
+    return AdaptiveWait(driver, timeout, schedule).until(
+        settled, "Screen did not settle", key="screen settled"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare screenshots with baselines")
+    parser.add_argument("source", help="directory with PNG files, or artifacts folder with --manifest")
+    parser.add_argument("baselines", help="directory with baseline PNG files")
+    parser.add_argument("--manifest", action="store_true", help="take the latest screenshot of every test step")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="share of changed pixels")
+    parser.add_argument("--no-mask", action="store_true", help="compare the status bar too")
+    parser.add_argument("--update", action="store_true", help="write screens as new baselines")
+    args = parser.parse_args(argv)
+
+    screens = latest_screens(args.source) if args.manifest else directory_screens(args.source)
+    if args.update:
+        for name, data in screens.items():
+            path = Path(args.baselines) / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        print(f"[OK] {len(screens)} baselines written to {args.baselines}")
+        return
+
+    diffs = compare_with_baselines(screens, args.baselines, () if args.no_mask else MOBILE_MASK)
+    changed = 0
+    for name, diff in diffs.items():
+        if diff is None:
+            print(f"  NEW      {name}")
+        elif diff.same(args.tolerance):
+            print(f"  same     {name}")
+        else:
+            changed += 1
+            print(f"  CHANGED  {name}: {diff.changed:.1%} pixels, hash distance {diff.hash_distance}")
+    print(f"[DONE] {len(diffs)} screens, {changed} changed")
+    if changed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
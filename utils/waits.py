@@ -0,0 +1,232 @@
+"""Adaptive polling waits for page objects (web and mobile).
+
+`WebDriverWait` polls every 0.5 s: a screen that is ready after 80 ms is
+noticed only after 500 ms, while a screen that takes 8 s is polled 16
+times for nothing. `AdaptiveWait` is a drop-in replacement for
+`WebDriverWait(...).until(...)` that:
+- polls by a `PollSchedule`: a few fast polls, then exponential backoff
+  up to a cap;
+- polls once immediately, then learns the expected delay of every
+  condition (moving average of time-to-satisfy) and sleeps most of it
+  before the next poll, so a step waits close to its real minimum with
+  only a few round trips, and a condition that is already true costs
+  nothing extra;
+- keeps per-condition statistics (calls, polls, time-to-satisfy, timeouts)
+  for the terminal summary.
+
+A condition is identified by its function name plus the string / tuple
+values it closes over (e.g. `visibility_of_element_located(('id', 'firstName'))`),
+or by an explicit `key`.
+
+WAIT_STATS_PATH=artifacts/wait_stats.json keeps learned delays between runs.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+T = TypeVar("T")
+
+# Weight of the newest observation in the moving average of expected delay
+DELAY_SMOOTHING = 0.3
+# Part of the expected delay slept after a failed first poll (the rest is polled fast)
+EXPECTED_LEAD = 0.7
+
+
+@dataclass(frozen=True)
+class PollSchedule:
+    """Intervals between polls: `fast_polls` at `initial`, then x`backoff` up to `max_interval`."""
+
+    initial: float = 0.05
+    fast_polls: int = 4
+    backoff: float = 1.5
+    max_interval: float = 1.0
+
+    def delays(self, expected: float | None = None) -> Iterator[float]:
+        """
+        Sleep before each poll (infinite).
+
+        The first poll is immediate. With a learned `expected` delay, most of
+        it is slept before the second poll and fast polling starts around the
+        moment the condition is usually satisfied.
+        """
+        yield 0.0
+        if expected and expected * EXPECTED_LEAD > self.initial:
+            yield expected * EXPECTED_LEAD
+        interval = self.initial
+        for n in range(1, 1 << 30):
+            yield interval
+            if n >= self.fast_polls:
+                interval = min(interval * self.backoff, self.max_interval)
+
+
+DEFAULT_SCHEDULE = PollSchedule()
+
+
+@dataclass
+class ConditionStats:
+    """Statistics of one wait condition."""
+
+    calls: int = 0
+    satisfied: int = 0
+    timeouts: int = 0
+    polls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Learned time-to-satisfy (moving average), used to plan the first poll
+    expected: float | None = None
+
+    @property
+    def avg_polls(self) -> float:
+        return self.polls / self.calls if self.calls else 0.0
+
+
+class WaitStats:
+    """Per-condition statistics and learned delays (shared by all waits)."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        path = path or os.getenv("WAIT_STATS_PATH")
+        self.path = Path(path) if path else None
+        self.conditions: dict[str, ConditionStats] = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            # Only learned delays survive between runs; counters are per run
+            for key, expected in json.loads(self.path.read_text(encoding="utf-8")).items():
+                self.conditions[key] = ConditionStats(expected=expected)
+
+    def expected(self, key: str) -> float | None:
+        stats = self.conditions.get(key)
+        return stats.expected if stats else None
+
+    def record(self, key: str, seconds: float, polls: int, satisfied: bool) -> None:
+        with self._lock:
+            stats = self.conditions.setdefault(key, ConditionStats())
+            stats.calls += 1
+            stats.polls += polls
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if not satisfied:
+                stats.timeouts += 1
+                return
+            stats.satisfied += 1
+            stats.expected = (
+                seconds if stats.expected is None
+                else (1 - DELAY_SMOOTHING) * stats.expected + DELAY_SMOOTHING * seconds
+            )
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            learned = {k: round(s.expected, 4) for k, s in self.conditions.items() if s.expected is not None}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(learned, indent=2, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        """Conditions that took the most time in this run."""
+        with self._lock:
+            items = [(k, s) for k, s in self.conditions.items() if s.calls]
+        lines = []
+        for key, s in sorted(items, key=lambda kv: -kv[1].total_seconds)[:top]:
+            lines.append(
+                f"{s.total_seconds:7.2f}s  calls {s.calls:3d}  avg polls {s.avg_polls:4.1f}  "
+                f"max {s.max_seconds:5.2f}s  timeouts {s.timeouts}  {key}"
+            )
+        return lines
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {k: asdict(s) for k, s in self.conditions.items()}
+
+
+# Shared statistics of the process (one per xdist worker)
+WAIT_STATS = WaitStats()
+
+
+def condition_key(method: Callable) -> str:
+    """Stable name of a condition: function name + closed-over strings/locators."""
+    name = getattr(method, "__qualname__", type(method).__name__).split(".<locals>")[0]
+    values = []
+    for cell in getattr(method, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:  # Empty cell
+            continue
+        if isinstance(value, (str, tuple)):
+            values.append(repr(value))
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            values.append(repr(tuple(value)))
+    return f"{name}({', '.join(values)})"
+
+
+class AdaptiveWait:
+    """Drop-in replacement for `WebDriverWait` with adaptive polling."""
+
+    def __init__(
+        self,
+        driver: Any,
+        timeout: float,
+        schedule: PollSchedule = DEFAULT_SCHEDULE,
+        ignored_exceptions: Iterable[type[BaseException]] | None = None,
+        stats: WaitStats | None = None,
+    ) -> None:
+        """
+        Args:
+            driver: WebDriver passed to conditions
+            timeout: Maximum wait in seconds
+            schedule: Polling schedule
+            ignored_exceptions: Exceptions treated as "not yet"
+                                (NoSuchElementException is always ignored, as in WebDriverWait)
+            stats: Statistics / learned delays (shared WAIT_STATS by default)
+        """
+        self._driver = driver
+        self._timeout = float(timeout)
+        self.schedule = schedule
+        self.ignored_exceptions = (NoSuchElementException, *(ignored_exceptions or ()))
+        self.stats = stats or WAIT_STATS
+
+    def until(self, method: Callable[[Any], T], message: str = "", key: str | None = None) -> T:
+        """Wait until `method(driver)` returns a truthy value and return it."""
+        return self._wait(method, message, key, want_truthy=True)
+
+    def until_not(self, method: Callable[[Any], Any], message: str = "", key: str | None = None) -> Any:
+        """Wait until `method(driver)` returns a falsy value (or raises an ignored exception)."""
+        return self._wait(method, message, key, want_truthy=False)
+
+    def _wait(self, method: Callable, message: str, key: str | None, want_truthy: bool):
+        key = key or condition_key(method)
+        if not want_truthy:
+            key = f"not {key}"
+        started = time.monotonic()
+        deadline = started + self._timeout
+        polls = 0
+        screen = stacktrace = None
+        for delay in self.schedule.delays(self.stats.expected(key)):
+            remaining = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(max(0.0, min(delay, remaining)))
+            polls += 1
+            try:
+                value = method(self._driver)
+                done = bool(value) if want_truthy else not value
+            except self.ignored_exceptions as e:
+                if not want_truthy:
+                    value, done = True, True
+                else:
+                    done = False
+                    screen = getattr(e, "screen", None)
+                    stacktrace = getattr(e, "stacktrace", None)
+            if done:
+                self.stats.record(key, time.monotonic() - started, polls, satisfied=True)
+                return value
+            if time.monotonic() >= deadline:
+                break
+        self.stats.record(key, time.monotonic() - started, polls, satisfied=False)
+        raise TimeoutException(message, screen, stacktrace)
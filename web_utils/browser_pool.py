@@ -0,0 +1,206 @@
+"""Reusable Chrome browsers for web tests.
+
+Launching Chrome (and resolving chromedriver with webdriver-manager) takes
+seconds, while most tests only need a clean page. In pooled mode a browser
+is launched once per pytest process (one per pytest-xdist worker) and
+reused:
+- chromedriver path is resolved once per process;
+- between tests the state is reset cheaply: extra windows are closed,
+  cookies and storage of the origins open in any window are cleared,
+  the tab goes to `about:blank`;
+- a browser that crashed or failed to reset is replaced with a new one.
+
+Launch / reuse / replacement counts are reported in the terminal summary.
+`make_browser` launches Chrome for the `browser` fixture and for tools
+(tools/form_runner.py).
+
+Configuration (environment variables):
+- WEB_REUSE_BROWSER=1 — pooled mode (default: new browser per test);
+- WEB_HEADLESS=1 — run Chrome headless;
+- WEB_PAGE_LOAD_STRATEGY — normal / eager / none (default eager);
+- CHROMEDRIVER_PATH — use this chromedriver instead of webdriver-manager.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from utils.command_trace import TRACER
+
+if TYPE_CHECKING:
+    from selenium.webdriver import Chrome
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Clears storage of the page that the test left open (must run before about:blank)
+# and returns its origin ("null" for about:blank)
+CLEAR_STORAGE_JS = """
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+    return window.location.origin;
+"""
+
+
+def headless_enabled() -> bool:
+    return os.getenv("WEB_HEADLESS", "0") == "1"
+
+
+@functools.lru_cache(maxsize=None)
+def chromedriver_path() -> str:
+    """Path to chromedriver, resolved once per process."""
+    path = os.getenv("CHROMEDRIVER_PATH")
+    if path:
+        return path
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def page_load_strategy() -> str:
+    # eager: driver.get returns at DOMContentLoaded, page objects wait for their own
+    # readiness locator instead of the load event (images, fonts, ads)
+    return os.getenv("WEB_PAGE_LOAD_STRATEGY", "eager")
+
+
+def make_browser() -> "Chrome":
+    """Launch Chrome (headless if WEB_HEADLESS=1) with cached chromedriver path."""
+    # Selenium WebDriver and webdriver-manager are loaded by the first launch
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = page_load_strategy()
+    if headless_enabled():
+        options.add_argument("--headless=new")
+        # --start-maximized has no effect without a screen
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
+    driver = webdriver.Chrome(service=ChromeService(chromedriver_path()), options=options)
+    # Every command is recorded (see utils/command_trace.py)
+    TRACER.instrument(driver)
+    return driver
+
+
+def reset_browser(driver: "WebDriver") -> None:
+    """
+    Bring browser to a clean state without restarting it.
+
+    Local and session storage are cleared in every window before it is
+    closed. With Chrome, cookies of all domains and all storage types
+    (IndexedDB, cache storage, service workers, ...) of the origins open
+    in those windows are cleared as well. Origins the test navigated away
+    from keep their storage.
+
+    Raises:
+        Exception: Any WebDriver error (the browser should then be replaced)
+    """
+    handles = driver.window_handles
+    origins = set()
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        origins.add(driver.execute_script(CLEAR_STORAGE_JS))
+        driver.close()
+    driver.switch_to.window(handles[0])
+    origins.add(driver.execute_script(CLEAR_STORAGE_JS))
+    try:
+        # Cookies of all domains at once (Chrome DevTools Protocol)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except Exception:
+        # Non-Chrome driver: cookies of the current domain only
+        driver.delete_all_cookies()
+    else:
+        for origin in sorted(o for o in origins if o and o != "null"):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    driver.get("about:blank")
+
+
+@dataclass
+class PoolStats:
+    """Counters of the browser pool."""
+
+    launched: int = 0
+    reused: int = 0
+    replaced: int = 0
+    reset_seconds: float = 0.0
+    resets: int = 0
+
+
+class BrowserPool:
+    """Idle browsers of this process, reused between tests."""
+
+    def __init__(
+        self,
+        factory: Callable[[], "WebDriver"],
+        reset: Callable[["WebDriver"], None] = reset_browser,
+    ) -> None:
+        """
+        Args:
+            factory: Function that launches a new browser (e.g. `make_browser`)
+            reset: Function that cleans browser state between tests
+        """
+        self._factory = factory
+        self._reset = reset
+        self._idle: list["WebDriver"] = []
+        self.stats = PoolStats()
+
+    @staticmethod
+    def is_alive(driver: "WebDriver") -> bool:
+        """Check browser health with one cheap command."""
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> "WebDriver":
+        """Return a healthy idle browser or launch a new one."""
+        while self._idle:
+            driver = self._idle.pop()
+            if self.is_alive(driver):
+                self.stats.reused += 1
+                return driver
+            # Crashed while idle (or between tests) - replace it
+            self.stats.replaced += 1
+            self._quit_quietly(driver)
+        self.stats.launched += 1
+        return self._factory()
+
+    def release(self, driver: "WebDriver") -> None:
+        """Reset browser state and return it to the pool (or drop it if reset fails)."""
+        started = time.perf_counter()
+        try:
+            self._reset(driver)
+        except Exception:
+            self.stats.replaced += 1
+            self._quit_quietly(driver)
+            return
+        finally:
+            self.stats.resets += 1
+            self.stats.reset_seconds += time.perf_counter() - started
+        self._idle.append(driver)
+
+    def close(self) -> None:
+        """Quit all idle browsers at the end of the run."""
+        while self._idle:
+            self._quit_quietly(self._idle.pop())
+
+    @staticmethod
+    def _quit_quietly(driver: "WebDriver") -> None:
+        try:
+            driver.quit()
+        except Exception:
+            # The browser may already be dead - nothing to close then
+            pass
+
+    def summary_lines(self) -> list[str]:
+        """Build lines for the pytest terminal summary."""
+        s = self.stats
+        if not s.launched:
+            return []
+        lines = [f"browsers launched: {s.launched}, reused: {s.reused}, replaced: {s.replaced}"]
+        if s.resets:
+            lines.append(f"reset: total {s.reset_seconds:.2f}s, avg {s.reset_seconds / s.resets:.3f}s")
+        return lines
@@ -0,0 +1,94 @@
+"""Local HTTP server for web tests: static pages plus slow dummy assets.
+
+Serves a directory (by default `tests/web/site/`, a copy of the DemoQA
+practice form) so page objects can be exercised without the internet:
+- `/automation-practice-form` -> `automation-practice-form.html` (extensionless URLs);
+- `/slow/<ms>/<any/path.ext>` -> dummy asset returned after `<ms>` milliseconds,
+  standing in for ads, trackers and fonts of the real site.
+
+Usage:
+    with LocalSite() as site:
+        FormPage(browser, base_url=site.url).open()
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_ROOT = Path(__file__).resolve().parent.parent / "tests" / "web" / "site"
+
+_SLOW_PATH = re.compile(r"^/slow/(\d+)/(.+)$")
+
+# Content types of dummy assets by extension
+_DUMMY_TYPES = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".png": "image/png",
+    ".woff2": "font/woff2",
+}
+
+
+class SiteHandler(SimpleHTTPRequestHandler):
+    """Static files + slow dummy assets; quiet log."""
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        slow = _SLOW_PATH.match(path)
+        if slow:
+            self._serve_dummy(int(slow.group(1)), slow.group(2))
+            return
+        # Extensionless page URL, as on the real site
+        if "." not in path.rsplit("/", 1)[-1] and Path(self.directory, path.lstrip("/") + ".html").is_file():
+            self.path = path + ".html"
+        super().do_GET()
+
+    def _serve_dummy(self, delay_ms: int, name: str) -> None:
+        time.sleep(delay_ms / 1000)
+        body = b"" if name.endswith((".png", ".woff2")) else b"/* dummy */\n"
+        self.send_response(200)
+        self.send_header("Content-Type", _DUMMY_TYPES.get(Path(name).suffix, "application/octet-stream"))
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 (base class signature)
+        pass
+
+
+class LocalSite:
+    """Threaded HTTP server on localhost (random free port by default)."""
+
+    def __init__(self, root: str | Path = DEFAULT_ROOT, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.root = Path(root)
+        self.server = ThreadingHTTPServer((host, port), partial(SiteHandler, directory=str(self.root)))
+        self.server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="local-site", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "LocalSite":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,156 @@
+"""Page opening with a resource policy and readiness waits.
+
+A full `driver.get` of a real site waits for the `load` event: every ad,
+tracker, font and image. Page objects only need their own elements, so:
+- each page object declares a `ResourcePolicy`: URL patterns blocked with
+  CDP `Network.setBlockedURLs`; the allow list works per block pattern
+  (see ResourcePolicy);
+- the browser uses `pageLoadStrategy=eager`: `get` returns at DOMContentLoaded;
+- readiness is decided by the page object's own locator (`READY_LOCATOR`).
+
+Each open is timed (navigation / ready) and reported in the terminal
+summary, so WEB_BLOCK_RESOURCES=0 vs 1 shows the saved time.
+
+Configuration (environment variables):
+- WEB_BLOCK_RESOURCES=0 — do not block anything (for comparison);
+- WEB_PAGE_LOAD_STRATEGY — normal / eager / none (default eager, see web_utils/browser_pool.py).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """URL patterns (`*` wildcards, as in CDP) to block while a page is used.
+
+    `allow` lists URLs / patterns that must keep loading. It works per
+    block pattern: a block pattern that matches any allowed URL is dropped
+    as a whole, so every other URL it covers loads too. CDP
+    `Network.setBlockedURLs` has no exceptions, so keep block patterns
+    narrow where something under them is allowed.
+    """
+
+    block: tuple[str, ...] = ()
+    allow: tuple[str, ...] = ()
+
+    def blocked_patterns(self) -> list[str]:
+        return [p for p in self.block if not any(fnmatch(a, p) for a in self.allow)]
+
+
+# Ads, trackers and web fonts: never needed to test a form
+ADS_AND_TRACKERS = (
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*adservice.google.*",
+    "*/ads/*",
+    "*.woff",
+    "*.woff2",
+)
+
+
+def blocking_enabled() -> bool:
+    return os.getenv("WEB_BLOCK_RESOURCES", "1") != "0"
+
+
+def apply_resource_policy(driver: "WebDriver", policy: ResourcePolicy | None) -> int:
+    """
+    Send blocked URL patterns to the browser (only when they change).
+
+    Works in Chromium-based browsers; elsewhere nothing is blocked.
+
+    Returns:
+        Number of blocked patterns in effect
+    """
+    patterns = policy.blocked_patterns() if policy is not None and blocking_enabled() else []
+    if getattr(driver, "_blocked_urls", None) == patterns:
+        return len(patterns)
+    try:
+        if not getattr(driver, "_network_enabled", False):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver._network_enabled = True
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except AttributeError:
+        # Not a Chromium driver: no CDP
+        return 0
+    driver._blocked_urls = patterns
+    return len(patterns)
+
+
+@dataclass
+class OpenTiming:
+    """Durations of one page open."""
+
+    page: str
+    url: str
+    navigation: float  # driver.get (until DOMContentLoaded with eager strategy)
+    ready: float  # until the page object's readiness locator
+    blocked_patterns: int
+
+
+class OpenTimings:
+    """Page opens of this process, for the terminal summary."""
+
+    def __init__(self) -> None:
+        self.items: list[OpenTiming] = []
+        self._lock = threading.Lock()
+
+    def add(self, timing: OpenTiming) -> None:
+        with self._lock:
+            self.items.append(timing)
+
+    def summary_lines(self) -> list[str]:
+        by_page: dict[str, list[OpenTiming]] = defaultdict(list)
+        with self._lock:
+            for t in self.items:
+                by_page[t.page].append(t)
+        lines = []
+        for page, items in by_page.items():
+            n = len(items)
+            lines.append(
+                f"{page}: opens {n}, navigation avg {sum(t.navigation for t in items) / n:.2f}s, "
+                f"ready avg {sum(t.ready for t in items) / n:.2f}s, "
+                f"blocked patterns {items[-1].blocked_patterns}"
+            )
+        return lines
+
+
+OPEN_TIMINGS = OpenTimings()
+
+
+def open_page(
+    driver: "WebDriver",
+    url: str,
+    policy: ResourcePolicy | None,
+    wait_ready: Callable[[], object],
+    page: str = "",
+) -> OpenTiming:
+    """
+    Apply resource policy, navigate and wait for the page's own readiness.
+
+    Args:
+        driver: Selenium WebDriver
+        url: Page URL
+        policy: Resource policy of the page object (None - block nothing)
+        wait_ready: Waits for the readiness locator (raises on timeout)
+        page: Page object name for the report
+    """
+    blocked = apply_resource_policy(driver, policy)
+    started = time.perf_counter()
+    driver.get(url)
+    navigated = time.perf_counter()
+    wait_ready()
+    timing = OpenTiming(page or url, url, navigated - started, time.perf_counter() - navigated, blocked)
+    OPEN_TIMINGS.add(timing)
+    return timing